@@ -1,10 +1,21 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import time
+import os
 import uuid
+import functools
 from db import Database
+from replicas import set_session
+from invalidation import InvalidationBus
+from recommend import RecommendationService
+from profiling import profile_if_requested
+from search import ApplicationSearchIndex
+from cache import data_version
+from charts import FigureCache
+from parallel import fetch_all
+from resilience import BackendTimeout
 from logic import Analytics, Validation, Notification
 
 # Page configuration
@@ -15,8 +26,32 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize database
-db = Database()
+# Initialize database (shared across reruns and sessions so its caches persist)
+@st.cache_resource
+def get_database():
+    database = Database()
+    # Hear about job posting changes made by API workers or other Streamlit servers
+    bus = InvalidationBus(on_message=database.handle_invalidation)
+    bus.start()
+    database.attach_invalidation_bus(bus)
+    if os.getenv("DEADLINE_SWEEPER", "1").lower() in ("1", "true", "yes"):
+        database.enable_deadline_sweeper()
+    return database
+
+db = get_database()
+
+@st.cache_resource
+def get_figure_cache():
+    # Chart figures shared by all sessions, rebuilt only when their data changes
+    return FigureCache(
+        maxsize=int(os.getenv("FIGURE_CACHE_SIZE", "512")),
+        ttl=int(os.getenv("FIGURE_CACHE_TTL", "3600"))
+    )
+
+@st.cache_resource
+def get_recommendation_service():
+    # One TF-IDF index per process, refreshed incrementally as postings are added
+    return RecommendationService(db, refresh_interval=60)
 
 # Authentication state
 if 'authenticated' not in st.session_state:
@@ -27,6 +62,26 @@ if 'user_role' not in st.session_state:
     st.session_state.user_role = None
 if 'user_profile' not in st.session_state:
     st.session_state.user_profile = None
+if 'run_generation' not in st.session_state:
+    st.session_state.run_generation = 0
+    st.session_state.run_data = {}
+if 'db_session_id' not in st.session_state:
+    st.session_state.db_session_id = uuid.uuid4().hex
+
+# Reads right after this browser session writes go to the primary, not a read replica
+set_session(st.session_state.db_session_id)
+
+def fragment(func):
+    """st.fragment whose backend calls are attributed to this browser session
+    
+    Fragment reruns skip the module-level set_session above and run on another
+    thread, so each fragment sets the session itself.
+    """
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        set_session(st.session_state.db_session_id)
+        return func(*args, **kwargs)
+    return st.fragment(run)
 
 # CSS styling
 st.markdown("""
@@ -68,6 +123,41 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Columns each list view actually renders; large text columns are loaded on demand
+APPLICATION_LIST_FIELDS = ["id", "company", "role", "status", "applied_date"]
+ROLLUP_VERSION_FIELDS = ["job_posting_id", "total", "applied", "interview", "offer", "rejected"]
+JOB_POSTING_LIST_FIELDS = ["id", "title", "status", "deadline", "created_at"]
+APPLICANT_LIST_FIELDS = ["id", "status"]
+
+# Dashboard sections; only the selected one is rendered, so only its data is fetched
+SEEKER_SECTIONS = ["Browse Jobs", "My Applications", "Add Application", "Analytics", "Follow-ups"]
+PROVIDER_SECTIONS = ["My Job Postings", "Applicants", "Add New Job", "Manage Postings", "Analytics"]
+
+def load_details(cache_key, record_id, loader):
+    """Fetch large text columns for a record once and keep them for the session"""
+    if cache_key not in st.session_state:
+        st.session_state[cache_key] = {}
+    details = st.session_state[cache_key]
+    if record_id not in details:
+        details[record_id] = loader(record_id) or {}
+    return details[record_id]
+
+def get_application_search_index(user_id, applications):
+    """Search index over the session's applications, rebuilt only when the list changes"""
+    signature = ApplicationSearchIndex.signature_of(applications)
+    cached = st.session_state.get('application_search_index')
+    if cached and cached[0] == (user_id, signature):
+        return cached[1]
+    
+    # Notes are not part of the list query; fetch them for all applications in one request
+    notes = {app['id']: app.get('notes') for app in db.get_applications(user_id, ["id", "notes"])}
+    st.session_state.setdefault("application_notes", {}).update(
+        {app_id: {'notes': note} for app_id, note in notes.items()}
+    )
+    index = ApplicationSearchIndex([dict(app, notes=notes.get(app['id'])) for app in applications])
+    st.session_state.application_search_index = ((user_id, signature), index)
+    return index
+
 def login_page():
     """Login/Signup page"""
     st.markdown('<div class="main-header">💼 Job Application Tracker</div>', unsafe_allow_html=True)
@@ -134,13 +224,89 @@ def login_page():
             else:
                 st.error("Please fill all fields")
 
+# Datasets shared between fragments: name -> loader(user_id)
+RUN_DATA_LOADERS = {
+    "applications": lambda user_id: db.get_applications(user_id, APPLICATION_LIST_FIELDS),
+    "application_counts": lambda user_id: db.get_application_status_counts(user_id),
+    "job_postings": lambda user_id: db.get_job_postings(user_id, JOB_POSTING_LIST_FIELDS),
+    "job_posting_counts": lambda user_id: db.get_job_posting_counts(user_id),
+    # Applicant counts per posting (aggregated on the database side)
+    "applicant_counts": lambda user_id: db.get_applicant_counts(user_id),
+    "applicants": lambda user_id: db.get_applicants_for_jobprovider(user_id, APPLICANT_LIST_FIELDS),
+    "rollups": lambda user_id: db.get_provider_rollups(user_id),
+}
+
+# What a dataset shows when loading it timed out (the same as its loader's own error result)
+RUN_DATA_EMPTY = {
+    "applications": [],
+    "application_counts": {"total": 0, "applied": 0, "interview": 0, "offer": 0, "rejected": 0},
+    "job_postings": [],
+    "job_posting_counts": {"total": 0, "active": 0, "closed": 0},
+    "applicant_counts": {},
+    "applicants": [],
+    "rollups": [],
+}
+
+# What each dashboard section reads, so it can be fetched together with the header metrics
+SEEKER_SECTION_DATA = {
+    "My Applications": ["applications"],
+    "Analytics": ["applications"],
+    "Follow-ups": ["applications"],
+}
+PROVIDER_SECTION_DATA = {
+    "My Job Postings": ["job_postings"],
+    "Applicants": ["applicants"],
+    "Analytics": ["rollups"],
+}
+
+def prefetch(*names):
+    """Load the datasets of this full script run that aren't loaded yet, concurrently"""
+    generation = st.session_state.run_generation
+    missing = [
+        name for name in dict.fromkeys(names)
+        if (st.session_state.run_data.get(name) or (None,))[0] != generation
+    ]
+    if missing:
+        user_id = st.session_state.user_id
+        try:
+            values = fetch_all(*(lambda loader=RUN_DATA_LOADERS[name]: loader(user_id) for name in missing))
+        except BackendTimeout:
+            # Kept for this run, so the other fragments don't wait out the deadline again
+            st.error("Loading your data is taking too long. Please try again in a moment.")
+            values = [RUN_DATA_EMPTY[name] for name in missing]
+        for name, value in zip(missing, values):
+            st.session_state.run_data[name] = (generation, value)
+
+def run_data(name):
+    """Data shared by the fragments of one full script run
+    
+    Loaded at most once per full rerun (see main); fragment reruns reuse it
+    instead of fetching it again.
+    """
+    prefetch(name)
+    return st.session_state.run_data[name][1]
+
+def seeker_applications():
+    return run_data("applications")
+
+def provider_postings():
+    return run_data("job_postings")
+
+def provider_posting_counts():
+    return run_data("job_posting_counts")
+
+def provider_applicant_counts():
+    return run_data("applicant_counts")
+
 def jobseeker_dashboard():
     """Jobseeker dashboard"""
     st.title("👨‍💼 Jobseeker Dashboard")
     
-    # Quick stats
-    applications = db.get_applications(st.session_state.user_id)
-    stats = Analytics.get_application_stats(applications)
+    # Quick stats, from per-status counts rather than the applications themselves. The
+    # selected section's data is fetched at the same time, so the two don't queue up
+    section = st.session_state.get("seeker_section", SEEKER_SECTIONS[0])
+    prefetch("application_counts", *SEEKER_SECTION_DATA.get(section, []))
+    stats = Analytics.get_application_stats_from_counts(run_data("application_counts"))
     
     col1, col2, col3, col4, col5 = st.columns(5)
     with col1:
@@ -154,205 +320,295 @@ def jobseeker_dashboard():
     with col5:
         st.metric("Success Rate", f"{stats['success_rate']}%")
     
-    # Main content - ADDED "Browse Jobs" TAB
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Browse Jobs", "My Applications", "Add Application", "Analytics", "Follow-ups"])
+    # Unlike st.tabs, which runs every tab, only the selected section runs. Each section
+    # is a fragment: its widgets rerun only that section, not the whole dashboard
+    section = st.radio("Section", SEEKER_SECTIONS, horizontal=True, key="seeker_section", label_visibility="collapsed")
+    {
+        "Browse Jobs": browse_jobs_tab,
+        "My Applications": my_applications_tab,
+        "Add Application": add_application_tab,
+        "Analytics": application_analytics_tab,
+        "Follow-ups": followups_tab,
+    }[section]()
+
+@fragment
+def browse_jobs_tab():
+    st.subheader("📋 Available Job Postings")
     
-    # NEW TAB: Browse Jobs (as first tab)
-    with tab1:
-        st.subheader("📋 Available Job Postings")
-        
-        # Search and filter
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            search_term = st.text_input("Search jobs by title or description")
-        with col2:
-            show_active_only = st.checkbox("Show active only", value=True)
-        
-        # Get job postings
-        if search_term:
-            job_postings = db.search_job_postings(search_term)
-        else:
-            job_postings = db.get_all_job_postings(active_only=show_active_only)
-        
-        if job_postings:
-            st.success(f"Found {len(job_postings)} job postings")
-            
-            for job in job_postings:
-                with st.container():
-                    st.markdown(f"""
-                    <div class="job-posting">
-                        <h3>🏢 {job['title']}</h3>
-                        <p><strong>Posted by:</strong> {job.get('profiles', {}).get('username', 'Unknown Company')}</p>
-                        <p><strong>Status:</strong> {job['status'].title()}</p>
-                        <p><strong>Deadline:</strong> {job['deadline']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    with st.expander("View Details & Apply"):
-                        col1, col2 = st.columns([3, 1])
-                        
-                        with col1:
-                            st.write(f"**Description:** {job['description']}")
-                            st.write(f"**Requirements:** {job['requirements']}")
-                            st.write(f"**Posted on:** {job['created_at'].split('T')[0] if 'T' in str(job['created_at']) else job['created_at']}")
-                        
-                        with col2:
-                            st.write("### Apply Now")
-                            cover_letter = st.text_area(
-                                "Cover Letter (optional)", 
-                                key=f"cover_{job['id']}", 
-                                height=100,
-                                placeholder="Why are you interested in this position?"
-                            )
-                            
-                            if st.button("Submit Application", key=f"apply_{job['id']}"):
-                                if cover_letter.strip() == "":
-                                    cover_letter = "No cover letter provided"
-                                
-                                application = db.apply_to_job(
-                                    st.session_state.user_id, 
-                                    job['id'], 
-                                    cover_letter
-                                )
-                                if application:
-                                    st.success("✅ Application submitted successfully!")
-                                    time.sleep(2)
-                                    st.rerun()
-                                else:
-                                    st.error("❌ Failed to submit application")
-        else:
-            st.info("No job postings found. Check back later or try a different search term.")
+    # Search and filter
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        search_term = st.text_input("Search jobs by title or description")
+    with col2:
+        show_active_only = st.checkbox("Show active only", value=True)
     
-    # Existing tabs (renumbered)
-    with tab2:
-        st.subheader("My Job Applications")
-        
-        # Search and filter
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            search_term = st.text_input("Search applications", key="search_apps")
-        with col2:
-            status_filter = st.selectbox("Filter by status", ["All", "applied", "interview", "offer", "rejected"], key="status_filter")
-        
-        if search_term:
-            display_apps = db.search_applications(st.session_state.user_id, search_term)
-        else:
-            display_apps = applications
-        
-        if status_filter != "All":
-            display_apps = [app for app in display_apps if app['status'] == status_filter]
-        
-        if display_apps:
-            for app in display_apps:
-                with st.expander(f"{app['company']} - {app['role']} ({app['status'].title()})"):
-                    col1, col2, col3 = st.columns([2, 1, 1])
-                    with col1:
-                        st.write(f"**Applied on:** {app['applied_date']}")
-                        if app.get('notes'):
-                            st.write(f"**Notes:** {app['notes']}")
-                    with col2:
-                        new_status = st.selectbox(
-                            "Update Status",
-                            ["applied", "interview", "offer", "rejected"],
-                            index=["applied", "interview", "offer", "rejected"].index(app['status']),
-                            key=f"status_{app['id']}"
-                        )
-                        if new_status != app['status']:
-                            if st.button("Update", key=f"update_{app['id']}"):
-                                if db.update_application_status(app['id'], new_status):
-                                    st.success("Status updated!")
-                                    time.sleep(1)
-                                    st.rerun()
-                    with col3:
-                        if st.button("Delete", key=f"delete_{app['id']}"):
-                            if db.delete_application(app['id']):
-                                st.success("Application deleted!")
-                                time.sleep(1)
-                                st.rerun()
-        else:
-            st.info("No applications found")
+    # Get job postings, and recommendations alongside them
+    user_id = st.session_state.user_id
+    if search_term:
+        job_postings = db.search_job_postings(search_term, JOB_POSTING_LIST_FIELDS, active_only=show_active_only)
+        recommended = []
+    else:
+        recommender = get_recommendation_service()
+        try:
+            job_postings, recommended = fetch_all(
+                lambda: db.get_all_job_postings(active_only=show_active_only, fields=JOB_POSTING_LIST_FIELDS),
+                lambda: recommender.recommend_for_user(user_id, k=5)
+            )
+        except BackendTimeout:
+            st.error("Loading job postings is taking too long. Please try again in a moment.")
+            job_postings, recommended = [], []
+    
+    if job_postings and recommended:
+        postings_by_id = {job['id']: job for job in job_postings}
+        recommended = [(postings_by_id[job_id], score) for job_id, score in recommended if job_id in postings_by_id]
+        if recommended:
+            st.write("### ⭐ Recommended for you")
+            for job, score in recommended:
+                st.write(f"**{job['title']}** — {job.get('profiles', {}).get('username', 'Unknown Company')} ({score:.0%} match)")
+            st.write("---")
     
-    with tab3:
-        st.subheader("Add New Application")
-        with st.form("add_application"):
-            company = st.text_input("Company Name *")
-            job_role = st.text_input("Job Role *")
-            status = st.selectbox("Status", ["applied", "interview", "offer", "rejected"])
-            applied_date = st.date_input("Applied Date", value=date.today())
-            notes = st.text_area("Notes")
+    if job_postings:
+        st.success(f"Found {len(job_postings)} job postings")
+        for job in job_postings:
+            job_posting_card(job)
+    else:
+        st.info("No job postings found. Check back later or try a different search term.")
+
+@fragment
+def job_posting_card(job):
+    """One job on the board; typing a cover letter reruns only this card"""
+    with st.container():
+        st.markdown(f"""
+        <div class="job-posting">
+            <h3>🏢 {job['title']}</h3>
+            <p><strong>Posted by:</strong> {job.get('profiles', {}).get('username', 'Unknown Company')}</p>
+            <p><strong>Status:</strong> {job['status'].title()}</p>
+            <p><strong>Deadline:</strong> {job['deadline']}</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        with st.expander("View Details & Apply"):
+            col1, col2 = st.columns([3, 1])
             
-            if st.form_submit_button("Add Application"):
-                errors = Validation.validate_application_data(company, job_role, status)
-                if errors:
-                    for error in errors:
-                        st.error(error)
-                else:
-                    application = db.add_application(
-                        st.session_state.user_id, company, job_role, status, notes
+            with col1:
+                if st.toggle("Show description", key=f"job_details_{job['id']}"):
+                    details = load_details(
+                        "job_details", job['id'],
+                        lambda job_id: db.get_job_posting(job_id, ["description", "requirements"])
+                    )
+                    st.write(f"**Description:** {details.get('description', 'No description')}")
+                    st.write(f"**Requirements:** {details.get('requirements', 'No requirements')}")
+                st.write(f"**Posted on:** {job['created_at'].split('T')[0] if 'T' in str(job['created_at']) else job['created_at']}")
+            
+            with col2:
+                st.write("### Apply Now")
+                cover_letter = st.text_area(
+                    "Cover Letter (optional)",
+                    key=f"cover_{job['id']}",
+                    height=100,
+                    placeholder="Why are you interested in this position?"
+                )
+                
+                if st.button("Submit Application", key=f"apply_{job['id']}"):
+                    if cover_letter.strip() == "":
+                        cover_letter = "No cover letter provided"
+                    
+                    application = db.apply_to_job(
+                        st.session_state.user_id,
+                        job['id'],
+                        cover_letter
                     )
                     if application:
-                        st.success("Application added successfully!")
-                        time.sleep(1)
+                        st.success("✅ Application submitted successfully!")
+                        time.sleep(2)
+                        # The new application shows up in the other tabs, so rerun everything
                         st.rerun()
                     else:
-                        st.error("Failed to add application")
+                        st.error("❌ Failed to submit application")
+
+@fragment
+def my_applications_tab():
+    st.subheader("My Job Applications")
+    applications = seeker_applications()
     
-    with tab4:
-        st.subheader("Application Analytics")
-        if applications:
-            col1, col2 = st.columns(2)
-            with col1:
-                fig = Analytics.create_status_chart(applications)
-                if fig:
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info("Chart not available - using simple display")
-                    status_counts = {}
-                    for app in applications:
-                        status = app.get('status', 'applied')
-                        status_counts[status] = status_counts.get(status, 0) + 1
-                    
-                    st.bar_chart(status_counts)
-            
-            with col2:
-                fig2 = Analytics.create_timeline_chart(applications)
-                if fig2:
-                    st.plotly_chart(fig2, use_container_width=True)
-                else:
-                    st.info("Timeline chart not available")
-            
-            st.subheader("Detailed Statistics")
-            try:
-                df = pd.DataFrame(applications)
-                st.dataframe(df[['company', 'role', 'status', 'applied_date', 'notes']])
-            except:
-                for app in applications:
-                    st.write(f"**{app['company']}** - {app['role']} ({app['status']})")
-        else:
-            st.info("No applications to analyze")
+    # Search and filter
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        search_term = st.text_input("Search applications", key="search_apps")
+    with col2:
+        status_filter = st.selectbox("Filter by status", ["All", "applied", "interview", "offer", "rejected"], key="status_filter")
     
-    with tab5:
-        st.subheader("Follow-up Reminders")
-        followups = Notification.get_upcoming_followups(applications)
-        if followups:
-            st.warning(f"You have {len(followups)} applications that need follow-up:")
-            for app in followups:
-                st.write(f"**{app['company']}** - {app['role']} (Applied on: {app['applied_date']})")
+    if search_term:
+        # Searched in memory over the list already loaded; no request per keystroke
+        matches = get_application_search_index(st.session_state.user_id, applications).search(search_term)
+        # The index keeps the records it was built from; show their current status
+        current = {app['id']: app for app in applications}
+        display_apps = [current[match['id']] for match in matches if match['id'] in current]
+    else:
+        display_apps = applications
+    
+    if status_filter != "All":
+        display_apps = [app for app in display_apps if app['status'] == status_filter]
+    
+    if display_apps:
+        for app in display_apps:
+            application_card(app)
+    else:
+        st.info("No applications found")
+    
+    # Old rejected applications are moved to the archive; they are read-only
+    if st.checkbox("Show archived applications", key="show_archived_apps"):
+        archived = [
+            app for app in db.get_applications(st.session_state.user_id, APPLICATION_LIST_FIELDS, include_archived=True)
+            if app.get('archived')
+        ]
+        if archived:
+            st.dataframe(pd.DataFrame(archived)[["company", "role", "status", "applied_date"]], use_container_width=True)
         else:
-            st.success("No pending follow-ups! 🎉")
+            st.info("No archived applications")
+
+@fragment
+def application_card(app):
+    """One of the jobseeker's applications; updating its status reruns only this card"""
+    with st.expander(f"{app['company']} - {app['role']} ({app['status'].title()})"):
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            st.write(f"**Applied on:** {app['applied_date']}")
+            if st.toggle("Show notes", key=f"notes_{app['id']}"):
+                details = load_details(
+                    "application_notes", app['id'],
+                    lambda application_id: db.get_application(application_id, ["notes"])
+                )
+                st.write(f"**Notes:** {details.get('notes') or 'No notes'}")
+                if app.get('job_posting_id'):
+                    job_details = load_details(
+                        "job_details", app['job_posting_id'],
+                        lambda job_id: db.get_job_posting(job_id, ["description", "requirements"])
+                    )
+                    st.write(f"**Job Description:** {job_details.get('description', 'No description')}")
+        with col2:
+            new_status = st.selectbox(
+                "Update Status",
+                ["applied", "interview", "offer", "rejected"],
+                index=["applied", "interview", "offer", "rejected"].index(app['status']),
+                key=f"status_{app['id']}"
+            )
+            if new_status != app['status']:
+                if st.button("Update", key=f"update_{app['id']}"):
+                    updated = db.update_application_status(app['id'], new_status)
+                    if updated:
+                        # The record is shared with the run's application list, so the new
+                        # status survives this card's reruns without refetching anything
+                        app['status'] = new_status
+                        st.success("Status updated!")
+                        # Queued (write-behind) updates need no pause before rerunning
+                        if not updated.get('queued'):
+                            time.sleep(1)
+                        st.rerun(scope="fragment")
+        with col3:
+            if st.button("Delete", key=f"delete_{app['id']}"):
+                if db.delete_application(app['id']):
+                    st.success("Application deleted!")
+                    time.sleep(1)
+                    st.rerun()
+
+@fragment
+def add_application_tab():
+    st.subheader("Add New Application")
+    with st.form("add_application"):
+        company = st.text_input("Company Name *")
+        job_role = st.text_input("Job Role *")
+        status = st.selectbox("Status", ["applied", "interview", "offer", "rejected"])
+        applied_date = st.date_input("Applied Date", value=date.today())
+        notes = st.text_area("Notes")
+        
+        if st.form_submit_button("Add Application"):
+            errors = Validation.validate_application_data(company, job_role, status)
+            if errors:
+                for error in errors:
+                    st.error(error)
+            else:
+                application = db.add_application(
+                    st.session_state.user_id, company, job_role, status, notes
+                )
+                if application:
+                    st.success("Application added successfully!")
+                    time.sleep(1)
+                    st.rerun()
+                else:
+                    st.error("Failed to add application")
+
+@fragment
+def application_analytics_tab():
+    st.subheader("Application Analytics")
+    applications = seeker_applications()
+    if applications:
+        figures = get_figure_cache()
+        version = data_version(applications, APPLICATION_LIST_FIELDS)
+        col1, col2 = st.columns(2)
+        with col1:
+            fig = figures.figure(
+                (st.session_state.user_id, "status", version),
+                lambda: Analytics.create_status_chart(applications)
+            )
+            if fig:
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("Chart not available - using simple display")
+                status_counts = {}
+                for app in applications:
+                    status = app.get('status', 'applied')
+                    status_counts[status] = status_counts.get(status, 0) + 1
+                
+                st.bar_chart(status_counts)
+        
+        with col2:
+            bucket = st.selectbox("Group timeline by", ["day", "week", "month"], key="timeline_bucket")
+            # The timeline query only runs when the applications have changed
+            fig2 = figures.figure(
+                (st.session_state.user_id, "timeline", bucket, version),
+                lambda: Analytics.create_bucketed_timeline_chart(
+                    db.get_application_timeline(st.session_state.user_id, bucket), bucket
+                )
+            )
+            if fig2:
+                st.plotly_chart(fig2, use_container_width=True)
+            else:
+                st.info("Timeline chart not available")
+        
+        st.subheader("Detailed Statistics")
+        try:
+            df = pd.DataFrame(applications)
+            st.dataframe(df[['company', 'role', 'status', 'applied_date']])
+        except:
+            for app in applications:
+                st.write(f"**{app['company']}** - {app['role']} ({app['status']})")
+    else:
+        st.info("No applications to analyze")
+
+@fragment
+def followups_tab():
+    st.subheader("Follow-up Reminders")
+    followups = Notification.get_upcoming_followups(seeker_applications())
+    if followups:
+        st.warning(f"You have {len(followups)} applications that need follow-up:")
+        for app in followups:
+            st.write(f"**{app['company']}** - {app['role']} (Applied on: {app['applied_date']})")
+    else:
+        st.success("No pending follow-ups! 🎉")
 
 def jobprovider_dashboard():
     """Jobprovider dashboard"""
     st.title("🏢 Job Provider Dashboard")
     
-    # Quick stats
-    job_postings = db.get_job_postings(st.session_state.user_id)
-    total_jobs = len(job_postings) if job_postings else 0
-    active_jobs = len([job for job in job_postings if job.get('status') == 'active']) if job_postings else 0
-    
-    # Get applicant count
-    applicants_data = db.get_applicants_for_jobprovider(st.session_state.user_id)
-    total_applicants = len(applicants_data)
+    # Quick stats, from per-status counts rather than the postings themselves, fetched
+    # together with the selected section's data
+    section = st.session_state.get("provider_section", PROVIDER_SECTIONS[0])
+    prefetch("job_posting_counts", "applicant_counts", *PROVIDER_SECTION_DATA.get(section, []))
+    posting_counts = provider_posting_counts()
+    total_jobs = posting_counts['total']
+    active_jobs = posting_counts['active']
+    total_applicants = sum(counts['total'] for counts in provider_applicant_counts().values())
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -364,140 +620,228 @@ def jobprovider_dashboard():
     with col4:
         st.metric("Total Applicants", total_applicants)
     
-    # Main content - ADD "Applicants" TAB
-    tab1, tab2, tab3, tab4 = st.tabs(["My Job Postings", "Applicants", "Add New Job", "Manage Postings"])
+    # Only the selected section runs (see jobseeker_dashboard)
+    section = st.radio("Section", PROVIDER_SECTIONS, horizontal=True, key="provider_section", label_visibility="collapsed")
+    {
+        "My Job Postings": my_job_postings_tab,
+        "Applicants": applicants_tab,
+        "Add New Job": add_job_posting_tab,
+        "Manage Postings": manage_postings_tab,
+        "Analytics": hiring_analytics_tab,
+    }[section]()
+
+@fragment
+def my_job_postings_tab():
+    st.subheader("My Job Postings")
+    job_postings = provider_postings()
+    if job_postings:
+        applicant_counts = provider_applicant_counts()
+        for job in job_postings:
+            my_job_posting_card(job, applicant_counts.get(job['id'], {}).get('total', 0))
+    else:
+        st.info("No job postings yet")
+
+@fragment
+def my_job_posting_card(job, applicant_total):
+    """One of the provider's postings; changing its status reruns only this card"""
+    with st.expander(f"{job.get('title', 'Untitled')} ({job.get('status', 'active').title()})"):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            if st.toggle("Show description", key=f"my_job_details_{job['id']}"):
+                details = load_details(
+                    "job_details", job['id'],
+                    lambda job_id: db.get_job_posting(job_id, ["description", "requirements"])
+                )
+                st.write(f"**Description:** {details.get('description', 'No description')}")
+                st.write(f"**Requirements:** {details.get('requirements', 'No requirements')}")
+            st.write(f"**Deadline:** {job.get('deadline', 'No deadline')}")
+            st.write(f"**Created:** {job.get('created_at', 'Unknown')}")
+            st.write(f"**Applicants:** {applicant_total}")
+        
+        with col2:
+            current_status = job.get('status', 'active')
+            new_status = st.selectbox(
+                "Status",
+                ["active", "closed"],
+                index=0 if current_status == 'active' else 1,
+                key=f"job_status_{job['id']}"
+            )
+            if new_status != current_status:
+                if st.button("Update Status", key=f"update_job_{job['id']}"):
+                    if db.update_job_posting(job['id'], status=new_status):
+                        # Shared with the run's posting list; see application_card
+                        job['status'] = new_status
+                        st.success("Status updated!")
+                        time.sleep(1)
+                        st.rerun(scope="fragment")
+            if st.button("Delete", key=f"delete_job_{job['id']}"):
+                if db.delete_job_posting(job['id']):
+                    st.success("Job posting deleted!")
+                    time.sleep(1)
+                    st.rerun()
+
+@fragment
+def applicants_tab():
+    st.subheader("📋 Job Applicants")
+    
+    applicants_data = run_data("applicants")
+    if applicants_data:
+        total_applicants = sum(counts['total'] for counts in provider_applicant_counts().values())
+        st.success(f"You have {total_applicants} applicants across all your job postings")
+        
+        # Group by job posting
+        jobs_with_applicants = {}
+        for applicant in applicants_data:
+            job_id = applicant['job_posting_id']
+            if job_id not in jobs_with_applicants:
+                jobs_with_applicants[job_id] = {
+                    'job_title': applicant.get('job_title', 'Unknown Job'),
+                    'applicants': []
+                }
+            jobs_with_applicants[job_id]['applicants'].append(applicant)
+        
+        for job_id, job_data in jobs_with_applicants.items():
+            with st.expander(f"📝 {job_data['job_title']} - {len(job_data['applicants'])} applicants"):
+                for applicant in job_data['applicants']:
+                    applicant_card(applicant)
+    else:
+        st.info("No applicants yet. Applicants will appear here when job seekers apply to your postings.")
+
+@fragment
+def applicant_card(applicant):
+    """One applicant; updating their status reruns only this card and makes one write"""
+    st.markdown('<div class="applicant-card">', unsafe_allow_html=True)
     
-    with tab1:
-        st.subheader("My Job Postings")
-        if job_postings:
-            for job in job_postings:
-                with st.expander(f"{job.get('title', 'Untitled')} ({job.get('status', 'active').title()})"):
-                    col1, col2 = st.columns([3, 1])
-                    with col1:
-                        st.write(f"**Description:** {job.get('description', 'No description')}")
-                        st.write(f"**Requirements:** {job.get('requirements', 'No requirements')}")
-                        st.write(f"**Deadline:** {job.get('deadline', 'No deadline')}")
-                        st.write(f"**Created:** {job.get('created_at', 'Unknown')}")
-                        
-                        # Show applicant count for this job
-                        job_applicants = [app for app in applicants_data if app.get('job_posting_id') == job['id']]
-                        st.write(f"**Applicants:** {len(job_applicants)}")
-                        
-                    with col2:
-                        current_status = job.get('status', 'active')
-                        new_status = st.selectbox(
-                            "Status",
-                            ["active", "closed"],
-                            index=0 if current_status == 'active' else 1,
-                            key=f"job_status_{job['id']}"
-                        )
-                        if new_status != current_status:
-                            if st.button("Update Status", key=f"update_job_{job['id']}"):
-                                if db.update_job_posting(job['id'], status=new_status):
-                                    st.success("Status updated!")
-                                    time.sleep(1)
-                                    st.rerun()
-                        if st.button("Delete", key=f"delete_job_{job['id']}"):
-                            if db.delete_job_posting(job['id']):
-                                st.success("Job posting deleted!")
-                                time.sleep(1)
-                                st.rerun()
-        else:
-            st.info("No job postings yet")
+    app_data = applicant.get('applications', {})
+    profile_data = app_data.get('profiles', {})
     
-    # NEW TAB: Applicants
-    with tab2:
-        st.subheader("📋 Job Applicants")
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.write(f"**👤 Applicant:** {profile_data.get('username', 'Unknown')}")
+        st.write(f"**📧 Email:** {profile_data.get('email', 'Unknown')}")
+        st.write(f"**📅 Applied on:** {applicant.get('applied_at', 'Unknown')}")
+        st.write(f"**📊 Status:** {app_data.get('status', 'applied').title()}")
         
-        if applicants_data:
-            st.success(f"You have {total_applicants} applicants across all your job postings")
-            
-            # Group by job posting
-            jobs_with_applicants = {}
-            for applicant in applicants_data:
-                job_id = applicant['job_posting_id']
-                if job_id not in jobs_with_applicants:
-                    jobs_with_applicants[job_id] = {
-                        'job_title': applicant.get('job_title', 'Unknown Job'),
-                        'applicants': []
-                    }
-                jobs_with_applicants[job_id]['applicants'].append(applicant)
-            
-            for job_id, job_data in jobs_with_applicants.items():
-                with st.expander(f"📝 {job_data['job_title']} - {len(job_data['applicants'])} applicants"):
-                    for applicant in job_data['applicants']:
-                        st.markdown('<div class="applicant-card">', unsafe_allow_html=True)
-                        
-                        app_data = applicant.get('applications', {})
-                        profile_data = app_data.get('profiles', {})
-                        
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            st.write(f"**👤 Applicant:** {profile_data.get('username', 'Unknown')}")
-                            st.write(f"**📧 Email:** {profile_data.get('email', 'Unknown')}")
-                            st.write(f"**📅 Applied on:** {applicant.get('applied_at', 'Unknown')}")
-                            st.write(f"**📊 Status:** {app_data.get('status', 'applied').title()}")
-                            
-                            # Show cover letter/notes
-                            notes = app_data.get('notes', '')
-                            if notes:
-                                with st.expander("View Application Details"):
-                                    st.write(notes)
-                        
-                        with col2:
-                            # Job provider can update application status
-                            current_status = app_data.get('status', 'applied')
-                            new_status = st.selectbox(
-                                "Update Status",
-                                ["applied", "interview", "offer", "rejected"],
-                                index=["applied", "interview", "offer", "rejected"].index(current_status) if current_status in ["applied", "interview", "offer", "rejected"] else 0,
-                                key=f"app_status_{app_data.get('id')}"
-                            )
-                            if new_status != current_status:
-                                if st.button("Update", key=f"update_app_{app_data.get('id')}"):
-                                    if db.update_application_status(app_data.get('id'), new_status):
-                                        st.success("Application status updated!")
-                                        time.sleep(1)
-                                        st.rerun()
-                        
-                        st.markdown('</div>', unsafe_allow_html=True)
-        else:
-            st.info("No applicants yet. Applicants will appear here when job seekers apply to your postings.")
+        # Show cover letter/notes
+        if st.toggle("View Application Details", key=f"app_details_{app_data.get('id')}"):
+            details = load_details(
+                "application_notes", app_data.get('id'),
+                lambda application_id: db.get_application(application_id, ["notes"])
+            )
+            st.write(details.get('notes') or "No details provided")
     
-    with tab3:
-        st.subheader("Add New Job Posting")
-        with st.form("add_job_posting"):
-            title = st.text_input("Job Title *")
-            description = st.text_area("Job Description *")
-            requirements = st.text_area("Requirements *")
-            deadline = st.date_input("Application Deadline")
-            
-            if st.form_submit_button("Create Job Posting"):
-                errors = Validation.validate_job_posting_data(title, description, deadline)
-                if errors:
-                    for error in errors:
-                        st.error(error)
-                else:
-                    job = db.add_job_posting(
-                        st.session_state.user_id, title, description, 
-                        requirements, deadline.isoformat()
-                    )
-                    if job:
-                        st.success("Job posting created successfully!")
+    with col2:
+        # Job provider can update application status
+        current_status = app_data.get('status', 'applied')
+        new_status = st.selectbox(
+            "Update Status",
+            ["applied", "interview", "offer", "rejected"],
+            index=["applied", "interview", "offer", "rejected"].index(current_status) if current_status in ["applied", "interview", "offer", "rejected"] else 0,
+            key=f"app_status_{app_data.get('id')}"
+        )
+        if new_status != current_status:
+            if st.button("Update", key=f"update_app_{app_data.get('id')}"):
+                updated = db.update_application_status(app_data.get('id'), new_status)
+                if updated:
+                    # Shared with the run's applicant list; see application_card
+                    app_data['status'] = new_status
+                    st.success("Application status updated!")
+                    if not updated.get('queued'):
                         time.sleep(1)
-                        st.rerun()
-                    else:
-                        st.error("Failed to create job posting")
+                    st.rerun(scope="fragment")
     
-    with tab4:
-        st.subheader("Manage Job Postings")
-        if job_postings:
-            st.info("Use the 'My Job Postings' tab to manage individual postings")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+@fragment
+def add_job_posting_tab():
+    st.subheader("Add New Job Posting")
+    with st.form("add_job_posting"):
+        title = st.text_input("Job Title *")
+        description = st.text_area("Job Description *")
+        requirements = st.text_area("Requirements *")
+        deadline = st.date_input("Application Deadline")
+        
+        if st.form_submit_button("Create Job Posting"):
+            errors = Validation.validate_job_posting_data(title, description, deadline)
+            if errors:
+                for error in errors:
+                    st.error(error)
+            else:
+                job = db.add_job_posting(
+                    st.session_state.user_id, title, description,
+                    requirements, deadline.isoformat()
+                )
+                if job:
+                    st.success("Job posting created successfully!")
+                    time.sleep(1)
+                    st.rerun()
+                else:
+                    st.error("Failed to create job posting")
+
+@fragment
+def manage_postings_tab():
+    st.subheader("Manage Job Postings")
+    if provider_posting_counts()['total']:
+        st.info("Use the 'My Job Postings' tab to manage individual postings")
+    else:
+        st.info("No job postings to manage")
+
+@fragment
+def hiring_analytics_tab():
+    st.subheader("📈 Hiring Analytics")
+    rollups = run_data("rollups")
+    if rollups:
+        figures = get_figure_cache()
+        version = data_version(rollups, ROLLUP_VERSION_FIELDS)
+        funnel = Analytics.get_provider_funnel(rollups)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Applied → Interview", f"{funnel['interview_rate']}%")
+        with col2:
+            st.metric("Interview → Offer", f"{funnel['offer_rate']}%")
+        with col3:
+            st.metric("Applied → Offer", f"{funnel['overall_rate']}%")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            fig = figures.figure(
+                (st.session_state.user_id, "funnel", version),
+                lambda: Analytics.create_funnel_chart(funnel)
+            )
+            if fig:
+                st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            st.write("**Most Applied Positions**")
+            most_applied = Analytics.get_most_applied_positions(rollups)
+            if most_applied:
+                st.dataframe(pd.DataFrame(most_applied)[['title', 'applicants']], hide_index=True)
+            else:
+                st.info("No applicants yet")
+        
+        days = st.selectbox("Trend period (days)", [30, 90, 365], index=1, key="provider_trend_days")
+        start = datetime.now().date() - timedelta(days=days)
+        titles = {
+            row['job_posting_id']: (row.get('job_postings') or {}).get('title', 'Unknown Job')
+            for row in rollups
+        }
+        fig2 = figures.figure(
+            (st.session_state.user_id, "trend", start, version),
+            lambda: Analytics.create_posting_trend_chart(
+                db.get_provider_daily_applicants(st.session_state.user_id, start), titles
+            )
+        )
+        if fig2:
+            st.plotly_chart(fig2, use_container_width=True)
         else:
-            st.info("No job postings to manage")
+            st.info("No applicants in this period")
+    else:
+        st.info("No analytics yet. Data will appear once job seekers apply to your postings.")
 
 def main():
     """Main application"""
+    # Fragment reruns skip main(), so this counts full reruns (see run_data)
+    st.session_state.run_generation += 1
     if not st.session_state.authenticated:
         login_page()
     else:
@@ -513,16 +857,16 @@ def main():
                     st.write("---")
                     st.subheader("Quick Actions")
                     if st.button("Browse Available Jobs"):
-                        st.info("Go to the 'Browse Jobs' tab to see available positions")
+                        st.session_state.seeker_section = "Browse Jobs"
                 
                 elif st.session_state.user_role == 'jobprovider':
                     st.write("---")
                     st.subheader("Quick Actions")
                     if st.button("Create New Job Posting"):
-                        st.info("Go to the 'Add New Job' tab to create a posting")
+                        st.session_state.provider_section = "Add New Job"
                     if st.button("View Applicants"):
-                        st.info("Go to the 'Applicants' tab to see who applied")
-                        
+                        st.session_state.provider_section = "Applicants"
+            
             else:
                 st.title("Welcome!")
                 st.write("User profile not loaded")
@@ -544,4 +888,7 @@ def main():
             st.error("Invalid user role. Please contact support.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Opt-in profiling of this rerun: "?profile=1" (requires PROFILING_ENABLED=1)
+    # or randomly sampled reruns at PROFILE_SAMPLE_RATE
+    with profile_if_requested(f"streamlit-{st.session_state.user_role or 'login'}", st.query_params.get("profile")):
+        main()
\ No newline at end of file
@@ -0,0 +1,55 @@
+import os
+import time
+from datetime import date, timedelta
+
+class Archiver:
+    """Moves old rejected applications and closed job postings to the archive tables
+    
+    Applications are aged by when their status last changed (status_changed_at),
+    postings by their deadline. Each policy is archived in batches of batch_size
+    rows until a batch comes back short, so the hot tables stay small without
+    one long-running move. Set an age to None to skip that policy.
+    """
+    
+    def __init__(self, db, rejected_after_days=None, closed_postings_after_days=None, batch_size=None, max_batches=1000):
+        self.db = db
+        self.rejected_after_days = _days(rejected_after_days, "ARCHIVE_REJECTED_AFTER_DAYS", 180)
+        self.closed_postings_after_days = _days(closed_postings_after_days, "ARCHIVE_CLOSED_POSTINGS_AFTER_DAYS", 365)
+        self.batch_size = batch_size or int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+        self.max_batches = max_batches
+    
+    def run_once(self, today=None):
+        """Archive everything past its policy age and return counts per table"""
+        today = today or date.today()
+        started = time.perf_counter()
+        stats = {"applications": 0, "job_postings": 0}
+        
+        if self.rejected_after_days is not None:
+            before = today - timedelta(days=self.rejected_after_days)
+            stats["applications"] = self._drain(lambda: self.db.archive_applications("rejected", before, self.batch_size))
+        
+        # Applications first: postings are only archived once no live application references them
+        if self.closed_postings_after_days is not None:
+            before = today - timedelta(days=self.closed_postings_after_days)
+            stats["job_postings"] = self._drain(lambda: self.db.archive_job_postings(before, self.batch_size))
+        
+        stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return stats
+    
+    def _drain(self, archive_batch):
+        moved = 0
+        for _ in range(self.max_batches):
+            ids = archive_batch()
+            moved += len(ids)
+            if len(ids) < self.batch_size:
+                break
+        return moved
+
+def _days(value, env_name, default):
+    """An age in days from the argument or environment; 'off' or a negative value disables it"""
+    if value is None:
+        value = os.getenv(env_name, str(default))
+    if str(value).lower() in ("off", "none", ""):
+        return None
+    value = int(value)
+    return value if value >= 0 else None
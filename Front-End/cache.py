@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict
+
+def data_version(records, keys):
+    """Changes whenever a record is added, removed or has one of the given fields edited
+    
+    Shared by every cache keyed on a list's contents (chart figures, the search
+    index), so they all notice the same edits.
+    """
+    return hash(tuple(tuple(str(record.get(key)) for key in keys) for record in records))
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after a fixed time"""
+    
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """Get a cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+    
+    def get_many(self, keys):
+        """Get all cached values for the given keys as a dict (missing keys omitted)"""
+        found = {}
+        missing = object()
+        for key in keys:
+            value = self.get(key, missing)
+            if value is not missing:
+                found[key] = value
+        return found
+    
+    def set(self, key, value):
+        """Cache a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def delete(self, key):
+        """Remove a cached value if present"""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self):
+        """Remove all cached values"""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
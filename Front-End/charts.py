@@ -0,0 +1,40 @@
+import threading
+
+import plotly.io as pio
+
+from cache import TTLCache
+
+class FigureCache:
+    """Bounded LRU of Plotly figures, stored as JSON and shared by every session
+    
+    Keys should include whose data the chart shows and a version of that data
+    (see cache.data_version), so a figure is rebuilt only when its data changes. The
+    TTL only bounds how long unused figures stay around.
+    """
+    
+    def __init__(self, maxsize=512, ttl=3600):
+        self._figures = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def figure(self, key, build):
+        """The figure cached under key, or build() one (a figure or None) and cache it"""
+        cached = self._figures.get(key)
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        
+        if cached is None:
+            fig = build()
+            # "" remembers that there was nothing to chart
+            cached = fig.to_json() if fig is not None else ""
+            self._figures.set(key, cached)
+        # A fresh figure per call, so callers can't change the cached one
+        return pio.from_json(cached) if cached else None
+    
+    def stats(self):
+        with self._lock:
+            return {"figures": len(self._figures), "hits": self.hits, "misses": self.misses}
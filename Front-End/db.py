@@ -1,45 +1,368 @@
 import os
-from supabase import create_client
+from supabase import create_client, ClientOptions
 from dotenv import load_dotenv
 import uuid
+from datetime import date, timedelta
+from cache import TTLCache
+from write_behind import StatusWriteBehind
+from sweeper import DeadlineSweeper
+from profiling import instrument
+from roundtrips import CountingClient
+from resilience import ResilientClient, ResiliencePolicy
+from replicas import ReplicaRouter
+
+# Database functions that only read, so they may be retried and hedged like selects
+READ_ONLY_RPCS = (
+    "applicant_counts_for_provider", "application_timeline",
+    "application_status_counts", "job_posting_status_counts",
+)
 
 load_dotenv()
 
+APPLICATION_STATUSES = ("applied", "interview", "offer", "rejected")
+
+# Public methods are timed while a request profile is active (see profiling.py)
+@instrument
 class Database:
-    def __init__(self):
+    def __init__(self, client=None, replica_clients=None):
         # Try to get from environment variables first
         self.url = os.getenv("SUPABASE_URL")
         self.key = os.getenv("SUPABASE_KEY")
         
-        # If not found in env, try Streamlit secrets (only works in Streamlit)
-        if not self.url or not self.key:
-            try:
-                import streamlit as st
-                self.url = st.secrets.get("SUPABASE_URL", self.url)
-                self.key = st.secrets.get("SUPABASE_KEY", self.key)
-            except ImportError:
-                # Streamlit not available (running in FastAPI)
-                pass
+        if client is not None:
+            # Pre-built clients, e.g. the local stand-in backends used by tools/
+            policy = ResiliencePolicy.from_env()
+            primary = ResilientClient(client, policy, read_only_rpcs=READ_ONLY_RPCS)
+            replicas = [
+                ResilientClient(replica, policy, read_only_rpcs=READ_ONLY_RPCS)
+                for replica in replica_clients or []
+            ]
+        else:
+            # If not found in env, try Streamlit secrets (only works in Streamlit)
+            if not self.url or not self.key:
+                try:
+                    import streamlit as st
+                    self.url = st.secrets.get("SUPABASE_URL", self.url)
+                    self.key = st.secrets.get("SUPABASE_KEY", self.key)
+                except ImportError:
+                    # Streamlit not available (running in FastAPI)
+                    pass
+            
+            # If still not found, raise error
+            if not self.url or not self.key:
+                raise ValueError(
+                    "Supabase credentials not found. "
+                    "Please set SUPABASE_URL and SUPABASE_KEY environment variables "
+                    "or create a .env file with these values."
+                )
+            
+            # Deadlines, read retries, hedging and a circuit breaker around every call (see resilience.py);
+            # the HTTP timeout matches the deadline so abandoned calls are cleaned up too
+            policy = ResiliencePolicy.from_env()
+            options = ClientOptions(postgrest_client_timeout=policy.timeout)
+            primary = ResilientClient(create_client(self.url, self.key, options=options), policy, read_only_rpcs=READ_ONLY_RPCS)
+            
+            # Optional read replicas, e.g. SUPABASE_READ_REPLICAS=https://replica-1...,https://replica-2...
+            replica_key = os.getenv("SUPABASE_READ_REPLICA_KEY", self.key)
+            replica_urls = [url.strip() for url in os.getenv("SUPABASE_READ_REPLICAS", "").split(",") if url.strip()]
+            replicas = [
+                ResilientClient(create_client(url, replica_key, options=options), policy, read_only_rpcs=READ_ONLY_RPCS)
+                for url in replica_urls
+            ]
+        
+        # Writes go to the primary and reads to the replicas, except a session's reads
+        # right after it writes (see replicas.py). Every execute() is counted so tests can
+        # pin round-trip budgets (see roundtrips.py).
+        self._router = ReplicaRouter(
+            primary, replicas, read_only_rpcs=READ_ONLY_RPCS,
+            pin_seconds=float(os.getenv("REPLICA_PIN_SECONDS", "5"))
+        )
+        self.supabase = CountingClient(self._router)
+        
+        # Posting title/poster lookups used to hydrate applications
+        self._posting_cache = TTLCache(
+            maxsize=int(os.getenv("POSTING_CACHE_SIZE", "5000")),
+            ttl=int(os.getenv("POSTING_CACHE_TTL", "300"))
+        )
+        # Profiles by user ID: (complete, columns) where complete means every column was
+        # read; filled by profile lookups and by profiles embedded in bulk reads
+        self._profile_cache = TTLCache(
+            maxsize=int(os.getenv("PROFILE_CACHE_SIZE", "10000")),
+            ttl=int(os.getenv("PROFILE_CACHE_TTL", "300"))
+        )
+        # Job board listings, keyed by (active_only, columns)
+        self._board_cache = TTLCache(
+            maxsize=32,
+            ttl=int(os.getenv("JOB_BOARD_CACHE_TTL", "30"))
+        )
+        # Optional channel that propagates invalidations to other processes
+        self._invalidation_bus = None
         
-        # If still not found, raise error
-        if not self.url or not self.key:
-            raise ValueError(
-                "Supabase credentials not found. "
-                "Please set SUPABASE_URL and SUPABASE_KEY environment variables "
-                "or create a .env file with these values."
-            )
+        # Optional write-behind queue for application status updates
+        self._write_behind = None
+        if os.getenv("WRITE_BEHIND", "").lower() in ("1", "true", "yes"):
+            self.enable_write_behind()
+        
+        # Optional background job that closes postings past their deadline
+        self._sweeper = None
+    
+    def enable_write_behind(self, journal_dir=None, flush_interval=None, max_batch=None):
+        """Acknowledge status updates immediately and write them in coalesced batches"""
+        if self._write_behind:
+            return
+        self._write_behind = StatusWriteBehind(
+            self._write_status_batch,
+            journal_dir=journal_dir,
+            flush_interval=flush_interval or float(os.getenv("WRITE_BEHIND_INTERVAL", "0.5")),
+            max_batch=max_batch or int(os.getenv("WRITE_BEHIND_MAX_BATCH", "100"))
+        )
+        self._write_behind.start()
+    
+    def flush_writes(self):
+        """Write any queued status updates now"""
+        if self._write_behind:
+            self._write_behind.flush()
+    
+    def enable_deadline_sweeper(self, interval=None, batch_size=None):
+        """Close expired job postings now and then every interval seconds"""
+        if self._sweeper:
+            return self._sweeper
+        self._sweeper = DeadlineSweeper(
+            self.close_expired_job_postings,
+            interval=interval or int(os.getenv("DEADLINE_SWEEP_INTERVAL", "3600")),
+            batch_size=batch_size or int(os.getenv("DEADLINE_SWEEP_BATCH_SIZE", "500"))
+        )
+        self._sweeper.start()
+        return self._sweeper
+    
+    def ping(self):
+        """Whether the backend answers a trivial query"""
+        try:
+            self.supabase.table("profiles").select("id").limit(1).execute()
+            return True
+        except Exception as e:
+            self._handle_error(f"Error reaching the database: {e}")
+            return False
+    
+    def warm_posting_cache(self, limit=500):
+        """Load summaries of the most recent postings into the hydration cache"""
+        try:
+            response = self.supabase.table("job_postings")\
+                .select("id, title, profiles(id, username)")\
+                .order("created_at", desc=True)\
+                .limit(limit)\
+                .execute()
+            self._remember_profiles(job.get('profiles') for job in response.data)
+            for job in response.data:
+                self._posting_cache.set(job['id'], {
+                    "title": job['title'],
+                    "company": (job.get('profiles') or {}).get('username', 'Unknown Company')
+                })
+            return len(response.data)
+        except Exception as e:
+            self._handle_error(f"Error warming the posting cache: {e}")
+            return 0
+    
+    def warm_profile_cache(self, limit=500):
+        """Load the most recently created profiles, complete, into the profile cache"""
+        try:
+            response = self.supabase.table("profiles")\
+                .select("*")\
+                .order("created_at", desc=True)\
+                .limit(limit)\
+                .execute()
+            self._remember_profiles(response.data, complete=True)
+            return len(response.data)
+        except Exception as e:
+            self._handle_error(f"Error warming the profile cache: {e}")
+            return 0
+    
+    def get_backend_health(self):
+        """Circuit breaker state, retry/hedge/timeout counters and per-endpoint latency"""
+        return self._router.health()
+    
+    def get_sweeper_stats(self):
+        """Run statistics for the deadline sweeper, or None when it is not enabled"""
+        return self._sweeper.stats() if self._sweeper else None
+    
+    def close(self):
+        """Flush queued writes and stop background work"""
+        if self._sweeper:
+            self._sweeper.stop()
+            self._sweeper = None
+        if self._write_behind:
+            self._write_behind.stop()
+            self._write_behind = None
+    
+    def _write_status_batch(self, status, application_ids):
+        """Set one status on many applications in a single request"""
+        self.supabase.table("applications").update({"status": status}).in_("id", application_ids).execute()
+    
+    def _apply_pending_statuses(self, applications):
+        """Show queued status updates in applications read before they are flushed"""
+        if self._write_behind:
+            for app in applications:
+                pending = self._write_behind.pending_status(app.get('id'))
+                if pending and 'status' in app:
+                    app['status'] = pending
+        return applications
+    
+    def attach_invalidation_bus(self, bus):
+        """Publish cache invalidations to other processes through the given bus"""
+        self._invalidation_bus = bus
+    
+    def handle_invalidation(self, namespace, key=None):
+        """Apply a cache invalidation received from another process"""
+        self._invalidate(namespace, key, publish=False)
+    
+    def _invalidate(self, namespace, key=None, publish=True):
+        """Drop cached entries for a namespace locally and, optionally, everywhere else"""
+        if namespace == "job_postings":
+            if key is None:
+                self._posting_cache.clear()
+            else:
+                self._posting_cache.delete(key)
+            self._board_cache.clear()
+        elif namespace == "profiles":
+            if key is None:
+                self._profile_cache.clear()
+            else:
+                self._profile_cache.delete(key)
+        
+        if publish and self._invalidation_bus:
+            self._invalidation_bus.publish(namespace, key)
+    
+    def _columns(self, fields=None, default="*", embed=None):
+        """Build a select() column list, optionally restricted to the given fields"""
+        if isinstance(fields, str):
+            fields = fields.split(",")
+        fields = [field.strip() for field in fields or [] if field.strip()]
+        columns = ", ".join(fields) if fields else default
+        return f"{columns}, {embed}" if embed else columns
+    
+    def _application_columns(self, fields=None):
+        """Select columns for applications, keeping the posting reference needed for hydration"""
+        if isinstance(fields, str):
+            fields = fields.split(",")
+        fields = [field.strip() for field in fields or [] if field.strip()]
+        if fields and ('company' in fields or 'role' in fields) and 'job_posting_id' not in fields:
+            fields.append('job_posting_id')
+        return self._columns(fields)
+    
+    def _get_posting_summaries(self, job_posting_ids, include_archived=False):
+        """Get title and poster username for postings, from cache where possible"""
+        summaries = self._posting_cache.get_many(job_posting_ids)
+        missing = [job_id for job_id in job_posting_ids if job_id not in summaries]
+        tables = ("job_postings", "job_postings_archive") if include_archived else ("job_postings",)
+        for table in tables:
+            if not missing:
+                break
+            response = self.supabase.table(table)\
+                .select("id, title, profiles(id, username)")\
+                .in_("id", missing)\
+                .execute()
+            self._remember_profiles(job.get('profiles') for job in response.data)
+            for job in response.data:
+                summary = {
+                    "title": job['title'],
+                    "company": (job.get('profiles') or {}).get('username', 'Unknown Company')
+                }
+                self._posting_cache.set(job['id'], summary)
+                summaries[job['id']] = summary
+            missing = [job_id for job_id in missing if job_id not in summaries]
+        return summaries
+    
+    def _hydrate_applications(self, applications, include_archived=False):
+        """Fill in company and role for applications that reference a job posting but have no snapshot"""
+        self._apply_pending_statuses(applications)
+        job_posting_ids = list({
+            app['job_posting_id'] for app in applications
+            if app.get('job_posting_id') and not (app.get('company') and app.get('role'))
+        })
+        if not job_posting_ids:
+            return applications
         
-        self.supabase = create_client(self.url, self.key)
+        summaries = self._get_posting_summaries(job_posting_ids, include_archived)
+        for app in applications:
+            summary = summaries.get(app.get('job_posting_id'))
+            if summary:
+                if not app.get('company'):
+                    app['company'] = summary['company']
+                if not app.get('role'):
+                    app['role'] = summary['title']
+        return applications
+    
+    def _remember_profiles(self, profiles, complete=False):
+        """Cache profile rows by user ID, merging partial rows (e.g. embeds) into what is known"""
+        for profile in profiles:
+            if not profile or not profile.get('id'):
+                continue
+            cached = self._profile_cache.get(profile['id'])
+            if cached and not complete:
+                self._profile_cache.set(profile['id'], (cached[0], dict(cached[1], **profile)))
+            else:
+                self._profile_cache.set(profile['id'], (complete, dict(profile)))
     
-    def get_user_profile(self, user_id):
+    def _cached_profile(self, user_id, fields):
+        """A copy of the cached profile if it has every requested column, else None"""
+        cached = self._profile_cache.get(user_id)
+        if cached is None:
+            return None
+        complete, profile = cached
+        if fields:
+            if all(field in profile for field in fields):
+                return {field: profile[field] for field in fields}
+            return None
+        return dict(profile) if complete else None
+    
+    def _profile_fields(self, fields):
+        if isinstance(fields, str):
+            fields = fields.split(",")
+        return [field.strip() for field in fields or [] if field.strip()]
+    
+    def get_user_profile(self, user_id, fields=None):
         """Get user profile by ID"""
+        fields = self._profile_fields(fields)
+        cached = self._cached_profile(user_id, fields)
+        if cached is not None:
+            return cached
         try:
-            response = self.supabase.table("profiles").select("*").eq("id", user_id).execute()
-            return response.data[0] if response.data else None
+            response = self.supabase.table("profiles").select(self._columns(fields)).eq("id", user_id).execute()
+            if not response.data:
+                return None
+            if 'id' in response.data[0]:
+                self._remember_profiles(response.data, complete=not fields)
+            return response.data[0]
         except Exception as e:
             self._handle_error(f"Error fetching user profile: {e}")
             return None
     
+    def get_user_profiles(self, user_ids, fields=None):
+        """Get many user profiles by ID in at most one request, as a dict keyed by ID"""
+        fields = self._profile_fields(fields)
+        profiles = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            cached = self._cached_profile(user_id, fields)
+            if cached is not None:
+                profiles[user_id] = cached
+            else:
+                missing.append(user_id)
+        if not missing:
+            return profiles
+        
+        try:
+            # The ID is needed to key the results even when it was not asked for
+            columns = self._columns(fields + ['id'] if fields and 'id' not in fields else fields)
+            response = self.supabase.table("profiles").select(columns).in_("id", missing).execute()
+            self._remember_profiles(response.data, complete=not fields)
+            for profile in response.data:
+                profiles[profile['id']] = {field: profile[field] for field in fields} if fields else profile
+            return profiles
+        except Exception as e:
+            self._handle_error(f"Error fetching user profiles: {e}")
+            return profiles
+    
     def create_user_profile(self, user_id, username, email, role):  
         """Create a new user profile"""
         try:
@@ -50,6 +373,7 @@ class Database:
                 "role": role
             }
             response = self.supabase.table("profiles").insert(profile_data).execute()
+            self._invalidate("profiles", user_id)
             return response.data[0] if response.data else None
         except Exception as e:
             if "violates foreign key constraint" in str(e):
@@ -61,6 +385,7 @@ class Database:
                         "role": role
                     }
                     response = self.supabase.table("profiles").insert(profile_data).execute()
+                    self._invalidate("profiles", user_id)
                     if response.data:
                         # Return the generated ID
                         return response.data[0]
@@ -71,15 +396,60 @@ class Database:
             return None
     
     # Jobseeker operations
-    def get_applications(self, user_id):
-        """Get all applications for a jobseeker"""
+    def get_applications(self, user_id, fields=None, include_archived=False):
+        """Get all applications for a jobseeker, optionally including archived ones"""
         try:
-            response = self.supabase.table("applications").select("*").eq("user_id", user_id).execute()
-            return response.data
+            columns = self._application_columns(fields)
+            response = self.supabase.table("applications").select(columns).eq("user_id", user_id).execute()
+            if not include_archived:
+                return self._hydrate_applications(response.data)
+            
+            archived = self.supabase.table("applications_archive").select(columns).eq("user_id", user_id).execute()
+            for app in archived.data:
+                app['archived'] = True
+            return self._hydrate_applications(response.data + archived.data, include_archived=True)
         except Exception as e:
             self._handle_error(f"Error fetching applications: {e}")
             return []
     
+    def get_application_page(self, user_id, fields=None, offset=0, limit=50):
+        """One page of a jobseeker's applications, newest first, and how many there are in total"""
+        try:
+            response = self.supabase.table("applications")\
+                .select(self._application_columns(fields), count="exact")\
+                .eq("user_id", user_id)\
+                .order("applied_date", desc=True)\
+                .order("id", desc=True)\
+                .range(offset, offset + limit - 1)\
+                .execute()
+            return self._hydrate_applications(response.data), response.count or 0
+        except Exception as e:
+            self._handle_error(f"Error fetching applications: {e}")
+            return [], 0
+    
+    def get_followup_candidates(self, user_id, fields=None, older_than_days=3):
+        """A jobseeker's applications still applied or interviewing, applied at least older_than_days ago"""
+        try:
+            response = self.supabase.table("applications")\
+                .select(self._application_columns(fields))\
+                .eq("user_id", user_id)\
+                .in_("status", ["applied", "interview"])\
+                .lte("applied_date", (date.today() - timedelta(days=older_than_days)).isoformat())\
+                .execute()
+            return self._hydrate_applications(response.data)
+        except Exception as e:
+            self._handle_error(f"Error fetching follow-up candidates: {e}")
+            return []
+    
+    def get_application(self, application_id, fields=None):
+        """Get a single application by ID"""
+        try:
+            response = self.supabase.table("applications").select(self._application_columns(fields)).eq("id", application_id).execute()
+            return self._hydrate_applications(response.data)[0] if response.data else None
+        except Exception as e:
+            self._handle_error(f"Error fetching application: {e}")
+            return None
+    
     def add_application(self, user_id, company, role, status, notes=None):
         """Add a new job application"""
         try:
@@ -98,6 +468,22 @@ class Database:
     
     def update_application_status(self, application_id, status):
         """Update application status"""
+        if status not in APPLICATION_STATUSES:
+            self._handle_error(f"Invalid application status: {status}")
+            return None
+        
+        if self._write_behind:
+            # Only acknowledge updates to applications that exist; the write itself is deferred
+            try:
+                response = self.supabase.table("applications").select("id").eq("id", application_id).execute()
+            except Exception as e:
+                self._handle_error(f"Error updating application: {e}")
+                return None
+            if not response.data:
+                return None
+            self._write_behind.enqueue(application_id, status)
+            return {"id": application_id, "status": status, "queued": True}
+        
         try:
             response = self.supabase.table("applications").update({"status": status}).eq("id", application_id).execute()
             return response.data[0] if response.data else None
@@ -115,15 +501,46 @@ class Database:
             return False
     
     # Jobprovider operations
-    def get_job_postings(self, user_id):
-        """Get all job postings for a jobprovider"""
+    def get_job_postings(self, user_id, fields=None, include_archived=False):
+        """Get all job postings for a jobprovider, optionally including archived ones"""
         try:
-            response = self.supabase.table("job_postings").select("*").eq("user_id", user_id).execute()
-            return response.data
+            columns = self._columns(fields)
+            response = self.supabase.table("job_postings").select(columns).eq("user_id", user_id).execute()
+            if not include_archived:
+                return response.data
+            
+            archived = self.supabase.table("job_postings_archive").select(columns).eq("user_id", user_id).execute()
+            for job in archived.data:
+                job['archived'] = True
+            return response.data + archived.data
         except Exception as e:
             self._handle_error(f"Error fetching job postings: {e}")
             return []
     
+    def get_job_posting_page(self, user_id, fields=None, offset=0, limit=50):
+        """One page of a jobprovider's postings, newest first, and how many there are in total"""
+        try:
+            response = self.supabase.table("job_postings")\
+                .select(self._columns(fields), count="exact")\
+                .eq("user_id", user_id)\
+                .order("created_at", desc=True)\
+                .order("id", desc=True)\
+                .range(offset, offset + limit - 1)\
+                .execute()
+            return response.data, response.count or 0
+        except Exception as e:
+            self._handle_error(f"Error fetching job postings: {e}")
+            return [], 0
+    
+    def get_job_posting(self, job_id, fields=None):
+        """Get a single job posting by ID"""
+        try:
+            response = self.supabase.table("job_postings").select(self._columns(fields)).eq("id", job_id).execute()
+            return response.data[0] if response.data else None
+        except Exception as e:
+            self._handle_error(f"Error fetching job posting: {e}")
+            return None
+    
     def add_job_posting(self, user_id, title, description, requirements, deadline):
         """Add a new job posting"""
         try:
@@ -135,6 +552,7 @@ class Database:
                 "deadline": deadline
             }
             response = self.supabase.table("job_postings").insert(job_data).execute()
+            self._invalidate("job_postings")
             return response.data[0] if response.data else None
         except Exception as e:
             self._handle_error(f"Error adding job posting: {e}")
@@ -144,6 +562,7 @@ class Database:
         """Update job posting"""
         try:
             response = self.supabase.table("job_postings").update(kwargs).eq("id", job_id).execute()
+            self._invalidate("job_postings", job_id)
             return response.data[0] if response.data else None
         except Exception as e:
             self._handle_error(f"Error updating job posting: {e}")
@@ -153,55 +572,108 @@ class Database:
         """Delete a job posting"""
         try:
             response = self.supabase.table("job_postings").delete().eq("id", job_id).execute()
+            self._invalidate("job_postings", job_id)
             return True
         except Exception as e:
             self._handle_error(f"Error deleting job posting: {e}")
             return False
     
-    def search_applications(self, user_id, search_term):
+    def search_applications(self, user_id, search_term, fields=None):
         """Search applications by company or role"""
         try:
-            response = self.supabase.table("applications").select("*").eq("user_id", user_id).ilike("company", f"%{search_term}%").execute()
-            response2 = self.supabase.table("applications").select("*").eq("user_id", user_id).ilike("role", f"%{search_term}%").execute()
-            return response.data + response2.data
+            columns = self._application_columns(fields)
+            response = self.supabase.table("applications").select(columns).eq("user_id", user_id).ilike("company", f"%{search_term}%").execute()
+            response2 = self.supabase.table("applications").select(columns).eq("user_id", user_id).ilike("role", f"%{search_term}%").execute()
+            # Applications made through a posting store no role of their own
+            response3 = self.supabase.table("applications")\
+                .select(f"{columns}, job_postings!inner(title)")\
+                .eq("user_id", user_id)\
+                .ilike("job_postings.title", f"%{search_term}%")\
+                .execute()
+            # A term can match company, role and posting title; return each application once
+            unique = {}
+            for app in response.data + response2.data + response3.data:
+                app.pop('job_postings', None)
+                unique.setdefault(app.get('id', len(unique)), app)
+            return self._hydrate_applications(list(unique.values()))
         except Exception as e:
             self._handle_error(f"Error searching applications: {e}")
             return []
     
     # NEW METHODS FOR JOB SEEKERS TO BROWSE AND APPLY TO JOBS
     
-    def get_all_job_postings(self, active_only=True):
+    def get_all_job_postings(self, active_only=True, fields=None):
         """Get all job postings (for job seekers to browse)"""
         try:
+            columns = self._columns(fields, embed="profiles(id, username, email)")
+            today = date.today().isoformat()
+            cache_key = (active_only, columns, today)
+            cached = self._board_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+            
             if active_only:
-                response = self.supabase.table("job_postings").select("*, profiles(username, email)").eq("status", "active").execute()
+                # Postings past their deadline are hidden even before the sweeper closes them
+                response = self.supabase.table("job_postings").select(columns)\
+                    .eq("status", "active")\
+                    .gte("deadline", today)\
+                    .execute()
             else:
-                response = self.supabase.table("job_postings").select("*, profiles(username, email)").execute()
-            return response.data
+                response = self.supabase.table("job_postings").select(columns).execute()
+            self._remember_profiles(job.get('profiles') for job in response.data)
+            self._board_cache.set(cache_key, response.data)
+            return list(response.data)
         except Exception as e:
             self._handle_error(f"Error fetching job postings: {e}")
             return []
     
+    def get_job_postings_for_matching(self, created_after=None, job_posting_ids=None):
+        """Get the text of active job postings, optionally only those created after a timestamp or with the given IDs"""
+        try:
+            query = self.supabase.table("job_postings")\
+                .select("id, title, description, requirements, created_at")\
+                .eq("status", "active")\
+                .gte("deadline", date.today().isoformat())
+            if created_after:
+                query = query.gt("created_at", created_after)
+            if job_posting_ids is not None:
+                query = query.in_("id", list(job_posting_ids))
+            response = query.order("created_at").execute()
+            return response.data
+        except Exception as e:
+            self._handle_error(f"Error fetching job postings for matching: {e}")
+            return []
+    
+    def get_active_job_posting_ids(self):
+        """Get the IDs of all active job postings"""
+        try:
+            response = self.supabase.table("job_postings").select("id")\
+                .eq("status", "active")\
+                .gte("deadline", date.today().isoformat())\
+                .execute()
+            return [job['id'] for job in response.data]
+        except Exception as e:
+            self._handle_error(f"Error fetching active job posting IDs: {e}")
+            return []
+    
     def apply_to_job(self, user_id, job_posting_id, cover_letter=None):
         """Apply to a job posting and create the linkage"""
         try:
-            # First get the job posting details
-            job_response = self.supabase.table("job_postings").select("*, profiles(username)").eq("id", job_posting_id).execute()
-            
-            if not job_response.data:
+            # The application references the posting, keeping only its title and poster
+            # as company/role, so the seeker's history survives the posting being deleted
+            summaries = self._get_posting_summaries([job_posting_id])
+            if job_posting_id not in summaries:
                 self._handle_error("Job posting not found")
                 return None
             
-            job = job_response.data[0]
-            poster_username = job.get('profiles', {}).get('username', 'Unknown Company')
-            
             # Create an application record
             application_data = {
                 "user_id": user_id,
-                "company": poster_username,
-                "role": job['title'],
+                "job_posting_id": job_posting_id,
+                "company": summaries[job_posting_id]['company'],
+                "role": summaries[job_posting_id]['title'],
                 "status": "applied",
-                "notes": f"Applied to: {job['title']}\nJob Description: {job['description']}\nCover Letter: {cover_letter}" if cover_letter else f"Applied to: {job['title']}\nJob Description: {job['description']}"
+                "notes": cover_letter
             }
             
             application_response = self.supabase.table("applications").insert(application_data).execute()
@@ -218,7 +690,7 @@ class Database:
                 linkage_response = self.supabase.table("job_applications").insert(job_application_data).execute()
                 
                 if linkage_response.data:
-                    return application_response.data[0]
+                    return self._hydrate_applications(application_response.data)[0]
             
             return None
             
@@ -226,84 +698,265 @@ class Database:
             self._handle_error(f"Error applying to job: {e}")
             return None
     
-    def get_jobs_by_company(self, company_name):
+    def get_jobs_by_company(self, company_name, fields=None):
         """Get job postings by company name"""
         try:
             # Since we don't have a company field, we'll search by poster's username
-            response = self.supabase.table("job_postings").select("*, profiles(username)").ilike("profiles.username", f"%{company_name}%").execute()
+            response = self.supabase.table("job_postings").select(self._columns(fields, embed="profiles(username)")).ilike("profiles.username", f"%{company_name}%").execute()
             return response.data
         except Exception as e:
             self._handle_error(f"Error searching jobs by company: {e}")
             return []
     
-    def search_job_postings(self, search_term):
+    def search_job_postings(self, search_term, fields=None, active_only=True):
         """Search job postings by title or description"""
         try:
-            response1 = self.supabase.table("job_postings").select("*, profiles(username)").ilike("title", f"%{search_term}%").execute()
-            response2 = self.supabase.table("job_postings").select("*, profiles(username)").ilike("description", f"%{search_term}%").execute()
-            return response1.data + response2.data
+            columns = self._columns(fields, embed="profiles(username)")
+            results = []
+            for column in ("title", "description"):
+                query = self.supabase.table("job_postings").select(columns).ilike(column, f"%{search_term}%")
+                if active_only:
+                    query = query.eq("status", "active").gte("deadline", date.today().isoformat())
+                results.extend(query.execute().data)
+            # A term can match both title and description; return each posting once
+            unique = {}
+            for job in results:
+                unique.setdefault(job.get('id', len(unique)), job)
+            return list(unique.values())
         except Exception as e:
             self._handle_error(f"Error searching job postings: {e}")
             return []
     
+    def close_expired_job_postings(self, today=None, batch_size=500):
+        """Close up to batch_size active postings whose deadline is before today (raises on failure)"""
+        try:
+            response = self.supabase.rpc("close_expired_job_postings", {
+                "p_today": (today or date.today()).isoformat(),
+                "p_batch_size": batch_size,
+            }).execute()
+            if response.data:
+                self._invalidate("job_postings")
+            return response.data
+        except Exception as e:
+            self._handle_error(f"Error closing expired job postings: {e}")
+            # An empty batch would read as "nothing left to close"; let the sweeper record the error
+            raise
+    
+    def archive_applications(self, status, before, batch_size=500):
+        """Move up to batch_size applications with a status, unchanged since before a date, to the archive"""
+        try:
+            response = self.supabase.rpc("archive_applications", {
+                "p_status": status,
+                "p_before": before.isoformat(),
+                "p_batch_size": batch_size,
+            }).execute()
+            return [row['id'] for row in response.data]
+        except Exception as e:
+            self._handle_error(f"Error archiving applications: {e}")
+            return []
+    
+    def archive_job_postings(self, before, batch_size=500):
+        """Move up to batch_size closed postings with a deadline before a date to the archive"""
+        try:
+            response = self.supabase.rpc("archive_job_postings", {
+                "p_before": before.isoformat(),
+                "p_batch_size": batch_size,
+            }).execute()
+            if response.data:
+                self._invalidate("job_postings")
+            return [row['id'] for row in response.data]
+        except Exception as e:
+            self._handle_error(f"Error archiving job postings: {e}")
+            return []
+    
     # NEW METHODS FOR JOB PROVIDERS TO SEE APPLICANTS
     
-    def get_applicants_for_job(self, job_posting_id):
-        """Get all applicants for a specific job posting - SIMPLIFIED"""
+    def get_applicants_for_job(self, job_posting_id, fields=None):
+        """Get all applicants for a specific job posting"""
         try:
-            # Get the applications linked to this job posting
-            linkage_response = self.supabase.table("job_applications")\
-                .select("application_id, applied_at")\
+            # One request: the links with their applications and applicant profiles embedded
+            response = self.supabase.table("job_applications")\
+                .select(f"application_id, applied_at, applications({self._columns(fields, embed='profiles(id, username, email)')})")\
                 .eq("job_posting_id", job_posting_id)\
                 .execute()
             
-            if not linkage_response.data:
-                return []
-            
-            applicants_data = []
-            for link in linkage_response.data:
-                # Get application details
-                app_response = self.supabase.table("applications")\
-                    .select("*, profiles(username, email)")\
-                    .eq("id", link['application_id'])\
-                    .execute()
-                
-                if app_response.data:
-                    application = app_response.data[0]
-                    applicant_info = {
-                        'application_id': link['application_id'],
-                        'job_posting_id': job_posting_id,
-                        'applied_at': link['applied_at'],
-                        'applications': application
-                    }
-                    applicants_data.append(applicant_info)
-            
-            return applicants_data
+            return self._build_applicants(response.data, job_posting_id)
         except Exception as e:
             self._handle_error(f"Error fetching applicants: {e}")
             return []
     
-    def get_applicants_for_jobprovider(self, user_id):
-        """Get all applicants for all jobs posted by a job provider - SIMPLIFIED"""
+    def get_applicants_for_jobprovider(self, user_id, fields=None):
+        """Get all applicants for all jobs posted by a job provider"""
         try:
-            # First get all job postings by this user
-            job_postings = self.supabase.table("job_postings")\
-                .select("id, title")\
-                .eq("user_id", user_id)\
+            # One request across all of the provider's postings, filtered through the posting embed
+            response = self.supabase.table("job_applications")\
+                .select(f"application_id, applied_at, job_posting_id, job_postings!inner(title, user_id), applications({self._columns(fields, embed='profiles(id, username, email)')})")\
+                .eq("job_postings.user_id", user_id)\
                 .execute()
             
-            applicants_data = []
+            return self._build_applicants(response.data)
+        except Exception as e:
+            self._handle_error(f"Error fetching job provider applicants: {e}")
+            return []
+    
+    def iter_applicants_for_jobprovider(self, user_id, page_size=5000):
+        """Yield a job provider's applicants a page at a time, for exports of any size"""
+        last_id = 0
+        while True:
+            try:
+                # Keyset pagination on the link ID stays fast however deep the export goes
+                response = self.supabase.table("job_applications")\
+                    .select("id, application_id, applied_at, job_posting_id, job_postings!inner(title, user_id), "
+                            "applications(id, status, applied_date, profiles(id, username, email))")\
+                    .eq("job_postings.user_id", user_id)\
+                    .gt("id", last_id)\
+                    .order("id")\
+                    .limit(page_size)\
+                    .execute()
+            except Exception as e:
+                self._handle_error(f"Error exporting job provider applicants: {e}")
+                # A partial export would look complete; fail it instead
+                raise
+            if not response.data:
+                return
+            yield self._build_applicants(response.data)
+            if len(response.data) < page_size:
+                return
+            last_id = response.data[-1]['id']
+    
+    def iter_applications(self, user_id, page_size=5000, include_archived=False):
+        """Yield a jobseeker's applications a page at a time, for exports of any size"""
+        tables = ("applications", "applications_archive") if include_archived else ("applications",)
+        for table in tables:
+            last_id = 0
+            while True:
+                try:
+                    response = self.supabase.table(table)\
+                        .select("id, company, role, status, applied_date, job_posting_id, notes")\
+                        .eq("user_id", user_id)\
+                        .gt("id", last_id)\
+                        .order("id")\
+                        .limit(page_size)\
+                        .execute()
+                except Exception as e:
+                    self._handle_error(f"Error exporting applications: {e}")
+                    raise
+                if not response.data:
+                    break
+                yield self._hydrate_applications(response.data, include_archived)
+                if len(response.data) < page_size:
+                    break
+                last_id = response.data[-1]['id']
+    
+    def _build_applicants(self, links, job_posting_id=None):
+        """Shape job_applications rows with embedded applications into applicant records"""
+        self._remember_profiles((link.get('applications') or {}).get('profiles') for link in links)
+        applicants_data = []
+        for link in links:
+            application = link.get('applications')
+            if not application:
+                continue
+            
+            applicant_info = {
+                'application_id': link['application_id'],
+                'job_posting_id': link.get('job_posting_id', job_posting_id),
+                'applied_at': link['applied_at'],
+                'applications': self._apply_pending_statuses([application])[0]
+            }
+            if link.get('job_postings'):
+                applicant_info['job_title'] = link['job_postings']['title']
+            applicants_data.append(applicant_info)
+        return applicants_data
+    
+    def get_applicant_counts(self, user_id):
+        """Get applicant counts per job posting and status for a job provider"""
+        try:
+            response = self.supabase.rpc(
+                "applicant_counts_for_provider", {"p_provider_id": user_id}
+            ).execute()
             
-            for job in job_postings.data:
-                # Get applicants for this job
-                job_applicants = self.get_applicants_for_job(job['id'])
-                for applicant in job_applicants:
-                    applicant['job_title'] = job['title']
-                    applicants_data.append(applicant)
+            counts = {}
+            for row in response.data:
+                posting_counts = counts.setdefault(row['job_posting_id'], {
+                    "total": 0,
+                    "applied": 0,
+                    "interview": 0,
+                    "offer": 0,
+                    "rejected": 0
+                })
+                posting_counts[row['status']] = posting_counts.get(row['status'], 0) + row['applicant_count']
+                posting_counts['total'] += row['applicant_count']
             
-            return applicants_data
+            return counts
         except Exception as e:
-            self._handle_error(f"Error fetching job provider applicants: {e}")
+            self._handle_error(f"Error fetching applicant counts: {e}")
+            return {}
+    
+    def get_application_status_counts(self, user_id):
+        """Get a jobseeker's application counts per status, plus the total"""
+        counts = {"total": 0, "applied": 0, "interview": 0, "offer": 0, "rejected": 0}
+        try:
+            response = self.supabase.rpc("application_status_counts", {"p_user_id": user_id}).execute()
+            for row in response.data:
+                counts[row['status']] = counts.get(row['status'], 0) + row['application_count']
+                counts['total'] += row['application_count']
+            return counts
+        except Exception as e:
+            self._handle_error(f"Error fetching application counts: {e}")
+            return counts
+    
+    def get_job_posting_counts(self, user_id):
+        """Get a job provider's posting counts per status, plus the total"""
+        counts = {"total": 0, "active": 0, "closed": 0}
+        try:
+            response = self.supabase.rpc("job_posting_status_counts", {"p_provider_id": user_id}).execute()
+            for row in response.data:
+                counts[row['status']] = counts.get(row['status'], 0) + row['posting_count']
+                counts['total'] += row['posting_count']
+            return counts
+        except Exception as e:
+            self._handle_error(f"Error fetching job posting counts: {e}")
+            return counts
+    
+    def get_application_timeline(self, user_id, bucket="day", start_date=None, end_date=None):
+        """Get application counts per day/week/month and status for a jobseeker"""
+        try:
+            params = {
+                "p_user_id": user_id,
+                "p_bucket": bucket,
+                "p_from": start_date.isoformat() if start_date else None,
+                "p_to": end_date.isoformat() if end_date else None
+            }
+            response = self.supabase.rpc("application_timeline", params).execute()
+            return response.data
+        except Exception as e:
+            self._handle_error(f"Error fetching application timeline: {e}")
+            return []
+    
+    def get_provider_rollups(self, user_id):
+        """Get precomputed applicant rollups for every posting of a job provider"""
+        try:
+            response = self.supabase.table("posting_applicant_rollups")\
+                .select("job_posting_id, total, applied, interview, offer, rejected, job_postings(title, status)")\
+                .eq("provider_id", user_id)\
+                .execute()
+            return response.data
+        except Exception as e:
+            self._handle_error(f"Error fetching provider rollups: {e}")
+            return []
+    
+    def get_provider_daily_applicants(self, user_id, start_date=None):
+        """Get new applicants per posting per day for a job provider"""
+        try:
+            query = self.supabase.table("posting_daily_applicants")\
+                .select("job_posting_id, day, applicant_count")\
+                .eq("provider_id", user_id)
+            if start_date:
+                query = query.gte("day", start_date.isoformat())
+            response = query.order("day").execute()
+            return response.data
+        except Exception as e:
+            self._handle_error(f"Error fetching provider applicant trends: {e}")
             return []
     
     def _handle_error(self, error_message):
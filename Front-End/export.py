@@ -0,0 +1,188 @@
+from datetime import date, datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    # Exports are optional; everything else works without pyarrow
+    pa = None
+    pq = None
+
+FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "arrow": ("application/vnd.apache.arrow.file", ".arrow"),
+}
+
+# Dictionary-encoded columns use one fixed dictionary for the whole file
+# (Arrow IPC files cannot change a dictionary between batches)
+DICTIONARIES = {
+    "status": ["applied", "interview", "offer", "rejected"],
+}
+
+class ExportUnavailable(RuntimeError):
+    """Raised when pyarrow is not installed"""
+
+def _require_pyarrow():
+    if pa is None:
+        raise ExportUnavailable("Exports need pyarrow: pip install pyarrow")
+
+def applicants_schema():
+    _require_pyarrow()
+    status = pa.dictionary(pa.int8(), pa.string())
+    return pa.schema([
+        ("application_id", pa.int64()),
+        ("job_posting_id", pa.int64()),
+        ("job_title", pa.string()),
+        ("status", status),
+        ("applied_at", pa.timestamp("us", tz="UTC")),
+        ("applied_date", pa.date32()),
+        ("applicant_username", pa.string()),
+        ("applicant_email", pa.string()),
+    ])
+
+def applications_schema():
+    _require_pyarrow()
+    return pa.schema([
+        ("id", pa.int64()),
+        ("company", pa.string()),
+        ("role", pa.string()),
+        ("status", pa.dictionary(pa.int8(), pa.string())),
+        ("applied_date", pa.date32()),
+        ("job_posting_id", pa.int64()),
+        ("notes", pa.string()),
+        ("archived", pa.bool_()),
+    ])
+
+def _timestamp(value):
+    if not value or isinstance(value, datetime):
+        return value or None
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+def _date(value):
+    if not value or isinstance(value, date):
+        return value or None
+    return date.fromisoformat(str(value)[:10])
+
+def applicant_rows(applicants):
+    """Flatten get_applicants_for_jobprovider records into export rows"""
+    rows = []
+    for applicant in applicants:
+        application = applicant.get('applications') or {}
+        profile = application.get('profiles') or {}
+        rows.append({
+            "application_id": applicant.get('application_id'),
+            "job_posting_id": applicant.get('job_posting_id'),
+            "job_title": applicant.get('job_title'),
+            "status": application.get('status'),
+            "applied_at": _timestamp(applicant.get('applied_at')),
+            "applied_date": _date(application.get('applied_date')),
+            "applicant_username": profile.get('username'),
+            "applicant_email": profile.get('email'),
+        })
+    return rows
+
+def application_rows(applications):
+    """Export rows for get_applications records"""
+    return [
+        {
+            "id": app.get('id'),
+            "company": app.get('company'),
+            "role": app.get('role'),
+            "status": app.get('status'),
+            "applied_date": _date(app.get('applied_date')),
+            "job_posting_id": app.get('job_posting_id'),
+            "notes": app.get('notes'),
+            "archived": bool(app.get('archived')),
+        }
+        for app in applications
+    ]
+
+class _ChunkSink:
+    """Write-only file object whose contents are handed out as they are written"""
+    
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+    
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self._position
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def _table(rows, schema):
+    """Build a table for one page, encoding dictionary columns against DICTIONARIES"""
+    columns = []
+    for field in schema:
+        values = [row.get(field.name) for row in rows]
+        if pa.types.is_dictionary(field.type):
+            dictionary = DICTIONARIES[field.name]
+            positions = {value: index for index, value in enumerate(dictionary)}
+            unknown = {value for value in values if value is not None and value not in positions}
+            if unknown:
+                raise ValueError(f"Unexpected {field.name} values: {sorted(unknown)}")
+            indices = pa.array([None if value is None else positions[value] for value in values], type=field.type.index_type)
+            columns.append(pa.DictionaryArray.from_arrays(indices, pa.array(dictionary, type=field.type.value_type)))
+        else:
+            columns.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+def _writer(sink, schema, fmt):
+    if fmt == "arrow":
+        return pa.ipc.new_file(sink, schema)
+    return pq.ParquetWriter(sink, schema, compression="zstd")
+
+def _write(writer, table, fmt):
+    if fmt == "arrow":
+        writer.write_table(table)
+    else:
+        # One row group per page keeps reader memory bounded too
+        writer.write_table(table, row_group_size=max(table.num_rows, 1))
+
+def stream_export(pages, schema, to_rows, fmt="parquet"):
+    """Yield the bytes of a Parquet / Arrow IPC file, one page (row group) at a time
+    
+    Only one page of records is held in memory at once, however many pages
+    there are.
+    """
+    _require_pyarrow()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    
+    sink = _ChunkSink()
+    writer = _writer(sink, schema, fmt)
+    try:
+        for page in pages:
+            rows = to_rows(page)
+            if rows:
+                _write(writer, _table(rows, schema), fmt)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def write_export(path, pages, schema, to_rows, fmt="parquet"):
+    """Write an export to a file and return the number of bytes written"""
+    written = 0
+    with open(path, "wb") as f:
+        for chunk in stream_export(pages, schema, to_rows, fmt):
+            f.write(chunk)
+            written += len(chunk)
+    return written
@@ -0,0 +1,139 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+import uuid
+
+class InvalidationBus:
+    """Local pub/sub channel that keeps in-memory caches coherent across processes
+    
+    Every process (API worker or Streamlit server) binds a UDP socket on
+    localhost and registers its port as a file in a shared directory. Publishing
+    sends a small datagram to every registered port; each listener thread hands
+    the message to on_message so the process can drop its stale cache entries.
+    Delivery is best-effort, so cache TTLs remain the upper bound on staleness.
+    """
+    
+    def __init__(self, on_message, channel_dir=None):
+        self.on_message = on_message
+        self.channel_dir = channel_dir or os.getenv(
+            "CACHE_INVALIDATION_DIR",
+            os.path.join(tempfile.gettempdir(), "job-tracker-invalidation")
+        )
+        self.origin = uuid.uuid4().hex
+        self._socket = None
+        self._thread = None
+        self._registration = None
+        self._running = False
+    
+    def start(self):
+        """Bind the listener socket, register it and start receiving"""
+        if self._running:
+            return
+        os.makedirs(self.channel_dir, exist_ok=True)
+        
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.settimeout(0.5)
+        port = self._socket.getsockname()[1]
+        
+        self._registration = os.path.join(self.channel_dir, str(port))
+        with open(self._registration, "w") as f:
+            f.write(str(os.getpid()))
+        
+        self._running = True
+        self._thread = threading.Thread(target=self._listen, name="cache-invalidation", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Unregister and close the listener socket"""
+        self._running = False
+        if self._registration:
+            try:
+                os.remove(self._registration)
+            except OSError:
+                pass
+            self._registration = None
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+    
+    def publish(self, namespace, key=None):
+        """Tell every other registered process to invalidate a cache entry"""
+        if not self._running:
+            return
+        message = json.dumps({"origin": self.origin, "namespace": namespace, "key": key}).encode()
+        
+        for port, path in self._peers():
+            if path == self._registration:
+                continue
+            try:
+                self._socket.sendto(message, ("127.0.0.1", port))
+            except OSError:
+                pass
+    
+    def _peers(self):
+        """List registered ports, removing registrations of processes that are gone"""
+        try:
+            names = os.listdir(self.channel_dir)
+        except OSError:
+            return []
+        
+        peers = []
+        for name in names:
+            if not name.isdigit():
+                continue
+            path = os.path.join(self.channel_dir, name)
+            if not self._is_alive(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            peers.append((int(name), path))
+        return peers
+    
+    def _is_alive(self, path):
+        """Check whether the process that registered a port is still running"""
+        try:
+            with open(path) as f:
+                pid = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return False
+        if pid <= 0:
+            return False
+        if os.name == "nt":
+            # os.kill(pid, 0) sends CTRL_C_EVENT on Windows, so don't probe there
+            return True
+        try:
+            os.kill(pid, 0)
+        except PermissionError:
+            return True
+        except OSError:
+            return False
+        return True
+    
+    def _listen(self):
+        while self._running:
+            try:
+                data, _ = self._socket.recvfrom(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            
+            try:
+                message = json.loads(data)
+            except ValueError:
+                continue
+            if message.get("origin") == self.origin:
+                continue
+            
+            try:
+                self.on_message(message.get("namespace"), message.get("key"))
+            except Exception as e:
+                print(f"Error handling cache invalidation: {e}")
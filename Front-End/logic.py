@@ -35,6 +35,19 @@ class Analytics:
             "success_rate": success_rate
         }
     
+    @staticmethod
+    def get_application_stats_from_counts(counts):
+        """Same statistics as get_application_stats, from per-status counts"""
+        total = counts.get('total', 0)
+        return {
+            "total": total,
+            "applied": counts.get('applied', 0),
+            "interview": counts.get('interview', 0),
+            "offer": counts.get('offer', 0),
+            "rejected": counts.get('rejected', 0),
+            "success_rate": round(counts.get('offer', 0) / total * 100, 2) if total > 0 else 0
+        }
+    
     @staticmethod
     def create_status_chart(applications):
         """Create a pie chart of application statuses"""
@@ -71,6 +84,100 @@ class Analytics:
         )
         fig.update_layout(xaxis_title="Date", yaxis_title="Number of Applications")
         return fig
+    
+    @staticmethod
+    def create_bucketed_timeline_chart(series, bucket="day"):
+        """Create a timeline chart from pre-aggregated (bucket, status, count) rows"""
+        if not series:
+            return None
+        
+        df = pd.DataFrame(series)
+        df['bucket'] = pd.to_datetime(df['bucket'])
+        
+        fig = px.bar(
+            df,
+            x='bucket',
+            y='application_count',
+            color='status',
+            title="Applications Timeline",
+            color_discrete_sequence=px.colors.qualitative.Set3
+        )
+        fig.update_layout(
+            xaxis_title=bucket.title(),
+            yaxis_title="Number of Applications",
+            barmode='stack'
+        )
+        return fig
+    
+    @staticmethod
+    def get_provider_funnel(rollups):
+        """Summarize the applied -> interview -> offer funnel from posting rollups"""
+        total = sum(row.get('total', 0) for row in rollups)
+        interview = sum(row.get('interview', 0) for row in rollups)
+        offer = sum(row.get('offer', 0) for row in rollups)
+        rejected = sum(row.get('rejected', 0) for row in rollups)
+        
+        # Offers have been through an interview, so they count as having reached it
+        reached_interview = interview + offer
+        
+        return {
+            "applied": total,
+            "interview": reached_interview,
+            "offer": offer,
+            "rejected": rejected,
+            "interview_rate": round(reached_interview / total * 100, 2) if total > 0 else 0,
+            "offer_rate": round(offer / reached_interview * 100, 2) if reached_interview > 0 else 0,
+            "overall_rate": round(offer / total * 100, 2) if total > 0 else 0
+        }
+    
+    @staticmethod
+    def get_most_applied_positions(rollups, limit=10):
+        """Get the postings with the most applicants"""
+        ranked = sorted(rollups, key=lambda row: row.get('total', 0), reverse=True)
+        return [
+            {
+                "job_posting_id": row['job_posting_id'],
+                "title": (row.get('job_postings') or {}).get('title', 'Unknown Job'),
+                "applicants": row.get('total', 0)
+            }
+            for row in ranked[:limit]
+            if row.get('total', 0) > 0
+        ]
+    
+    @staticmethod
+    def create_funnel_chart(funnel):
+        """Create a funnel chart of applied -> interview -> offer"""
+        if not funnel or funnel['applied'] == 0:
+            return None
+        
+        fig = go.Figure(go.Funnel(
+            y=["Applied", "Interview", "Offer"],
+            x=[funnel['applied'], funnel['interview'], funnel['offer']],
+            textinfo="value+percent initial"
+        ))
+        fig.update_layout(title="Hiring Funnel")
+        return fig
+    
+    @staticmethod
+    def create_posting_trend_chart(daily_applicants, titles):
+        """Create a chart of new applicants per posting over time"""
+        if not daily_applicants:
+            return None
+        
+        df = pd.DataFrame(daily_applicants)
+        df['day'] = pd.to_datetime(df['day'])
+        df['posting'] = df['job_posting_id'].map(lambda job_id: titles.get(job_id, f"Job #{job_id}"))
+        
+        fig = px.line(
+            df,
+            x='day',
+            y='applicant_count',
+            color='posting',
+            title="Applicants per Posting Over Time",
+            markers=True
+        )
+        fig.update_layout(xaxis_title="Date", yaxis_title="New Applicants")
+        return fig
 
 class Validation:
     @staticmethod
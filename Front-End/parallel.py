@@ -0,0 +1,84 @@
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from profiling import sampled
+from resilience import BackendTimeout, ResiliencePolicy
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    # Not running under Streamlit (FastAPI, tools)
+    add_script_run_ctx = None
+    get_script_run_ctx = None
+
+# By default, long enough for any one read to exhaust its own deadline and retries
+# (plus a second of slack), so a slow read fails with its own error, not this one
+DEFAULT_TIMEOUT = float(os.getenv("FETCH_TIMEOUT") or ResiliencePolicy.from_env().worst_case_read() + 1)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("FETCH_WORKERS", "16")), thread_name_prefix="db-fetch"
+            )
+        return _executor
+
+def _run(call, context, script_ctx):
+    if script_ctx is None:
+        return context.run(sampled, call)
+    # Lets st.error() and friends called from Database methods reach the page
+    thread = threading.current_thread()
+    add_script_run_ctx(thread, script_ctx)
+    try:
+        return context.run(sampled, call)
+    finally:
+        add_script_run_ctx(thread, None)
+
+def fetch_all(*calls, timeout=None):
+    """Run independent blocking calls (e.g. Database reads) at once; return their results in order
+    
+    The calls share one deadline of timeout seconds (FETCH_TIMEOUT, see DEFAULT_TIMEOUT),
+    so the whole fetch takes as long as the slowest call rather than the sum of
+    all of them. Each call sees the caller's context variables (profiling,
+    round-trip counting, read-your-writes session) and, under Streamlit, the
+    caller's script context. Raises BackendTimeout if the deadline passes, or
+    the first call's exception if any call fails.
+    """
+    if len(calls) <= 1:
+        # Nothing to overlap; skip the thread hop
+        return [call() for call in calls]
+    
+    script_ctx = get_script_run_ctx() if get_script_run_ctx else None
+    futures = [
+        _pool().submit(_run, call, contextvars.copy_context(), script_ctx)
+        for call in calls
+    ]
+    timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+    _, pending = wait(futures, timeout=timeout)
+    if pending:
+        for future in pending:
+            # Calls that already started finish in the background, bounded by the HTTP timeout
+            future.cancel()
+        raise BackendTimeout(f"{len(pending)} of {len(calls)} fetches exceeded {timeout:.1f}s")
+    return [future.result() for future in futures]
+
+async def gather_in_threads(*calls, timeout=None):
+    """Async fetch_all: run blocking calls concurrently in the thread pool under one deadline"""
+    timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+    try:
+        # to_thread copies the caller's context variables into each call
+        return await asyncio.wait_for(
+            asyncio.gather(*(asyncio.to_thread(sampled, call) for call in calls)), timeout
+        )
+    except BackendTimeout:
+        # A call's own deadline (see resilience.py), not this one
+        raise
+    except asyncio.TimeoutError:
+        raise BackendTimeout(f"Fetches exceeded {timeout:.1f}s")
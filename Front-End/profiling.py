@@ -0,0 +1,242 @@
+import cProfile
+import functools
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+
+# Profile of the request/rerun currently executing, if any
+_current_profile = ContextVar("current_profile", default=None)
+
+MODES = ("sample", "cprofile")
+
+# One profile at a time: cProfile sessions can't overlap, and concurrent samplers skew each other
+_profile_slot = threading.Lock()
+
+def profiling_enabled():
+    """Whether callers may ask for a profile explicitly (header / query param)"""
+    return os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+
+def sample_rate():
+    try:
+        return float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    except ValueError:
+        return 0.0
+
+def requested_mode(value):
+    """Map a header/query value like '1', 'sample' or 'cprofile' to a mode, or None"""
+    if not value or not profiling_enabled():
+        return None
+    value = str(value).lower()
+    if value in MODES:
+        return value
+    if value in ("1", "true", "yes"):
+        return os.getenv("PROFILE_MODE", "sample")
+    return None
+
+def profile_if_requested(label, requested=None):
+    """A RequestProfile when explicitly requested or sampled, otherwise a no-op context"""
+    mode = requested_mode(requested)
+    if mode is None and random.random() < sample_rate():
+        mode = os.getenv("PROFILE_MODE", "sample")
+    if mode is None:
+        return nullcontext()
+    return RequestProfile(label, mode)
+
+def record_db_call(name, duration, ok=True):
+    """Attach a Database call to the active profile, if any"""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.db_calls.append({"method": name, "duration_ms": round(duration * 1000, 3), "ok": ok})
+
+def instrument(cls):
+    """Time every public method of cls while a profile is active"""
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not callable(method):
+            continue
+        setattr(cls, name, _timed(name, method))
+    return cls
+
+def _timed(name, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if _current_profile.get() is None:
+            return method(*args, **kwargs)
+        started = time.perf_counter()
+        ok = False
+        try:
+            # Sync API routes call the Database from a worker thread, not the one that started the profile
+            with profile_thread():
+                result = method(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            record_db_call(name, time.perf_counter() - started, ok)
+    return wrapper
+
+@contextmanager
+def profile_thread():
+    """Sample the current thread as part of the active profile (sample mode), if any, while inside"""
+    profile = _current_profile.get()
+    sampler = profile._sampler if profile is not None else None
+    if sampler is None:
+        yield
+        return
+    thread_id = threading.get_ident()
+    sampler.add_thread(thread_id)
+    try:
+        yield
+    finally:
+        sampler.remove_thread(thread_id)
+
+def sampled(call, *args):
+    """call(*args), with this thread sampled by the active profile; for worker threads that run a request's work"""
+    with profile_thread():
+        return call(*args)
+
+class StackSampler:
+    """Samples the call stacks of a set of threads at a fixed interval into collapsed-stack counts
+    
+    Threads are added and removed while sampling runs, as a request's work moves
+    between the event loop and worker threads.
+    """
+    
+    def __init__(self, thread_id=None, interval=0.005):
+        self.interval = interval
+        self.counts = {}
+        self._threads = {}
+        self._threads_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if thread_id is not None:
+            self.add_thread(thread_id)
+    
+    def add_thread(self, thread_id):
+        with self._threads_lock:
+            self._threads[thread_id] = self._threads.get(thread_id, 0) + 1
+    
+    def remove_thread(self, thread_id):
+        with self._threads_lock:
+            if self._threads.get(thread_id, 0) <= 1:
+                self._threads.pop(thread_id, None)
+            else:
+                self._threads[thread_id] -= 1
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._threads_lock:
+                thread_ids = list(self._threads)
+            for thread_id in thread_ids:
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+    
+    def write_collapsed(self, path):
+        """Brendan Gregg's collapsed format, readable by flamegraph.pl and speedscope"""
+        with open(path, "w") as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+class RequestProfile:
+    """Profiles one API request or Streamlit rerun and writes the results to disk
+    
+    'sample' mode writes a .collapsed flame graph of the calling thread and of the
+    worker threads running its Database calls; 'cprofile' mode writes a .prof file
+    of the calling thread for pstats/snakeviz. Both write a .json summary with the
+    Database calls made and their durations. Only one profile runs at a time; one
+    started while another is active is skipped (profile_id is None, nothing is
+    written).
+    """
+    
+    def __init__(self, label, mode="sample", output_dir=None):
+        self.label = re.sub(r"[^A-Za-z0-9_.-]+", "_", label).strip("_")[:80] or "profile"
+        self.mode = mode if mode in MODES else "sample"
+        self.output_dir = output_dir or os.getenv("PROFILE_DIR", "profiles")
+        self.profile_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{self.label}-{uuid.uuid4().hex[:8]}"
+        self.db_calls = []
+        self.paths = []
+        self._profiler = None
+        self._sampler = None
+        self._token = None
+        self._started = None
+    
+    def __enter__(self):
+        if not _profile_slot.acquire(blocking=False):
+            self.profile_id = None
+            return self
+        self._token = _current_profile.set(self)
+        self._started = time.perf_counter()
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._sampler = StackSampler(
+                threading.get_ident(), float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+            )
+            self._sampler.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if self.profile_id is None:
+            return False
+        duration = time.perf_counter() - self._started
+        if self._profiler:
+            self._profiler.disable()
+        if self._sampler:
+            self._sampler.stop()
+        _current_profile.reset(self._token)
+        _profile_slot.release()
+        
+        try:
+            self._write(duration, exc_type)
+        except OSError as e:
+            print(f"Error writing profile {self.profile_id}: {e}")
+        return False
+    
+    def _write(self, duration, exc_type):
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, self.profile_id)
+        
+        if self._profiler:
+            self._profiler.dump_stats(base + ".prof")
+            self.paths.append(base + ".prof")
+        if self._sampler:
+            self._sampler.write_collapsed(base + ".collapsed")
+            self.paths.append(base + ".collapsed")
+        
+        summary = {
+            "id": self.profile_id,
+            "label": self.label,
+            "mode": self.mode,
+            "duration_ms": round(duration * 1000, 3),
+            "error": exc_type.__name__ if exc_type else None,
+            "db_calls": self.db_calls,
+            "db_time_ms": round(sum(call["duration_ms"] for call in self.db_calls), 3),
+        }
+        with open(base + ".json", "w") as f:
+            json.dump(summary, f, indent=2)
+        self.paths.append(base + ".json")
@@ -0,0 +1,283 @@
+import math
+import re
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been being but by can could
+do does for from has have having he her here his how i if in into is it its just
+me more most my no not of on or our out over she so some such than that the their
+them then there these they this to too under up very was we were what when where
+which while who will with would you your applied job description cover letter
+""".split())
+
+def tokenize(text):
+    """Split text into lowercase terms, dropping stop words"""
+    if not text:
+        return []
+    return [
+        token for token in TOKEN_PATTERN.findall(str(text).lower())
+        if token not in STOP_WORDS and len(token) > 1
+    ]
+
+class JobRecommender:
+    """Ranks job postings against a jobseeker's history by TF-IDF cosine similarity
+    
+    Postings are kept as a sparse term-frequency matrix (one row per posting).
+    The TF-IDF weights are computed from it and L2-normalized once, so scoring a
+    user is a single sparse matrix-vector product plus a partial sort. New
+    postings are appended incrementally using the current IDF; the whole matrix
+    is only re-weighted once enough postings have been added for IDF to drift.
+    """
+    
+    def __init__(self, title_weight=2, rebuild_ratio=0.1):
+        self.title_weight = title_weight
+        self.rebuild_ratio = rebuild_ratio
+        
+        self._vocabulary = {}
+        self._doc_freq = np.zeros(0, dtype=np.int64)
+        self._tf = sparse.csr_matrix((0, 0), dtype=np.float64)
+        self._posting_ids = []
+        self._row_of = {}
+        self._active = np.zeros(0, dtype=bool)
+        
+        self._idf = np.zeros(0)
+        self._weights = sparse.csr_matrix((0, 0), dtype=np.float64)
+        self._rows_since_rebuild = 0
+        self._lock = threading.RLock()
+    
+    def __len__(self):
+        return int(self._active.sum())
+    
+    def posting_ids(self):
+        """IDs of the active postings currently indexed"""
+        with self._lock:
+            return {self._posting_ids[row] for row in np.flatnonzero(self._active)}
+    
+    def add_postings(self, postings):
+        """Index new postings (re-indexing any that are already present)"""
+        with self._lock:
+            indices, values, indptr = [], [], [0]
+            new_ids = []
+            for posting in postings:
+                counts = self._term_counts(posting)
+                if posting['id'] in self._row_of:
+                    self._active[self._row_of[posting['id']]] = False
+                
+                for term, count in counts.items():
+                    column = self._vocabulary.setdefault(term, len(self._vocabulary))
+                    indices.append(column)
+                    # Sublinear term frequency
+                    values.append(1.0 + math.log(count))
+                indptr.append(len(indices))
+                new_ids.append(posting['id'])
+            
+            if not new_ids:
+                return 0
+            
+            vocab_size = len(self._vocabulary)
+            new_rows = sparse.csr_matrix(
+                (np.array(values), np.array(indices, dtype=np.int64), np.array(indptr)),
+                shape=(len(new_ids), vocab_size)
+            )
+            
+            self._doc_freq = np.concatenate([
+                self._doc_freq, np.zeros(vocab_size - len(self._doc_freq), dtype=np.int64)
+            ])
+            self._doc_freq += np.bincount(new_rows.indices, minlength=vocab_size)
+            
+            self._tf.resize((self._tf.shape[0], vocab_size))
+            self._tf = sparse.vstack([self._tf, new_rows], format="csr")
+            
+            first_row = len(self._posting_ids)
+            for offset, posting_id in enumerate(new_ids):
+                self._row_of[posting_id] = first_row + offset
+            self._posting_ids.extend(new_ids)
+            self._active = np.concatenate([self._active, np.ones(len(new_ids), dtype=bool)])
+            
+            self._rows_since_rebuild += len(new_ids)
+            if self._rows_since_rebuild > self.rebuild_ratio * max(self._weights.shape[0], 1):
+                self._rebuild_weights()
+            else:
+                self._append_weights(new_rows)
+            return len(new_ids)
+    
+    def remove_postings(self, posting_ids):
+        """Stop recommending postings (e.g. closed or deleted ones)"""
+        with self._lock:
+            for posting_id in posting_ids:
+                row = self._row_of.get(posting_id)
+                if row is not None:
+                    self._active[row] = False
+    
+    def sync_active(self, active_ids):
+        """Match the recommendable postings to the active set
+        
+        Indexed postings outside the set are deactivated and indexed ones back in
+        it (e.g. reopened) are reactivated. Returns the active IDs that are not
+        indexed at all, which the caller still has to add_postings().
+        """
+        active_ids = set(active_ids)
+        with self._lock:
+            stale = [posting_id for posting_id in self.posting_ids() if posting_id not in active_ids]
+            self.remove_postings(stale)
+            missing = []
+            for posting_id in active_ids:
+                row = self._row_of.get(posting_id)
+                if row is None:
+                    missing.append(posting_id)
+                else:
+                    self._active[row] = True
+            return missing
+    
+    def recommend(self, texts, k=10, applied_posting_ids=(), exclude_ids=()):
+        """Top-k (posting_id, score) pairs for one user's application history"""
+        return self.recommend_batch(
+            {None: (texts, applied_posting_ids, exclude_ids)}, k
+        ).get(None, [])
+    
+    def recommend_batch(self, users, k=10):
+        """Score many users at once
+        
+        users maps a user key to (texts, applied_posting_ids, exclude_ids).
+        Returns a dict of user key -> list of (posting_id, score) pairs.
+        """
+        with self._lock:
+            if not users or self._weights.shape[0] == 0 or not self._active.any():
+                return {key: [] for key in users}
+            
+            keys = list(users)
+            queries = sparse.vstack(
+                [self._query_vector(*users[key][:2]) for key in keys], format="csr"
+            )
+            # (postings x users) cosine similarities
+            scores = (self._weights @ queries.T).toarray()
+            scores[~self._active, :] = -np.inf
+            
+            results = {}
+            for column, key in enumerate(keys):
+                user_scores = scores[:, column]
+                excluded = set(users[key][1]) | set(users[key][2])
+                for posting_id in excluded:
+                    row = self._row_of.get(posting_id)
+                    if row is not None:
+                        user_scores[row] = -np.inf
+                
+                top = min(k, len(user_scores))
+                if top <= 0:
+                    results[key] = []
+                    continue
+                candidates = np.argpartition(-user_scores, top - 1)[:top]
+                candidates = candidates[np.argsort(-user_scores[candidates])]
+                results[key] = [
+                    (self._posting_ids[row], round(float(user_scores[row]), 4))
+                    for row in candidates
+                    if np.isfinite(user_scores[row]) and user_scores[row] > 0
+                ]
+            return results
+    
+    def _term_counts(self, posting):
+        counts = Counter(tokenize(posting.get('description')))
+        counts.update(tokenize(posting.get('requirements')))
+        for term in tokenize(posting.get('title')):
+            counts[term] += self.title_weight
+        return counts
+    
+    def _compute_idf(self):
+        n_rows = max(self._tf.shape[0], 1)
+        return np.log((1.0 + n_rows) / (1.0 + self._doc_freq)) + 1.0
+    
+    def _normalize(self, matrix):
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ matrix
+    
+    def _rebuild_weights(self):
+        self._idf = self._compute_idf()
+        self._weights = self._normalize(self._tf @ sparse.diags(self._idf)).tocsr()
+        self._rows_since_rebuild = 0
+    
+    def _append_weights(self, new_rows):
+        # New terms get their IDF now; existing terms keep theirs until the next rebuild
+        vocab_size = new_rows.shape[1]
+        if len(self._idf) < vocab_size:
+            idf = self._compute_idf()
+            self._idf = np.concatenate([self._idf, idf[len(self._idf):]])
+        weighted = self._normalize(new_rows @ sparse.diags(self._idf)).tocsr()
+        self._weights.resize((self._weights.shape[0], vocab_size))
+        self._weights = sparse.vstack([self._weights, weighted], format="csr")
+    
+    def _query_vector(self, texts, applied_posting_ids=()):
+        """Normalized TF-IDF vector for a user's history"""
+        vocab_size = len(self._vocabulary)
+        counts = Counter()
+        for text in texts:
+            counts.update(term for term in tokenize(text) if term in self._vocabulary)
+        
+        columns = [self._vocabulary[term] for term in counts]
+        values = [(1.0 + math.log(count)) * self._idf[self._vocabulary[term]] for term, count in counts.items()]
+        query = sparse.csr_matrix(
+            (values, (np.zeros(len(columns), dtype=np.int64), columns)), shape=(1, vocab_size)
+        )
+        query = self._normalize(query)
+        
+        # Postings the user applied to describe their interests better than their notes
+        rows = [self._row_of[posting_id] for posting_id in applied_posting_ids if posting_id in self._row_of]
+        if rows:
+            applied = sparse.csr_matrix(self._weights[rows].mean(axis=0))
+            query = self._normalize(query + self._normalize(applied))
+        return query.tocsr()
+
+class RecommendationService:
+    """Keeps a JobRecommender in sync with the database and serves recommendations"""
+    
+    def __init__(self, db, refresh_interval=60):
+        self.db = db
+        self.refresh_interval = refresh_interval
+        self.recommender = JobRecommender()
+        self._last_refresh = 0.0
+        self._latest_created_at = None
+        self._refresh_lock = threading.Lock()
+    
+    def refresh(self, force=False):
+        """Index new postings, drop closed ones and restore reopened ones"""
+        if not force and time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+        if not self._refresh_lock.acquire(blocking=False):
+            # Another request is already refreshing; serve the current index
+            return
+        try:
+            postings = self.db.get_job_postings_for_matching(created_after=self._latest_created_at)
+            if postings:
+                self.recommender.add_postings(postings)
+                self._latest_created_at = max(
+                    [posting['created_at'] for posting in postings if posting.get('created_at')]
+                    + ([self._latest_created_at] if self._latest_created_at else []),
+                    default=None
+                )
+            missing = self.recommender.sync_active(self.db.get_active_job_posting_ids())
+            if missing:
+                # Active postings created before the last refresh but never indexed
+                self.recommender.add_postings(
+                    self.db.get_job_postings_for_matching(job_posting_ids=missing)
+                )
+            self._last_refresh = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+    
+    def recommend_for_user(self, user_id, k=10):
+        """Top-k active postings for a jobseeker, best match first"""
+        self.refresh()
+        applications = self.db.get_applications(user_id, ["company", "role", "notes", "job_posting_id"])
+        texts = [
+            " ".join(str(app.get(field) or "") for field in ("role", "company", "notes"))
+            for app in applications
+        ]
+        applied_ids = [app['job_posting_id'] for app in applications if app.get('job_posting_id')]
+        return self.recommender.recommend(texts, k, applied_posting_ids=applied_ids)
@@ -0,0 +1,198 @@
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from resilience import READ_METHODS, WRITE_METHODS, CircuitOpenError, is_transient
+
+# Identifies the user session making calls, for read-your-writes pinning
+_current_session = ContextVar("db_session", default=None)
+
+@contextmanager
+def db_session(session_id):
+    """Attribute the backend calls made inside the block to one session"""
+    token = _current_session.set(session_id)
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+def set_session(session_id):
+    """Attribute the rest of this context's backend calls to one session (e.g. a Streamlit rerun)"""
+    _current_session.set(session_id)
+
+class EndpointStats:
+    """Latency and error counts for one backend endpoint"""
+    
+    def __init__(self, name, role, window=512, alpha=0.2):
+        self.name = name
+        self.role = role
+        self.alpha = alpha
+        self.ewma = None
+        self.requests = 0
+        self.errors = 0
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+    
+    def record(self, duration, ok=True):
+        with self._lock:
+            self.requests += 1
+            if not ok:
+                self.errors += 1
+            self._recent.append(duration)
+            self.ewma = duration if self.ewma is None else self.alpha * duration + (1 - self.alpha) * self.ewma
+    
+    def snapshot(self):
+        with self._lock:
+            recent = sorted(self._recent)
+            ewma = self.ewma
+            requests, errors = self.requests, self.errors
+        
+        def percentile(pct):
+            if not recent:
+                return None
+            return round(recent[min(len(recent) - 1, int(pct / 100 * len(recent)))] * 1000, 3)
+        
+        return {
+            "name": self.name,
+            "role": self.role,
+            "requests": requests,
+            "errors": errors,
+            "ewma_ms": round(ewma * 1000, 3) if ewma is not None else None,
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+        }
+
+class ReplicaRouter:
+    """Sends writes to the primary and spreads reads over read replicas
+    
+    Each endpoint is a client (normally a ResilientClient). Reads go to the
+    healthier of two randomly picked replicas, compared by recent latency, and
+    skip replicas whose circuit breaker is open. After a session writes, its
+    reads go to the primary for pin_seconds, so it reads its own writes despite
+    replication lag. A read that fails on a replica is retried once on the primary.
+    """
+    
+    def __init__(self, primary, replicas=(), read_only_rpcs=(), pin_seconds=5.0):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.read_only_rpcs = set(read_only_rpcs)
+        self.pin_seconds = pin_seconds
+        self.stats = {id(primary): EndpointStats("primary", "primary")}
+        for index, replica in enumerate(self.replicas):
+            self.stats[id(replica)] = EndpointStats(f"replica-{index + 1}", "replica")
+        self._pinned_until = {}
+        self._lock = threading.Lock()
+    
+    def table(self, name):
+        return _RoutedBuilder(self, ("table", name, (), {}), None)
+    
+    def from_(self, name):
+        return self.table(name)
+    
+    def rpc(self, name, params=None, *args, **kwargs):
+        return _RoutedBuilder(self, ("rpc", name, (params,) + args, kwargs), name in self.read_only_rpcs)
+    
+    def __getattr__(self, name):
+        return getattr(self.primary, name)
+    
+    def health(self):
+        """Primary health plus latency and error counts for every endpoint"""
+        health = self.primary.health() if hasattr(self.primary, "health") else {}
+        return dict(health, endpoints=self.endpoint_stats())
+    
+    def endpoint_stats(self):
+        return [stats.snapshot() for stats in self.stats.values()]
+    
+    def is_pinned(self):
+        session = _current_session.get()
+        with self._lock:
+            until = self._pinned_until.get(session)
+            if until is not None and until < time.monotonic():
+                del self._pinned_until[session]
+                until = None
+        return until is not None
+    
+    def pin(self):
+        """Send this session's reads to the primary for the next pin_seconds"""
+        with self._lock:
+            self._pinned_until[_current_session.get()] = time.monotonic() + self.pin_seconds
+            # Forget sessions whose pin has expired so the map stays small
+            if len(self._pinned_until) > 10000:
+                now = time.monotonic()
+                self._pinned_until = {key: until for key, until in self._pinned_until.items() if until >= now}
+    
+    def choose(self, read):
+        if not read or not self.replicas or self.is_pinned():
+            return self.primary
+        healthy = [replica for replica in self.replicas if self._available(replica)]
+        if not healthy:
+            return self.primary
+        if len(healthy) == 1:
+            return healthy[0]
+        # Power of two choices: cheap, and avoids piling onto one replica
+        first, second = random.sample(healthy, 2)
+        return first if self._latency(first) <= self._latency(second) else second
+    
+    def execute(self, request, chain, read):
+        endpoint = self.choose(read)
+        try:
+            return self._execute_on(endpoint, request, chain)
+        except Exception as e:
+            if endpoint is self.primary or not (is_transient(e) or isinstance(e, CircuitOpenError)):
+                raise
+            return self._execute_on(self.primary, request, chain)
+        finally:
+            if not read:
+                self.pin()
+    
+    def _execute_on(self, endpoint, request, chain):
+        kind, name, args, kwargs = request
+        builder = endpoint.table(name) if kind == "table" else endpoint.rpc(name, *args, **kwargs)
+        for method, method_args, method_kwargs in chain:
+            builder = getattr(builder, method)(*method_args, **method_kwargs)
+        
+        started = time.perf_counter()
+        ok = False
+        try:
+            response = builder.execute()
+            ok = True
+            return response
+        finally:
+            self.stats[id(endpoint)].record(time.perf_counter() - started, ok)
+    
+    def _available(self, endpoint):
+        breaker = getattr(endpoint, "breaker", None)
+        return breaker is None or breaker.state != "open"
+    
+    def _latency(self, endpoint):
+        ewma = self.stats[id(endpoint)].ewma
+        # Unmeasured endpoints look fast so they get tried
+        return 0.0 if ewma is None else ewma
+
+class _RoutedBuilder:
+    """Records a query's builder calls so it can be run on whichever endpoint is chosen"""
+    
+    def __init__(self, router, request, read, chain=()):
+        self._router = router
+        self._request = request
+        self._read = read
+        self._chain = chain
+    
+    def execute(self):
+        return self._router.execute(self._request, self._chain, bool(self._read))
+    
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        
+        def call(*args, **kwargs):
+            read = self._read
+            if read is None and name in READ_METHODS:
+                read = True
+            elif name in WRITE_METHODS:
+                read = False
+            return _RoutedBuilder(self._router, self._request, read, self._chain + ((name, args, kwargs),))
+        return call
@@ -0,0 +1,278 @@
+import contextvars
+import copy
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from cache import TTLCache
+from profiling import sampled
+
+try:
+    import httpx
+    TRANSPORT_ERRORS = (httpx.TransportError,)
+except ImportError:
+    TRANSPORT_ERRORS = ()
+
+# Builder methods that decide whether a request only reads
+READ_METHODS = {"select"}
+WRITE_METHODS = {"insert", "update", "upsert", "delete"}
+# Pages of a larger result (exports, keyset pagination); not worth keeping for stale-if-error
+PAGE_METHODS = {"limit", "range", "offset"}
+
+class BackendTimeout(TimeoutError):
+    """A backend call did not finish within its deadline"""
+
+class CircuitOpenError(RuntimeError):
+    """The backend is failing; calls are rejected until the breaker resets"""
+
+def _env_float(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return float(default)
+
+class ResiliencePolicy:
+    """Deadlines, retries, hedging and circuit breaker settings for backend calls"""
+    
+    def __init__(self, timeout=10.0, read_retries=2, backoff=0.1, max_backoff=2.0,
+                 hedge_after=0.25, hedge_tables=("profiles", "job_postings"),
+                 breaker_failures=5, breaker_reset=30.0, stale_if_error=True, stale_ttl=300,
+                 stale_max_rows=1000):
+        self.timeout = timeout
+        self.read_retries = read_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_after = hedge_after
+        self.hedge_tables = set(hedge_tables)
+        self.breaker_failures = breaker_failures
+        self.breaker_reset = breaker_reset
+        self.stale_if_error = stale_if_error
+        self.stale_ttl = stale_ttl
+        self.stale_max_rows = stale_max_rows
+    
+    @classmethod
+    def from_env(cls):
+        hedge_tables = os.getenv("SUPABASE_HEDGE_TABLES", "profiles,job_postings")
+        return cls(
+            timeout=_env_float("SUPABASE_TIMEOUT", 10),
+            read_retries=int(_env_float("SUPABASE_READ_RETRIES", 2)),
+            backoff=_env_float("SUPABASE_RETRY_BACKOFF", 0.1),
+            hedge_after=_env_float("SUPABASE_HEDGE_AFTER", 0.25),
+            hedge_tables=[table.strip() for table in hedge_tables.split(",") if table.strip()],
+            breaker_failures=int(_env_float("SUPABASE_BREAKER_FAILURES", 5)),
+            breaker_reset=_env_float("SUPABASE_BREAKER_RESET", 30),
+            stale_if_error=os.getenv("SUPABASE_STALE_IF_ERROR", "1").lower() in ("1", "true", "yes"),
+            stale_ttl=int(_env_float("SUPABASE_STALE_TTL", 300)),
+            stale_max_rows=int(_env_float("SUPABASE_STALE_MAX_ROWS", 1000)),
+        )
+    
+    def worst_case_read(self):
+        """Seconds one read can take: every attempt times out, with the longest backoff between them"""
+        backoffs = sum(min(self.max_backoff, self.backoff * 2 ** attempt) for attempt in range(self.read_retries))
+        return self.timeout * (1 + self.read_retries) + backoffs
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets one trial call through after a cooldown"""
+    
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(f"Backend circuit breaker opened after {self.failures} failures")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+    
+    def snapshot(self):
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+def is_transient(error):
+    """Timeouts, connection errors and 5xx responses; not bad requests or constraint violations"""
+    if isinstance(error, (BackendTimeout, TimeoutError) + TRANSPORT_ERRORS):
+        return True
+    code = str(getattr(error, "code", "") or "")
+    return code.startswith("5") and code.isdigit()
+
+class ResilientClient:
+    """Wraps a supabase client with deadlines, read retries, hedged reads and a circuit breaker
+    
+    Reads (select queries and the rpc functions listed in read_only_rpcs) are
+    retried with jittered exponential backoff on transient errors. Reads of
+    hedge_tables start a second, identical request if the first has not answered
+    within hedge_after seconds, and the first answer wins. Writes get a deadline
+    but are never retried or hedged. While the breaker is open, calls fail fast.
+    Reads can then return the last successful response for the same query, if
+    stale_if_error is on. Only whole, small results are kept for that: pages
+    (limit/range queries) and results over stale_max_rows rows are not.
+    """
+    
+    def __init__(self, client, policy=None, read_only_rpcs=(), max_workers=32):
+        self._client = client
+        self.policy = policy or ResiliencePolicy.from_env()
+        self.read_only_rpcs = set(read_only_rpcs)
+        self.breaker = CircuitBreaker(self.policy.breaker_failures, self.policy.breaker_reset)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="supabase-call")
+        self._stale = TTLCache(maxsize=2048, ttl=self.policy.stale_ttl)
+        self._counters_lock = threading.Lock()
+        self.counters = {"retries": 0, "hedges": 0, "hedge_wins": 0, "timeouts": 0, "stale_served": 0}
+    
+    def table(self, name):
+        return _ResilientBuilder(self, self._client.table(name), name, (), None)
+    
+    def from_(self, name):
+        return self.table(name)
+    
+    def rpc(self, name, params=None, *args, **kwargs):
+        builder = self._client.rpc(name, params, *args, **kwargs)
+        return _ResilientBuilder(self, builder, f"rpc:{name}", (("rpc", repr(params)),), name in self.read_only_rpcs)
+    
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+    
+    def health(self):
+        """Breaker state and retry/hedge/stale counters"""
+        with self._counters_lock:
+            counters = dict(self.counters)
+        return dict(self.breaker.snapshot(), **counters)
+    
+    def _count(self, name):
+        with self._counters_lock:
+            self.counters[name] += 1
+    
+    def execute(self, builder, target, key, read):
+        if not self.breaker.allow():
+            return self._fallback(key, read, CircuitOpenError("Backend unavailable (circuit breaker open)"))
+        
+        attempts = 1 + (self.policy.read_retries if read else 0)
+        hedge = read and self.policy.hedge_after > 0 and target in self.policy.hedge_tables
+        for attempt in range(attempts):
+            try:
+                response = self._call(builder, hedge)
+            except Exception as e:
+                if not is_transient(e):
+                    # The backend answered; the request itself was bad
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt + 1 >= attempts or not self.breaker.allow():
+                    return self._fallback(key, read, e)
+                self._count("retries")
+                # Full jitter keeps retrying clients from synchronising
+                time.sleep(random.uniform(0, min(self.policy.max_backoff, self.policy.backoff * 2 ** attempt)))
+                continue
+            self.breaker.record_success()
+            if read and self.policy.stale_if_error and self._keep_stale(key, response):
+                # Kept by reference: copying every read would cost more than the rare
+                # stale answer is worth. Stale answers are copied when served instead.
+                self._stale.set(key, response)
+            return response
+    
+    def _call(self, builder, hedge):
+        """Run execute() with a deadline, optionally hedged with a second request"""
+        deadline = time.monotonic() + self.policy.timeout
+        primary = self._submit(builder)
+        pending = {primary}
+        if hedge:
+            done, _ = wait(pending, timeout=min(self.policy.hedge_after, self.policy.timeout))
+            if not done:
+                self._count("hedges")
+                pending.add(self._submit(builder))
+        
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                # Abandoned calls finish in the background, bounded by the HTTP client timeout
+                self._count("timeouts")
+                raise BackendTimeout(f"Backend call exceeded {self.policy.timeout:.1f}s")
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        self._count("hedge_wins")
+                    return future.result()
+                error = error or future.exception()
+        raise error
+    
+    def _submit(self, builder):
+        # Carry context variables (profiling, round-trip counters) into the worker thread
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, sampled, builder.execute)
+    
+    def _keep_stale(self, key, response):
+        if any(step[0] in PAGE_METHODS for step in key[1]):
+            return False
+        data = getattr(response, "data", None)
+        return not isinstance(data, list) or len(data) <= self.policy.stale_max_rows
+    
+    def _fallback(self, key, read, error):
+        if read and self.policy.stale_if_error:
+            stale = self._stale.get(key)
+            if stale is not None:
+                self._count("stale_served")
+                return copy.deepcopy(stale)
+        raise error
+
+class _ResilientBuilder:
+    """Proxies a postgrest request builder, remembering the query so it can be retried and cached"""
+    
+    def __init__(self, client, builder, target, chain, read):
+        self._client = client
+        self._builder = builder
+        self._target = target
+        self._chain = chain
+        self._read = read
+    
+    def execute(self):
+        key = (self._target, self._chain)
+        return self._client.execute(self._builder, self._target, key, bool(self._read))
+    
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+        
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if not hasattr(result, "execute"):
+                return result
+            read = self._read
+            if read is None and name in READ_METHODS:
+                read = True
+            elif name in WRITE_METHODS:
+                read = False
+            chain = self._chain + ((name, repr(args), repr(sorted(kwargs.items()))),)
+            return _ResilientBuilder(self._client, result, self._target, chain, read)
+        return call
@@ -0,0 +1,113 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Counters active in the current context (nested count_round_trips blocks)
+_active_counters = ContextVar("round_trip_counters", default=())
+
+class RoundTripCounter:
+    """Backend round trips (execute() calls) made while it is active"""
+    
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+    
+    @property
+    def count(self):
+        return len(self.calls)
+    
+    def record(self, label, duration):
+        with self._lock:
+            self.calls.append((label, duration))
+    
+    def summary(self):
+        """Round trips grouped by table/function, e.g. {'table:applications': 2}"""
+        grouped = {}
+        for label, _ in self.calls:
+            grouped[label] = grouped.get(label, 0) + 1
+        return grouped
+
+class RoundTripBudgetExceeded(AssertionError):
+    """Raised by assert_max_round_trips when a block uses too many round trips"""
+
+@contextmanager
+def count_round_trips():
+    """Count the backend round trips made inside the block
+    
+        with count_round_trips() as trips:
+            db.get_applications(user_id)
+        print(trips.count, trips.summary())
+    """
+    counter = RoundTripCounter()
+    token = _active_counters.set(_active_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active_counters.reset(token)
+
+@contextmanager
+def assert_max_round_trips(budget, label=None):
+    """Fail if the block makes more than budget backend round trips
+    
+        with assert_max_round_trips(1, "get_applicants_for_jobprovider"):
+            db.get_applicants_for_jobprovider(user_id)
+    """
+    with count_round_trips() as counter:
+        yield counter
+    if counter.count > budget:
+        raise RoundTripBudgetExceeded(
+            f"{label or 'block'} made {counter.count} round trips (budget {budget}): {counter.summary()}"
+        )
+
+class CountingClient:
+    """Wraps a supabase client so every execute() is counted by active counters"""
+    
+    def __init__(self, client):
+        self._client = client
+        self.total_round_trips = 0
+    
+    def table(self, name):
+        return _CountingBuilder(self, self._client.table(name), f"table:{name}")
+    
+    def from_(self, name):
+        return self.table(name)
+    
+    def rpc(self, name, params=None, *args, **kwargs):
+        return _CountingBuilder(self, self._client.rpc(name, params, *args, **kwargs), f"rpc:{name}")
+    
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+    
+    def _record(self, label, duration):
+        self.total_round_trips += 1
+        for counter in _active_counters.get():
+            counter.record(label, duration)
+
+class _CountingBuilder:
+    """Proxies a postgrest request builder, counting its execute() call"""
+    
+    def __init__(self, client, builder, label):
+        self._client = client
+        self._builder = builder
+        self._label = label
+    
+    def execute(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._builder.execute(*args, **kwargs)
+        finally:
+            self._client._record(self._label, time.perf_counter() - started)
+    
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+        
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            # Filters and modifiers return builders; keep them wrapped
+            if hasattr(result, "execute"):
+                return _CountingBuilder(self._client, result, self._label)
+            return result
+        return call
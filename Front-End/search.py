@@ -0,0 +1,105 @@
+import re
+from bisect import bisect_left
+
+from cache import data_version
+
+# Field weights: a company/role hit ranks above a hit in the notes
+DEFAULT_FIELDS = {"company": 3.0, "role": 3.0, "notes": 1.0}
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+def tokenize(text):
+    return WORD_RE.findall(str(text).lower()) if text else []
+
+def trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class ApplicationSearchIndex:
+    """In-memory search over a list of application records
+    
+    Each query word matches a record when it is a prefix of one of its words
+    (e.g. "eng" finds "Engineer"). Otherwise, words that share enough trigrams
+    also match, so small typos ("enginer") still find it. A record must match
+    every query word. Results are unique and sorted by score: field weight times
+    match quality, summed over the query words.
+    """
+    
+    def __init__(self, records, fields=None, min_similarity=0.4):
+        self.records = list(records)
+        self.fields = fields or DEFAULT_FIELDS
+        self.min_similarity = min_similarity
+        # word -> {record position: best field weight for that word}
+        self._postings = {}
+        self._trigrams = {}
+        
+        for position, record in enumerate(self.records):
+            for field, weight in self.fields.items():
+                for word in tokenize(record.get(field)):
+                    hits = self._postings.setdefault(word, {})
+                    hits[position] = max(hits.get(position, 0.0), weight)
+        
+        self._words = sorted(self._postings)
+        for word in self._words:
+            for gram in trigrams(word):
+                self._trigrams.setdefault(gram, set()).add(word)
+    
+    @staticmethod
+    def signature_of(records, fields=None):
+        """Changes whenever a record is added, removed or has an indexed field edited
+        
+        Other fields (e.g. status) are left out, so editing them doesn't force a
+        rebuild; look records up again by ID to get their current values.
+        """
+        return data_version(records, ("id",) + tuple(fields or DEFAULT_FIELDS))
+    
+    def search(self, query, limit=None):
+        """Records matching every word of the query, best first"""
+        terms = tokenize(query)
+        if not terms:
+            return list(self.records)
+        
+        scores = None
+        for term in terms:
+            term_scores = self._match(term)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {position: score + term_scores[position] for position, score in scores.items() if position in term_scores}
+            if not scores:
+                return []
+        
+        ranked = sorted(scores, key=lambda position: (-scores[position], position))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self.records[position] for position in ranked]
+    
+    def _match(self, term):
+        """{record position: score} for one query word"""
+        scores = {}
+        
+        # Prefix matches: exact words score 1.0, longer words slightly less
+        index = bisect_left(self._words, term)
+        while index < len(self._words) and self._words[index].startswith(term):
+            word = self._words[index]
+            index += 1
+            quality = 1.0 if word == term else 0.8
+            for position, weight in self._postings[word].items():
+                scores[position] = max(scores.get(position, 0.0), weight * quality)
+        
+        # Fuzzy matches for typos, only needed for terms long enough to have useful trigrams
+        if len(term) >= 3:
+            term_grams = trigrams(term)
+            shared = {}
+            for gram in term_grams:
+                for word in self._trigrams.get(gram, ()):
+                    shared[word] = shared.get(word, 0) + 1
+            for word, count in shared.items():
+                similarity = count / len(term_grams | trigrams(word))
+                if similarity < self.min_similarity:
+                    continue
+                quality = 0.5 * similarity
+                for position, weight in self._postings[word].items():
+                    scores[position] = max(scores.get(position, 0.0), weight * quality)
+        
+        return scores
@@ -0,0 +1,94 @@
+import atexit
+import threading
+import time
+from datetime import date, datetime, timezone
+
+class DeadlineSweeper:
+    """Background job that closes active job postings whose deadline has passed
+    
+    Each run calls close_batch(today, batch_size) until a batch comes back short,
+    so a large backlog is closed in several small set-based updates instead of
+    one long-running one. Runs happen every interval seconds; run_once() can be
+    called directly for an immediate sweep.
+    """
+    
+    def __init__(self, close_batch, interval=3600, batch_size=500, max_batches=100):
+        self.close_batch = close_batch
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._running = False
+        self._stats = {
+            "runs": 0,
+            "total_closed": 0,
+            "last_run_at": None,
+            "last_duration_ms": None,
+            "last_closed": 0,
+            "last_batches": 0,
+            "last_error": None,
+        }
+    
+    def start(self):
+        """Sweep once now, then every interval seconds in a background thread"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="deadline-sweeper", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+    
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+    
+    def run_once(self, today=None):
+        """Close every expired posting in batches and return the number closed"""
+        today = today or date.today()
+        with self._run_lock:
+            started = time.perf_counter()
+            closed = 0
+            batches = 0
+            error = None
+            try:
+                while batches < self.max_batches:
+                    rows = self.close_batch(today, self.batch_size)
+                    batches += 1
+                    closed += len(rows)
+                    if len(rows) < self.batch_size:
+                        break
+            except Exception as e:
+                error = str(e)
+                print(f"Error sweeping expired job postings: {e}")
+            
+            with self._lock:
+                self._stats["runs"] += 1
+                self._stats["total_closed"] += closed
+                self._stats["last_run_at"] = datetime.now(timezone.utc).isoformat()
+                self._stats["last_duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+                self._stats["last_closed"] = closed
+                self._stats["last_batches"] = batches
+                self._stats["last_error"] = error
+            return closed
+    
+    def stats(self):
+        """Counters for the runs so far, plus the current settings"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update(running=self._running, interval=self.interval, batch_size=self.batch_size)
+        return stats
+    
+    def _run(self):
+        while self._running:
+            self.run_once()
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
@@ -0,0 +1,243 @@
+import atexit
+import glob
+import json
+import os
+import tempfile
+import threading
+import uuid
+
+from resilience import CircuitOpenError, is_transient
+
+class StatusWriteBehind:
+    """Write-behind queue for application status updates
+    
+    Updates are acknowledged as soon as they are appended to a local journal.
+    Repeated updates to the same application are coalesced, and a background
+    thread flushes them as one batched write per status, either every
+    flush_interval seconds or as soon as max_batch applications are pending.
+    Journals left behind by a crashed process are replayed on start; each one
+    is claimed by renaming it first, so only one of several starting workers
+    replays it. Writes that fail transiently are re-queued; ones the backend
+    rejects are appended to a dead-letter file in the journal directory instead.
+    """
+    
+    def __init__(self, write_batch, journal_dir=None, flush_interval=0.5, max_batch=100, fsync=True):
+        self.write_batch = write_batch
+        self.journal_dir = journal_dir or os.getenv(
+            "WRITE_BEHIND_JOURNAL_DIR",
+            os.path.join(tempfile.gettempdir(), "job-tracker-write-behind")
+        )
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.fsync = fsync
+        self.journal_path = os.path.join(self.journal_dir, f"status-{os.getpid()}.jsonl")
+        self.dead_letter_path = os.path.join(self.journal_dir, "dead-letter.jsonl")
+        self.dead_letters = 0
+        
+        self._pending = {}
+        # Taken off _pending by a flush whose write hasn't finished yet
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._journal = None
+        self._thread = None
+        self._running = False
+    
+    def start(self):
+        """Replay leftover journals and start the background flusher"""
+        if self._running:
+            return
+        os.makedirs(self.journal_dir, exist_ok=True)
+        
+        with self._lock:
+            claimed = []
+            for path in self._recoverable_journals():
+                if path != self.journal_path:
+                    path = self._claim_journal(path)
+                    if path is None:
+                        continue
+                    claimed.append(path)
+                for application_id, status in self._read_journal(path):
+                    self._pending[application_id] = status
+            self._rewrite_journal()
+            for path in claimed:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="status-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+    
+    def stop(self):
+        """Flush everything still queued and stop the background flusher"""
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+        with self._lock:
+            if self._journal:
+                self._journal.close()
+                self._journal = None
+            if not self._pending and os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+    
+    def enqueue(self, application_id, status):
+        """Queue a status update; it is durable once this returns"""
+        with self._lock:
+            self._pending[application_id] = status
+            self._append_journal(application_id, status)
+            if len(self._pending) >= self.max_batch:
+                self._wakeup.set()
+    
+    def pending_status(self, application_id):
+        """Get the queued or still-being-written status for an application, if any"""
+        with self._lock:
+            status = self._pending.get(application_id)
+            return status if status is not None else self._in_flight.get(application_id)
+    
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending.keys() | self._in_flight.keys())
+    
+    def flush(self):
+        """Write all queued updates now, one batched write per status"""
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending
+                self._pending = {}
+                self._in_flight = batch
+            if not batch:
+                return 0
+            
+            by_status = {}
+            for application_id, status in batch.items():
+                by_status.setdefault(status, []).append(application_id)
+            
+            written = 0
+            failed = {}
+            rejected = []
+            for status, application_ids in by_status.items():
+                try:
+                    self.write_batch(status, application_ids)
+                    written += len(application_ids)
+                except Exception as e:
+                    if not self._retryable(e):
+                        # Retrying a rejected write would fail the same way forever
+                        print(f"Dropping {len(application_ids)} status updates to {status!r}: {e}")
+                        rejected.extend((application_id, status, str(e)) for application_id in application_ids)
+                        continue
+                    print(f"Error flushing status updates: {e}")
+                    for application_id in application_ids:
+                        failed[application_id] = status
+            if rejected:
+                self._dead_letter(rejected)
+            
+            with self._lock:
+                # Updates queued while flushing are newer than the failed ones
+                for application_id, status in failed.items():
+                    self._pending.setdefault(application_id, status)
+                self._in_flight = {}
+                self._rewrite_journal()
+            return written
+    
+    def _retryable(self, error):
+        return isinstance(error, CircuitOpenError) or is_transient(error)
+    
+    def _dead_letter(self, rejected):
+        try:
+            with open(self.dead_letter_path, "a") as f:
+                for application_id, status, error in rejected:
+                    f.write(json.dumps({"id": application_id, "status": status, "error": error}) + "\n")
+        except OSError as e:
+            print(f"Error writing dead-lettered status updates: {e}")
+        with self._lock:
+            self.dead_letters += len(rejected)
+    
+    def _run(self):
+        while self._running:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+    
+    def _append_journal(self, application_id, status):
+        if self._journal is None:
+            self._journal = open(self.journal_path, "a")
+        self._journal.write(json.dumps({"id": application_id, "status": status}) + "\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+    
+    def _rewrite_journal(self):
+        """Replace the journal with the updates that are still pending"""
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+        
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for application_id, status in self._pending.items():
+                f.write(json.dumps({"id": application_id, "status": status}) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+    
+    def _claim_journal(self, path):
+        """Rename a dead process's journal to one owned by this process, or None if another got it first"""
+        claimed_path = os.path.join(self.journal_dir, f"status-{os.getpid()}.{uuid.uuid4().hex}.jsonl")
+        try:
+            os.rename(path, claimed_path)
+        except FileNotFoundError:
+            return None
+        return claimed_path
+    
+    def _read_journal(self, path):
+        entries = []
+        try:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn last line from a crash mid-write
+                        continue
+                    entries.append((entry['id'], entry['status']))
+        except OSError:
+            pass
+        return entries
+    
+    def _recoverable_journals(self):
+        """Journals owned by this process or by processes that no longer exist"""
+        paths = []
+        for path in glob.glob(os.path.join(self.journal_dir, "status-*.jsonl")):
+            if path == self.journal_path:
+                paths.append(path)
+                continue
+            try:
+                # status-<pid>.jsonl, or status-<pid>.<claim>.jsonl for a claimed one
+                pid = int(os.path.basename(path)[len("status-"):-len(".jsonl")].split(".")[0])
+            except ValueError:
+                continue
+            if not self._is_alive(pid):
+                paths.append(path)
+        return paths
+    
+    def _is_alive(self, pid):
+        if os.name == "nt":
+            # Can't probe safely on Windows (os.kill(pid, 0) sends CTRL_C_EVENT)
+            return True
+        try:
+            os.kill(pid, 0)
+        except PermissionError:
+            return True
+        except OSError:
+            return False
+        return True
@@ -0,0 +1,19 @@
+# Gunicorn settings for running the API with multiple worker processes:
+#   cd api
+#   gunicorn main:app -c gunicorn.conf.py
+import multiprocessing
+import os
+
+bind = f"{os.getenv('API_HOST', '0.0.0.0')}:{os.getenv('API_PORT', '8001')}"
+workers = int(os.getenv("API_WORKERS", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app once in the master so workers fork from a loaded interpreter.
+# Per-worker resources (the Database client, cache invalidation listener and
+# warm-up) start in the app lifespan.
+preload_app = True
+
+# Give in-flight requests time to finish on SIGTERM / restarts
+graceful_timeout = int(os.getenv("API_GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("API_WORKER_TIMEOUT", "60"))
+keepalive = 5
@@ -1,15 +1,99 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Any, Dict, Literal
+from contextlib import asynccontextmanager
+import asyncio
+import httpx
 import os
+import posixpath
 import sys
-from datetime import datetime
+import time
+import uuid
+from datetime import datetime, date, timedelta
+from urllib.parse import unquote, urlsplit
 
 # Add the Front-End directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'Front-End'))
-from db import Database
-app = FastAPI(title="Job Application Tracker API")
+from db import Database, APPLICATION_STATUSES
+from replicas import db_session
+from parallel import gather_in_threads
+from resilience import BackendTimeout
+from invalidation import InvalidationBus
+from recommend import RecommendationService
+from profiling import profile_if_requested
+import export
+
+# Created per worker process in the lifespan hook (after any fork), so each worker
+# gets its own HTTP client and thread pools. Tools may assign these before startup.
+db = None
+recommendations = None
+
+# Warm-up progress reported by /readyz
+readiness = {"ready": False, "warmup_ms": None, "warmed": {}, "error": None}
+
+def warm_up():
+    """Check the backend is reachable and fill the caches the first requests would miss"""
+    started = time.perf_counter()
+    if not db.ping():
+        raise RuntimeError("Backend is not reachable")
+    # Only what API routes read: posting summaries (application hydration), whole
+    # profiles (profile and dashboard routes) and the recommendation index
+    warmed = {
+        "recent_postings": db.warm_posting_cache(int(os.getenv("WARMUP_RECENT_POSTINGS", "500"))),
+        "recent_profiles": db.warm_profile_cache(int(os.getenv("WARMUP_RECENT_PROFILES", "500"))),
+    }
+    recommendations.refresh(force=True)
+    warmed["recommender_postings"] = len(recommendations.recommender)
+    readiness.update(
+        ready=True, warmed=warmed, error=None,
+        warmup_ms=round((time.perf_counter() - started) * 1000, 3)
+    )
+
+async def warm_up_until_ready():
+    delay = 1.0
+    while True:
+        try:
+            await asyncio.to_thread(warm_up)
+            return
+        except Exception as e:
+            readiness["error"] = str(e)
+            print(f"API warm-up failed, retrying in {delay:.0f}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+@asynccontextmanager
+async def lifespan(app):
+    global db, recommendations
+    if db is None:
+        db = Database()
+    if recommendations is None:
+        recommendations = RecommendationService(
+            db, refresh_interval=int(os.getenv("RECOMMENDER_REFRESH_INTERVAL", "60"))
+        )
+    
+    # Runs once per worker process, after any fork, so each worker gets its own
+    # listener on the shared cache invalidation channel
+    bus = InvalidationBus(on_message=db.handle_invalidation)
+    bus.start()
+    db.attach_invalidation_bus(bus)
+    # Close postings past their deadline; concurrent sweepers in other workers take disjoint batches
+    if os.getenv("DEADLINE_SWEEPER", "1").lower() in ("1", "true", "yes"):
+        db.enable_deadline_sweeper()
+    # The worker accepts connections right away; /readyz reports 503 until warm-up is done
+    warmup = asyncio.create_task(warm_up_until_ready())
+    try:
+        yield
+    finally:
+        warmup.cancel()
+        readiness["ready"] = False
+        db.attach_invalidation_bus(None)
+        bus.stop()
+        # Flush any write-behind status updates before the worker exits
+        db.close()
+
+app = FastAPI(title="Job Application Tracker API", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -20,7 +104,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-db = Database()
+# Opt-in profiling: "X-Profile: 1" header or "?profile=1" (requires PROFILING_ENABLED=1),
+# or randomly sampled requests at PROFILE_SAMPLE_RATE
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    requested = request.headers.get("x-profile") or request.query_params.get("profile")
+    profile = profile_if_requested(f"{request.method}-{request.url.path}", requested)
+    with profile:
+        response = await call_next(request)
+    if getattr(profile, "profile_id", None):
+        response.headers["X-Profile-Id"] = profile.profile_id
+    return response
+
+# Read-your-writes: a client that sends the same "X-Session-Id" on every request reads
+# from the primary right after it writes, instead of from a lagging read replica
+@app.middleware("http")
+async def route_session(request: Request, call_next):
+    with db_session(request.headers.get("x-session-id") or uuid.uuid4().hex):
+        return await call_next(request)
+
+# Concurrent fetches share one deadline (see parallel.py); running out of it is a gateway timeout
+@app.exception_handler(BackendTimeout)
+async def backend_timeout(request: Request, exc: BackendTimeout):
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
 
 # Pydantic models
 class ApplicationCreate(BaseModel):
@@ -31,7 +137,7 @@ class ApplicationCreate(BaseModel):
     notes: Optional[str] = None 
 
 class ApplicationUpdate(BaseModel):
-    status: str
+    status: Literal[APPLICATION_STATUSES]
     notes: Optional[str] = None
 
 class JobPostingCreate(BaseModel):
@@ -47,6 +153,17 @@ class UserProfile(BaseModel):
     email: str
     role: str
 
+class BatchOperation(BaseModel):
+    method: str
+    path: str
+    params: Optional[Dict[str, Any]] = None
+    body: Optional[Any] = None
+    id: Optional[str] = None
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation]
+    stop_on_error: bool = False
+
 # Validation functions (moved from logic.py)
 def validate_application_data(company, role, status):
     errors = []
@@ -68,6 +185,27 @@ def validate_job_posting_data(title, description, deadline):
         errors.append("Deadline cannot be in the past")
     return errors
 
+# Columns each ?fields= endpoint may select; anything else would fail in PostgREST
+APPLICATION_COLUMNS = {
+    "id", "user_id", "company", "role", "status", "applied_date", "notes", "job_posting_id", "status_changed_at"
+}
+JOB_POSTING_COLUMNS = {
+    "id", "user_id", "title", "description", "requirements", "deadline", "status", "created_at"
+}
+
+def parse_fields(fields, allowed):
+    """Turn a ?fields=a,b,c query value into a list of column names from allowed"""
+    if not fields:
+        return None
+    columns = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [column for column in columns if column not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(sorted(allowed))})"
+        )
+    return columns
+
 def get_application_stats(applications):
     if not applications:
         return {
@@ -97,20 +235,111 @@ def get_application_stats(applications):
         "success_rate": success_rate
     }
 
+def get_provider_funnel(rollups):
+    total = sum(row.get('total', 0) for row in rollups)
+    interview = sum(row.get('interview', 0) for row in rollups)
+    offer = sum(row.get('offer', 0) for row in rollups)
+    rejected = sum(row.get('rejected', 0) for row in rollups)
+    
+    # Offers have been through an interview, so they count as having reached it
+    reached_interview = interview + offer
+    
+    return {
+        "applied": total,
+        "interview": reached_interview,
+        "offer": offer,
+        "rejected": rejected,
+        "interview_rate": round(reached_interview / total * 100, 2) if total > 0 else 0,
+        "offer_rate": round(offer / reached_interview * 100, 2) if reached_interview > 0 else 0,
+        "overall_rate": round(offer / total * 100, 2) if total > 0 else 0
+    }
+
+def summarize_applicant_counts(postings):
+    by_status = {"applied": 0, "interview": 0, "offer": 0, "rejected": 0}
+    for counts in postings.values():
+        for status in by_status:
+            by_status[status] += counts.get(status, 0)
+    
+    return {
+        "total": sum(counts['total'] for counts in postings.values()),
+        "by_status": by_status,
+        "postings": postings
+    }
+
+def get_followups(applications):
+    """Applications that need a follow-up: applied 7+ days ago, or interviewing for 3+ days"""
+    today = datetime.now().date()
+    followups = []
+    for app in applications:
+        applied_date = app.get('applied_date')
+        if not applied_date:
+            continue
+        if isinstance(applied_date, str):
+            applied_date = datetime.strptime(applied_date[:10], '%Y-%m-%d').date()
+        days_since_application = (today - applied_date).days
+        
+        if app.get('status') == 'applied' and days_since_application >= 7:
+            followups.append(app)
+        elif app.get('status') == 'interview' and days_since_application >= 3:
+            followups.append(app)
+    return followups
+
+def get_application_stats_from_counts(counts):
+    """Same statistics as get_application_stats, from per-status counts"""
+    total = counts.get('total', 0)
+    return {
+        "total": total,
+        "applied": counts.get('applied', 0),
+        "interview": counts.get('interview', 0),
+        "offer": counts.get('offer', 0),
+        "rejected": counts.get('rejected', 0),
+        "success_rate": round(counts.get('offer', 0) / total * 100, 2) if total > 0 else 0
+    }
+
+def page_of(items_and_total, offset, limit):
+    """A page fetched by the database, with the total it counted"""
+    items, total = items_and_total
+    return {
+        "items": items,
+        "total": total,
+        "offset": offset,
+        "limit": limit
+    }
+
+def validate_page(offset, limit):
+    if offset < 0 or limit < 1 or limit > 500:
+        raise HTTPException(status_code=400, detail="'offset' must be >= 0 and 'limit' between 1 and 500")
+
 # API Routes
+# Routes that only make blocking Database calls are plain "def": Starlette runs them on its
+# threadpool instead of the event loop, so concurrent requests (and batch reads) overlap
 @app.get("/")
 async def root():
     return {"message": "Job Application Tracker API"}
 
+# Probes for the load balancer: /healthz = process is up, /readyz = warm and backend healthy
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    backend = db.get_backend_health() if db is not None else None
+    ready = readiness["ready"] and backend is not None and backend["state"] != "open"
+    body = dict(readiness, ready=ready, backend=backend)
+    if not ready:
+        raise HTTPException(status_code=503, detail=body)
+    return body
+
 @app.get("/api/profile/{user_id}")
-async def get_profile(user_id: str):
+def get_profile(user_id: str):
     profile = db.get_user_profile(user_id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     return profile
 
 @app.post("/api/profile")
-async def create_profile(profile: UserProfile):
+def create_profile(profile: UserProfile):
     new_profile = db.create_user_profile(
         profile.id, profile.username, profile.email, profile.role
     )
@@ -120,12 +349,12 @@ async def create_profile(profile: UserProfile):
 
 # Application endpoints
 @app.get("/api/applications/{user_id}")
-async def get_applications(user_id: str):
-    applications = db.get_applications(user_id)
+def get_applications(user_id: str, fields: Optional[str] = None, include_archived: bool = False):
+    applications = db.get_applications(user_id, parse_fields(fields, APPLICATION_COLUMNS), include_archived)
     return applications
 
 @app.post("/api/applications")
-async def create_application(application: ApplicationCreate):
+def create_application(application: ApplicationCreate):
     errors = validate_application_data(
         application.company, application.role, application.status
     )
@@ -141,14 +370,14 @@ async def create_application(application: ApplicationCreate):
     return new_app
 
 @app.put("/api/applications/{application_id}")
-async def update_application(application_id: int, update: ApplicationUpdate):
+def update_application(application_id: int, update: ApplicationUpdate):
     updated = db.update_application_status(application_id, update.status)
     if not updated:
         raise HTTPException(status_code=404, detail="Application not found")
     return updated
 
 @app.delete("/api/applications/{application_id}")
-async def delete_application(application_id: int):
+def delete_application(application_id: int):
     success = db.delete_application(application_id)
     if not success:
         raise HTTPException(status_code=404, detail="Application not found")
@@ -156,12 +385,17 @@ async def delete_application(application_id: int):
 
 # Job Posting endpoints
 @app.get("/api/jobpostings/{user_id}")
-async def get_job_postings(user_id: str):
-    postings = db.get_job_postings(user_id)
+def get_job_postings(user_id: str, fields: Optional[str] = None, include_archived: bool = False):
+    postings = db.get_job_postings(user_id, parse_fields(fields, JOB_POSTING_COLUMNS), include_archived)
     return postings
 
+@app.get("/api/jobpostings/{user_id}/applicant-counts")
+def get_applicant_counts(user_id: str):
+    postings = db.get_applicant_counts(user_id)
+    return summarize_applicant_counts(postings)
+
 @app.post("/api/jobpostings")
-async def create_job_posting(posting: JobPostingCreate):
+def create_job_posting(posting: JobPostingCreate):
     deadline = datetime.strptime(posting.deadline, "%Y-%m-%d").date()
     
     errors = validate_job_posting_data(
@@ -179,7 +413,7 @@ async def create_job_posting(posting: JobPostingCreate):
     return new_posting
 
 @app.put("/api/jobpostings/{job_id}")
-async def update_job_posting(job_id: int, status: str):
+def update_job_posting(job_id: int, status: str):
     if status not in ['active', 'closed']:
         raise HTTPException(status_code=400, detail="Invalid status")
     
@@ -189,7 +423,7 @@ async def update_job_posting(job_id: int, status: str):
     return updated
 
 @app.delete("/api/jobpostings/{job_id}")
-async def delete_job_posting(job_id: int):
+def delete_job_posting(job_id: int):
     success = db.delete_job_posting(job_id)
     if not success:
         raise HTTPException(status_code=404, detail="Job posting not found")
@@ -197,11 +431,248 @@ async def delete_job_posting(job_id: int):
 
 # Analytics endpoints
 @app.get("/api/analytics/{user_id}")
-async def get_analytics(user_id: str):
-    applications = db.get_applications(user_id)
+def get_analytics(user_id: str):
+    applications = db.get_applications(user_id, ["status"])
     stats = get_application_stats(applications)
     return stats
 
+@app.get("/api/analytics/{user_id}/timeline")
+def get_analytics_timeline(
+    user_id: str,
+    bucket: str = "day",
+    start_date: Optional[date] = Query(None, alias="from"),
+    end_date: Optional[date] = Query(None, alias="to")
+):
+    if bucket not in ['day', 'week', 'month']:
+        raise HTTPException(status_code=400, detail="Invalid bucket")
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    
+    series = db.get_application_timeline(user_id, bucket, start_date, end_date)
+    return {"bucket": bucket, "series": series}
+
+@app.get("/api/analytics/provider/{user_id}")
+async def get_provider_analytics(user_id: str, days: int = 90, top: int = 10):
+    if days < 1 or top < 1:
+        raise HTTPException(status_code=400, detail="'days' and 'top' must be positive")
+    
+    rollups, daily = await gather_in_threads(
+        lambda: db.get_provider_rollups(user_id),
+        lambda: db.get_provider_daily_applicants(user_id, datetime.now().date() - timedelta(days=days))
+    )
+    
+    ranked = sorted(rollups, key=lambda row: row.get('total', 0), reverse=True)
+    most_applied = [
+        {
+            "job_posting_id": row['job_posting_id'],
+            "title": (row.get('job_postings') or {}).get('title', 'Unknown Job'),
+            "applicants": row.get('total', 0)
+        }
+        for row in ranked[:top]
+        if row.get('total', 0) > 0
+    ]
+    
+    return {
+        "funnel": get_provider_funnel(rollups),
+        "most_applied": most_applied,
+        "daily_applicants": daily
+    }
+
+# Dashboard endpoints: everything a home screen needs in one response
+DASHBOARD_APPLICATION_FIELDS = ["id", "company", "role", "status", "applied_date", "job_posting_id"]
+DASHBOARD_POSTING_FIELDS = ["id", "title", "status", "deadline", "created_at"]
+
+@app.get("/api/dashboard/{user_id}")
+async def get_dashboard(user_id: str, offset: int = 0, limit: int = 50):
+    validate_page(offset, limit)
+    
+    # The database pages, counts and pre-filters, so only what is shown is transferred
+    profile, page, counts, candidates = await gather_in_threads(
+        lambda: db.get_user_profile(user_id),
+        lambda: db.get_application_page(user_id, DASHBOARD_APPLICATION_FIELDS, offset, limit),
+        lambda: db.get_application_status_counts(user_id),
+        lambda: db.get_followup_candidates(user_id, DASHBOARD_APPLICATION_FIELDS, older_than_days=3)
+    )
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    return {
+        "profile": profile,
+        "applications": page_of(page, offset, limit),
+        "stats": get_application_stats_from_counts(counts),
+        "followups": get_followups(candidates)
+    }
+
+@app.get("/api/dashboard/provider/{user_id}")
+async def get_provider_dashboard(user_id: str, offset: int = 0, limit: int = 50):
+    validate_page(offset, limit)
+    
+    # The rollups hold per-posting status counts, so they give both the counts and the funnel
+    profile, page, rollups = await gather_in_threads(
+        lambda: db.get_user_profile(user_id),
+        lambda: db.get_job_posting_page(user_id, DASHBOARD_POSTING_FIELDS, offset, limit),
+        lambda: db.get_provider_rollups(user_id)
+    )
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    counts = {
+        row['job_posting_id']: {status: row.get(status, 0) for status in ("total", "applied", "interview", "offer", "rejected")}
+        for row in rollups
+        if row.get('total', 0) > 0
+    }
+    return {
+        "profile": profile,
+        "postings": page_of(page, offset, limit),
+        "applicant_counts": summarize_applicant_counts(counts),
+        "funnel": get_provider_funnel(rollups)
+    }
+
+# Batch endpoint: many operations in one HTTP exchange
+BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", "100"))
+BATCH_METHODS = {"GET", "POST", "PUT", "DELETE"}
+# Set on every sub-request; a batch that arrives with it is nested and rejected
+BATCH_DEPTH_HEADER = "X-Batch-Depth"
+
+def normalize_batch_path(path):
+    """The path a sub-request is routed to: percent-decoded and with dot segments resolved"""
+    parts = urlsplit(path)
+    decoded = parts.path
+    # Until stable, so double-encoded segments can't slip through either
+    while unquote(decoded) != decoded:
+        decoded = unquote(decoded)
+    normalized = posixpath.normpath(decoded) if decoded else decoded
+    return normalized + (f"?{parts.query}" if parts.query else "")
+
+async def run_batch_operation(client, operation, path):
+    try:
+        response = await client.request(
+            operation.method.upper(), path,
+            params=operation.params, json=operation.body
+        )
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        return {"id": operation.id, "status": response.status_code, "body": body}
+    except Exception as e:
+        return {"id": operation.id, "status": 500, "body": {"detail": str(e)}}
+
+@app.post("/api/batch")
+async def run_batch(batch: BatchRequest, request: Request):
+    if request.headers.get(BATCH_DEPTH_HEADER):
+        raise HTTPException(status_code=400, detail="Batches cannot be nested")
+    if len(batch.operations) > BATCH_MAX_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_OPERATIONS} operations per batch")
+    batch_path = app.url_path_for("run_batch")
+    paths = []
+    for index, operation in enumerate(batch.operations):
+        if operation.method.upper() not in BATCH_METHODS:
+            raise HTTPException(status_code=400, detail=f"Operation {index}: unsupported method {operation.method}")
+        # Checked and dispatched in normalized form, so "/api/./batch" or "/api/%62atch" can't recurse
+        path = normalize_batch_path(operation.path)
+        route = urlsplit(path).path
+        if not route.startswith("/api/") or route == batch_path or route.startswith(batch_path + "/"):
+            raise HTTPException(status_code=400, detail=f"Operation {index}: path must be an /api/ route other than /api/batch")
+        paths.append(path)
+    
+    # Sub-operations go through the app itself, so routing, validation and errors match single calls
+    results = [None] * len(batch.operations)
+    transport = httpx.ASGITransport(app=app)
+    # One session for every operation, so reads after a write in the batch are pinned to the primary
+    headers = {"X-Session-Id": request.headers.get("x-session-id") or uuid.uuid4().hex, BATCH_DEPTH_HEADER: "1"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://batch", headers=headers) as client:
+        index = 0
+        while index < len(batch.operations):
+            operation = batch.operations[index]
+            if operation.method.upper() == "GET":
+                # Consecutive reads run concurrently; a write is a barrier so later reads see it
+                end = index
+                while end < len(batch.operations) and batch.operations[end].method.upper() == "GET":
+                    end += 1
+                group = await asyncio.gather(*(
+                    run_batch_operation(client, batch.operations[position], paths[position])
+                    for position in range(index, end)
+                ))
+                results[index:end] = group
+            else:
+                end = index + 1
+                results[index] = await run_batch_operation(client, operation, paths[index])
+            
+            if batch.stop_on_error and any(result["status"] >= 400 for result in results[index:end]):
+                for skipped in range(end, len(batch.operations)):
+                    results[skipped] = {"id": batch.operations[skipped].id, "status": 424, "body": {"detail": "Skipped after an earlier error"}}
+                break
+            index = end
+    
+    return {
+        "results": results,
+        "succeeded": sum(1 for result in results if result["status"] < 400),
+        "failed": sum(1 for result in results if result["status"] >= 400)
+    }
+
+# Recommendation endpoints
+@app.get("/api/recommendations/{user_id}")
+def get_recommendations(user_id: str, k: int = 10):
+    if k < 1 or k > 100:
+        raise HTTPException(status_code=400, detail="'k' must be between 1 and 100")
+    
+    ranked = recommendations.recommend_for_user(user_id, k)
+    return [{"job_posting_id": job_id, "score": score} for job_id, score in ranked]
+
+# Export endpoints (Parquet or Arrow IPC, streamed one page / row group at a time)
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "5000"))
+
+def export_response(name, pages, schema, to_rows, format):
+    if format not in export.FORMATS:
+        raise HTTPException(status_code=400, detail=f"'format' must be one of {sorted(export.FORMATS)}")
+    media_type, extension = export.FORMATS[format]
+    return StreamingResponse(
+        export.stream_export(pages, schema, to_rows, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}{extension}"'}
+    )
+
+@app.get("/api/export/provider/{user_id}/applicants")
+async def export_provider_applicants(user_id: str, format: str = "parquet"):
+    try:
+        schema = export.applicants_schema()
+    except export.ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    pages = db.iter_applicants_for_jobprovider(user_id, EXPORT_PAGE_SIZE)
+    return export_response(f"applicants-{user_id}", pages, schema, export.applicant_rows, format)
+
+@app.get("/api/export/applications/{user_id}")
+async def export_applications(user_id: str, format: str = "parquet", include_archived: bool = False):
+    try:
+        schema = export.applications_schema()
+    except export.ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    pages = db.iter_applications(user_id, EXPORT_PAGE_SIZE, include_archived)
+    return export_response(f"applications-{user_id}", pages, schema, export.application_rows, format)
+
+# Maintenance endpoints
+@app.get("/api/maintenance/deadline-sweeper")
+async def get_deadline_sweeper_stats():
+    stats = db.get_sweeper_stats()
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Deadline sweeper is not enabled")
+    return stats
+
+@app.get("/api/maintenance/backend")
+async def get_backend_health():
+    return db.get_backend_health()
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    
+    workers = int(os.getenv("API_WORKERS", "1"))
+    uvicorn.run(
+        # Multiple workers need an import string so each process loads the app
+        "main:app" if workers > 1 else app,
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host=os.getenv("API_HOST", "0.0.0.0"),
+        port=int(os.getenv("API_PORT", "8001")),
+        workers=workers,
+        timeout_graceful_shutdown=int(os.getenv("API_GRACEFUL_TIMEOUT", "30"))
+    )
\ No newline at end of file
@@ -0,0 +1,19 @@
+-- Applicant counts per job posting and application status for a job provider.
+-- Used by Database.get_applicant_counts so the provider dashboard does not have
+-- to download every applicant just to display counts.
+
+create index if not exists job_applications_job_posting_id_idx
+    on job_applications (job_posting_id);
+
+create or replace function applicant_counts_for_provider(p_provider_id uuid)
+returns table (job_posting_id bigint, status text, applicant_count bigint)
+language sql
+stable
+as $$
+    select ja.job_posting_id::bigint, a.status::text, count(*)::bigint
+    from job_postings jp
+    join job_applications ja on ja.job_posting_id = jp.id
+    join applications a on a.id = ja.application_id
+    where jp.user_id = p_provider_id
+    group by ja.job_posting_id, a.status;
+$$;
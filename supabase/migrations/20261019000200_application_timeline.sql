@@ -0,0 +1,25 @@
+-- Application counts per time bucket and status for a jobseeker.
+-- Used by Database.get_application_timeline so charts are built from a compact
+-- series instead of every application row.
+
+create index if not exists applications_user_id_applied_date_idx
+    on applications (user_id, applied_date);
+
+create or replace function application_timeline(
+    p_user_id uuid,
+    p_bucket text default 'day',
+    p_from date default null,
+    p_to date default null
+)
+returns table (bucket date, status text, application_count bigint)
+language sql
+stable
+as $$
+    select date_trunc(p_bucket, a.applied_date)::date, a.status::text, count(*)::bigint
+    from applications a
+    where a.user_id = p_user_id
+      and (p_from is null or a.applied_date >= p_from)
+      and (p_to is null or a.applied_date <= p_to)
+    group by 1, 2
+    order by 1, 2;
+$$;
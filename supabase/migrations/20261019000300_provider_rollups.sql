@@ -0,0 +1,198 @@
+-- Per-posting applicant rollups for provider analytics.
+-- posting_applicant_rollups holds applicant counts per posting and status, and
+-- posting_daily_applicants holds new applicants per posting per day. Both are
+-- kept current incrementally by triggers on job_applications and applications,
+-- so provider analytics never scan the raw application tables.
+
+create table if not exists posting_applicant_rollups (
+    job_posting_id bigint primary key references job_postings (id) on delete cascade,
+    provider_id uuid not null,
+    total bigint not null default 0,
+    applied bigint not null default 0,
+    interview bigint not null default 0,
+    offer bigint not null default 0,
+    rejected bigint not null default 0,
+    updated_at timestamptz not null default now()
+);
+
+create index if not exists posting_applicant_rollups_provider_id_idx
+    on posting_applicant_rollups (provider_id);
+
+create table if not exists posting_daily_applicants (
+    job_posting_id bigint not null references job_postings (id) on delete cascade,
+    provider_id uuid not null,
+    day date not null,
+    applicant_count bigint not null default 0,
+    primary key (job_posting_id, day)
+);
+
+create index if not exists posting_daily_applicants_provider_id_day_idx
+    on posting_daily_applicants (provider_id, day);
+
+create or replace function bump_posting_rollup(
+    p_job_posting_id bigint,
+    p_status text,
+    p_status_delta bigint,
+    p_total_delta bigint
+)
+returns void
+language sql
+as $$
+    insert into posting_applicant_rollups as r
+        (job_posting_id, provider_id, total, applied, interview, offer, rejected)
+    select jp.id,
+           jp.user_id,
+           p_total_delta,
+           case when p_status = 'applied' then p_status_delta else 0 end,
+           case when p_status = 'interview' then p_status_delta else 0 end,
+           case when p_status = 'offer' then p_status_delta else 0 end,
+           case when p_status = 'rejected' then p_status_delta else 0 end
+    from job_postings jp
+    where jp.id = p_job_posting_id
+    on conflict (job_posting_id) do update set
+        total = r.total + excluded.total,
+        applied = r.applied + excluded.applied,
+        interview = r.interview + excluded.interview,
+        offer = r.offer + excluded.offer,
+        rejected = r.rejected + excluded.rejected,
+        updated_at = now();
+$$;
+
+create or replace function bump_posting_daily_applicants(
+    p_job_posting_id bigint,
+    p_day date,
+    p_delta bigint
+)
+returns void
+language sql
+as $$
+    insert into posting_daily_applicants as d (job_posting_id, provider_id, day, applicant_count)
+    select jp.id, jp.user_id, p_day, p_delta
+    from job_postings jp
+    where jp.id = p_job_posting_id
+    on conflict (job_posting_id, day) do update set
+        applicant_count = d.applicant_count + excluded.applicant_count;
+$$;
+
+create or replace function job_applications_rollup_trigger()
+returns trigger
+language plpgsql
+as $$
+declare
+    v_status text;
+begin
+    if tg_op = 'INSERT' then
+        select status into v_status from applications where id = new.application_id;
+        perform bump_posting_rollup(new.job_posting_id, coalesce(v_status, 'applied'), 1, 1);
+        perform bump_posting_daily_applicants(
+            new.job_posting_id, coalesce(new.applied_at, now())::date, 1
+        );
+        return new;
+    end if;
+
+    -- When the application itself is being deleted its BEFORE DELETE trigger
+    -- has already decremented the rollups, so only direct unlinks count here.
+    select status into v_status from applications where id = old.application_id;
+    if found then
+        perform bump_posting_rollup(old.job_posting_id, v_status, -1, -1);
+        perform bump_posting_daily_applicants(
+            old.job_posting_id, coalesce(old.applied_at, now())::date, -1
+        );
+    end if;
+    return old;
+end;
+$$;
+
+create or replace function applications_rollup_trigger()
+returns trigger
+language plpgsql
+as $$
+declare
+    v_link record;
+begin
+    if tg_op = 'UPDATE' then
+        for v_link in
+            select job_posting_id from job_applications where application_id = new.id
+        loop
+            perform bump_posting_rollup(v_link.job_posting_id, old.status, -1, 0);
+            perform bump_posting_rollup(v_link.job_posting_id, new.status, 1, 0);
+        end loop;
+        return new;
+    end if;
+
+    for v_link in
+        select job_posting_id, applied_at from job_applications where application_id = old.id
+    loop
+        perform bump_posting_rollup(v_link.job_posting_id, old.status, -1, -1);
+        perform bump_posting_daily_applicants(
+            v_link.job_posting_id, coalesce(v_link.applied_at, now())::date, -1
+        );
+    end loop;
+    return old;
+end;
+$$;
+
+drop trigger if exists job_applications_rollup on job_applications;
+create trigger job_applications_rollup
+    after insert or delete on job_applications
+    for each row execute function job_applications_rollup_trigger();
+
+drop trigger if exists applications_status_rollup on applications;
+create trigger applications_status_rollup
+    after update of status on applications
+    for each row
+    when (old.status is distinct from new.status)
+    execute function applications_rollup_trigger();
+
+drop trigger if exists applications_delete_rollup on applications;
+create trigger applications_delete_rollup
+    before delete on applications
+    for each row execute function applications_rollup_trigger();
+
+-- Backfill from existing data
+insert into posting_applicant_rollups
+    (job_posting_id, provider_id, total, applied, interview, offer, rejected)
+select jp.id,
+       jp.user_id,
+       count(*),
+       count(*) filter (where a.status = 'applied'),
+       count(*) filter (where a.status = 'interview'),
+       count(*) filter (where a.status = 'offer'),
+       count(*) filter (where a.status = 'rejected')
+from job_postings jp
+join job_applications ja on ja.job_posting_id = jp.id
+join applications a on a.id = ja.application_id
+group by jp.id, jp.user_id
+on conflict (job_posting_id) do update set
+    total = excluded.total,
+    applied = excluded.applied,
+    interview = excluded.interview,
+    offer = excluded.offer,
+    rejected = excluded.rejected,
+    updated_at = now();
+
+insert into posting_daily_applicants (job_posting_id, provider_id, day, applicant_count)
+select jp.id, jp.user_id, coalesce(ja.applied_at, now())::date, count(*)
+from job_postings jp
+join job_applications ja on ja.job_posting_id = jp.id
+group by 1, 2, 3
+on conflict (job_posting_id, day) do update set
+    applicant_count = excluded.applicant_count;
+
+-- Serve the per-posting applicant counts from the rollups as well
+create or replace function applicant_counts_for_provider(p_provider_id uuid)
+returns table (job_posting_id bigint, status text, applicant_count bigint)
+language sql
+stable
+as $$
+    select r.job_posting_id, s.status, s.applicant_count
+    from posting_applicant_rollups r
+    cross join lateral (
+        values ('applied', r.applied),
+               ('interview', r.interview),
+               ('offer', r.offer),
+               ('rejected', r.rejected)
+    ) as s (status, applicant_count)
+    where r.provider_id = p_provider_id
+      and s.applicant_count > 0;
+$$;
@@ -0,0 +1,30 @@
+-- Applications created from a job posting reference the posting instead of
+-- copying its description. Only the cover letter is kept in notes; company and
+-- role stay as a small snapshot, so the application survives the posting.
+
+alter table applications
+    add column if not exists job_posting_id bigint
+    references job_postings (id) on delete set null;
+
+create index if not exists applications_job_posting_id_idx
+    on applications (job_posting_id);
+
+alter table applications alter column company drop not null;
+alter table applications alter column role drop not null;
+
+-- Backfill references from the existing job_applications links
+update applications a
+set job_posting_id = ja.job_posting_id
+from job_applications ja
+where ja.application_id = a.id
+  and a.job_posting_id is null;
+
+-- Drop the copied posting description, keeping only the cover letter
+update applications
+set notes = case
+        when position(E'\nCover Letter: ' in notes) > 0
+            then substring(notes from position(E'\nCover Letter: ' in notes) + length(E'\nCover Letter: '))
+        else null
+    end
+where job_posting_id is not null
+  and notes like 'Applied to: %';
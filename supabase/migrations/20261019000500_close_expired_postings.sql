@@ -0,0 +1,30 @@
+-- Close active job postings whose deadline has passed, in bounded batches.
+-- Called on a schedule by the deadline sweeper (Front-End/sweeper.py) through
+-- Database.close_expired_job_postings.
+
+-- Serves both the sweeper's "active and past deadline" scan and the job
+-- board's "active and not yet past deadline" listing
+create index if not exists job_postings_status_deadline_idx
+    on job_postings (status, deadline);
+
+create or replace function close_expired_job_postings(p_today date, p_batch_size integer default 500)
+returns table (id bigint, user_id uuid)
+language sql
+volatile
+as $$
+    with expired as (
+        select jp.id
+        from job_postings jp
+        where jp.status = 'active'
+          and jp.deadline < p_today
+        order by jp.deadline
+        limit p_batch_size
+        -- Concurrent sweepers (one per API worker) take disjoint batches
+        for update skip locked
+    )
+    update job_postings jp
+    set status = 'closed'
+    from expired
+    where jp.id = expired.id
+    returning jp.id::bigint, jp.user_id;
+$$;
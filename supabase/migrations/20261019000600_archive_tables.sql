@@ -0,0 +1,130 @@
+-- Cold storage for old applications and job postings.
+-- archive_applications and archive_job_postings move rows out of the hot tables
+-- in bounded batches (see Front-End/archive.py). Archived rows keep their IDs and
+-- remain readable through the include_archived option on the list endpoints.
+--
+-- Moving an application also moves its job_applications link, and the rollup
+-- triggers subtract it, so provider analytics cover live applications only.
+
+create table if not exists applications_archive (
+    like applications including defaults,
+    archived_at timestamptz not null default now(),
+    primary key (id)
+);
+
+create index if not exists applications_archive_user_id_idx
+    on applications_archive (user_id);
+
+create table if not exists job_applications_archive (
+    like job_applications including defaults,
+    archived_at timestamptz not null default now(),
+    primary key (id)
+);
+
+create index if not exists job_applications_archive_job_posting_id_idx
+    on job_applications_archive (job_posting_id);
+
+create table if not exists job_postings_archive (
+    like job_postings including defaults,
+    archived_at timestamptz not null default now(),
+    primary key (id)
+);
+
+create index if not exists job_postings_archive_user_id_idx
+    on job_postings_archive (user_id);
+
+-- Lets archived postings embed the poster's profile like live ones
+do $$
+begin
+    if not exists (
+        select 1 from pg_constraint where conname = 'job_postings_archive_user_id_fkey'
+    ) then
+        alter table job_postings_archive
+            add constraint job_postings_archive_user_id_fkey
+            foreign key (user_id) references profiles (id) on delete cascade;
+    end if;
+end;
+$$;
+
+-- Used to find old applications per status without scanning the whole table
+create index if not exists applications_status_applied_date_idx
+    on applications (status, applied_date);
+
+create or replace function archive_applications(
+    p_status text,
+    p_before date,
+    p_batch_size integer default 500
+)
+returns table (id bigint)
+language plpgsql
+volatile
+as $$
+declare
+    v_ids bigint[];
+begin
+    select array_agg(a.id) into v_ids
+    from (
+        select a.id
+        from applications a
+        where a.status = p_status
+          and a.applied_date < p_before
+        order by a.applied_date
+        limit p_batch_size
+        for update skip locked
+    ) a;
+
+    if v_ids is null then
+        return;
+    end if;
+
+    with moved as (
+        delete from job_applications ja
+        where ja.application_id = any (v_ids)
+        returning ja.*
+    )
+    insert into job_applications_archive
+    select moved.*, now() from moved;
+
+    return query
+    with moved as (
+        delete from applications a
+        where a.id = any (v_ids)
+        returning a.*
+    )
+    insert into applications_archive
+    select moved.*, now() from moved
+    returning applications_archive.id::bigint;
+end;
+$$;
+
+create or replace function archive_job_postings(
+    p_before date,
+    p_batch_size integer default 500
+)
+returns table (id bigint)
+language sql
+volatile
+as $$
+    -- Only postings no live application still points at, so hydration of
+    -- hot applications never needs the archive
+    with expired as (
+        select jp.id
+        from job_postings jp
+        where jp.status = 'closed'
+          and jp.deadline < p_before
+          and not exists (select 1 from applications a where a.job_posting_id = jp.id)
+          and not exists (select 1 from job_applications ja where ja.job_posting_id = jp.id)
+        order by jp.deadline
+        limit p_batch_size
+        for update skip locked
+    ),
+    moved as (
+        delete from job_postings jp
+        using expired
+        where jp.id = expired.id
+        returning jp.*
+    )
+    insert into job_postings_archive
+    select moved.*, now() from moved
+    returning job_postings_archive.id::bigint;
+$$;
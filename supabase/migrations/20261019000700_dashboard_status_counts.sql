@@ -0,0 +1,32 @@
+-- Per-status counts behind the dashboard header metrics.
+-- Used by Database.get_application_status_counts and
+-- Database.get_job_posting_counts so the header does not have to load every
+-- application or posting just to count them.
+
+create index if not exists applications_user_id_status_idx
+    on applications (user_id, status);
+
+create index if not exists job_postings_user_id_status_idx
+    on job_postings (user_id, status);
+
+create or replace function application_status_counts(p_user_id uuid)
+returns table (status text, application_count bigint)
+language sql
+stable
+as $$
+    select a.status::text, count(*)::bigint
+    from applications a
+    where a.user_id = p_user_id
+    group by a.status;
+$$;
+
+create or replace function job_posting_status_counts(p_provider_id uuid)
+returns table (status text, posting_count bigint)
+language sql
+stable
+as $$
+    select jp.status::text, count(*)::bigint
+    from job_postings jp
+    where jp.user_id = p_provider_id
+    group by jp.status;
+$$;
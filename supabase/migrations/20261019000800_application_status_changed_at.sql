@@ -0,0 +1,97 @@
+-- Age applications for archiving by when their status last changed, not by
+-- when they were submitted. An application rejected yesterday after months of
+-- interviews is recent, however old its applied_date.
+
+alter table applications
+    add column if not exists status_changed_at timestamptz;
+
+alter table applications_archive
+    add column if not exists status_changed_at timestamptz;
+
+-- Backfill: when existing rows last changed status is unknown, so archive ageing
+-- starts from this migration. Their applied_date would archive an application
+-- rejected yesterday on the next run.
+update applications
+set status_changed_at = now()
+where status_changed_at is null;
+
+-- Archived rows are never aged again; their archiving time is the closest known value
+update applications_archive
+set status_changed_at = archived_at
+where status_changed_at is null;
+
+alter table applications
+    alter column status_changed_at set default now(),
+    alter column status_changed_at set not null;
+
+create or replace function applications_status_changed_at_trigger()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.status_changed_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists applications_status_changed_at on applications;
+create trigger applications_status_changed_at
+    before update of status on applications
+    for each row
+    when (old.status is distinct from new.status)
+    execute function applications_status_changed_at_trigger();
+
+-- Replaces the applied_date index from the archive tables migration
+drop index if exists applications_status_applied_date_idx;
+create index if not exists applications_status_changed_at_idx
+    on applications (status, status_changed_at);
+
+create or replace function archive_applications(
+    p_status text,
+    p_before date,
+    p_batch_size integer default 500
+)
+returns table (id bigint)
+language plpgsql
+volatile
+as $$
+declare
+    v_ids bigint[];
+begin
+    select array_agg(a.id) into v_ids
+    from (
+        select a.id
+        from applications a
+        where a.status = p_status
+          and a.status_changed_at < p_before
+        order by a.status_changed_at
+        limit p_batch_size
+        for update skip locked
+    ) a;
+
+    if v_ids is null then
+        return;
+    end if;
+
+    with moved as (
+        delete from job_applications ja
+        where ja.application_id = any (v_ids)
+        returning ja.*
+    )
+    insert into job_applications_archive
+    select moved.*, now() from moved;
+
+    -- By column name: status_changed_at comes after archived_at in the archive
+    return query
+    with moved as (
+        delete from applications a
+        where a.id = any (v_ids)
+        returning a.*
+    )
+    insert into applications_archive
+    select archived.*
+    from moved,
+         jsonb_populate_record(null::applications_archive, to_jsonb(moved) || jsonb_build_object('archived_at', now())) archived
+    returning applications_archive.id::bigint;
+end;
+$$;
@@ -0,0 +1,24 @@
+-- Restore the company/role snapshot on applications made through a job posting.
+-- An earlier version of the posting reference migration cleared them, so those
+-- applications showed no company or role once their posting was deleted. New
+-- applications store the snapshot when they are created (Database.apply_to_job).
+
+update applications a
+set company = coalesce(a.company, p.username),
+    role = coalesce(a.role, jp.title)
+from job_postings jp
+left join profiles p on p.id = jp.user_id
+where a.job_posting_id = jp.id
+  and (a.company is null or a.role is null);
+
+update applications_archive a
+set company = coalesce(a.company, p.username),
+    role = coalesce(a.role, jp.title)
+from (
+    select id, user_id, title from job_postings
+    union all
+    select id, user_id, title from job_postings_archive
+) jp
+left join profiles p on p.id = jp.user_id
+where a.job_posting_id = jp.id
+  and (a.company is null or a.role is null);
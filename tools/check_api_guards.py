@@ -0,0 +1,71 @@
+"""Check that the API rejects requests it must not serve.
+
+Runs the API in-process against the stand-in backend and sends each case in
+CASES, comparing the response status with the expected one:
+
+    python tools/check_api_guards.py
+
+Exits 1 when any case gets a different status.
+"""
+import asyncio
+import sys
+import tempfile
+
+import httpx
+
+from loadgen import build_app
+from standin import StandInStore
+from synthetic import generate
+
+def batch(*paths, headers=None):
+    """A POST /api/batch case with one GET per path"""
+    return ("POST", "/api/batch", None, {"operations": [{"method": "GET", "path": path} for path in paths]}, headers)
+
+def cases(dataset):
+    seeker = dataset.seeker_ids[0]
+    application = dataset.applications_by_seeker[seeker][0]
+    # (name, (method, path, params, body, headers), expected status)
+    return [
+        ("batch of plain reads", batch(f"/api/profile/{seeker}"), 200),
+        ("batch nesting /api/batch", batch("/api/batch"), 400),
+        ("batch nesting /api/./batch", batch("/api/./batch"), 400),
+        ("batch nesting /api/x/../batch", batch("/api/x/../batch"), 400),
+        ("batch nesting /api/%62atch", batch("/api/%62atch"), 400),
+        ("batch nesting /api/%2562atch", batch("/api/%2562atch"), 400),
+        ("batch escaping /api/", batch("/api/../healthz"), 400),
+        ("batch sent as a sub-request", batch(f"/api/profile/{seeker}", headers={"X-Batch-Depth": "1"}), 400),
+        # ?fields= only accepts the endpoint's columns
+        ("known fields", ("GET", f"/api/applications/{seeker}", {"fields": "id,status"}, None, None), 200),
+        ("misspelled field", ("GET", f"/api/applications/{seeker}", {"fields": "id,stauts"}, None, None), 400),
+        ("field of another table", ("GET", f"/api/jobpostings/{dataset.provider_ids[0]}", {"fields": "id,company"}, None, None), 400),
+        # Status updates are queued (write-behind), but only valid ones for existing applications
+        ("status update", ("PUT", f"/api/applications/{application}", None, {"status": "interview"}, None), 200),
+        ("status update to an unknown status", ("PUT", f"/api/applications/{application}", None, {"status": "hired"}, None), 422),
+        ("status update to a missing application", ("PUT", "/api/applications/999999999", None, {"status": "offer"}, None), 404),
+    ]
+
+async def check():
+    store = StandInStore()
+    dataset = generate(store, seekers=5, providers=2, postings_per_provider=2, applications_per_seeker=2, seed=7)
+    app = build_app(store)
+    import main
+    main.db.enable_write_behind(journal_dir=tempfile.mkdtemp())
+    
+    failures = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://check") as client:
+        for name, (method, path, params, body, headers), expected in cases(dataset):
+            response = await client.request(method, path, params=params, json=body, headers=headers)
+            ok = response.status_code == expected
+            if not ok:
+                failures.append(name)
+            print(f"{'ok' if ok else 'FAIL':>4} | {name:<40} | HTTP {response.status_code} (expected {expected})")
+    main.db.close()
+    
+    if failures:
+        print(f"{len(failures)} guard(s) failed: {', '.join(failures)}")
+        return False
+    print("All guards held")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(check()) else 1)
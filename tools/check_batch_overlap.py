@@ -0,0 +1,53 @@
+"""Check that the reads in a POST /api/batch request overlap instead of queueing.
+
+Runs the API in-process against the stand-in backend with a fixed latency per
+backend call, then times one GET on its own and a batch of several GETs. If the
+reads ran one after another, the batch would take about BATCH_SIZE times as long
+as the single GET:
+
+    python tools/check_batch_overlap.py
+
+Exits 1 when the batch takes more than MAX_SLOWDOWN times the single GET.
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+
+from loadgen import build_app
+from standin import StandInClient, StandInStore
+from synthetic import generate
+
+LATENCY = 0.2
+BATCH_SIZE = 5
+MAX_SLOWDOWN = 2.0
+
+async def timed(client, method, path, **kwargs):
+    started = time.perf_counter()
+    response = await client.request(method, path, **kwargs)
+    response.raise_for_status()
+    return time.perf_counter() - started, response.json()
+
+async def check():
+    store = StandInStore()
+    dataset = generate(store, seekers=20, providers=3, postings_per_provider=3, applications_per_seeker=3, seed=7)
+    app = build_app(store)
+    # Slow every backend call down, so queueing shows up as wall-clock time
+    import main
+    from db import Database
+    main.db = Database(client=StandInClient(store, latency=LATENCY))
+    
+    seekers = dataset.seeker_ids[:BATCH_SIZE]
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://check", timeout=60) as client:
+        single, _ = await timed(client, "GET", f"/api/profile/{seekers[0]}")
+        operations = [{"method": "GET", "path": f"/api/profile/{seeker}", "id": seeker} for seeker in seekers]
+        batch, body = await timed(client, "POST", "/api/batch", json={"operations": operations})
+    
+    ok = body["failed"] == 0 and batch <= single * MAX_SLOWDOWN
+    print(f"{'ok' if ok else 'FAIL'} | 1 GET {single:.2f}s | batch of {BATCH_SIZE} GETs {batch:.2f}s "
+          f"(limit {single * MAX_SLOWDOWN:.2f}s) | {body['failed']} failed")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(check()) else 1)
@@ -0,0 +1,189 @@
+"""Round-trip budgets for Database methods and API routes.
+
+Seeds the in-memory stand-in backend, runs each case under count_round_trips()
+and fails if any of them talks to the backend more often than its pinned budget.
+A budget that starts scaling with the number of rows (an N+1 loop) shows up
+here long before it shows up in production latency.
+
+    python tools/check_round_trips.py
+
+Exits 1 when a budget is exceeded. When a change legitimately needs another
+round trip, raise the budget in BUDGETS in the same commit.
+"""
+import asyncio
+import sys
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import httpx
+
+from loadgen import build_app
+from standin import StandInClient, StandInStore
+from synthetic import generate
+
+from db import Database
+from roundtrips import RoundTripBudgetExceeded, assert_max_round_trips
+
+# (name, budget) - budgets are per call, independent of data volume
+BUDGETS = {
+    "db.get_user_profile": 1,
+    "db.get_user_profiles": 1,
+    "db.get_applications": 1,
+    "db.get_applications(company,role)": 2,
+    "db.search_applications": 3,
+    "db.get_job_postings": 1,
+    "db.get_applicants_for_job": 1,
+    "db.get_applicants_for_jobprovider": 1,
+    "db.get_applicant_counts": 1,
+    "db.get_application_status_counts": 1,
+    "db.get_job_posting_counts": 1,
+    "db.apply_to_job": 3,
+    "GET /api/profile/{id}": 1,
+    "POST /api/profile": 1,
+    "GET /api/applications/{id}": 2,
+    "POST /api/applications": 1,
+    "PUT /api/applications/{id}": 1,
+    "DELETE /api/applications/{id}": 1,
+    "GET /api/jobpostings/{id}": 1,
+    "GET /api/jobpostings/{id}/applicant-counts": 1,
+    "POST /api/jobpostings": 1,
+    "PUT /api/jobpostings/{id}": 1,
+    "DELETE /api/jobpostings/{id}": 1,
+    "GET /api/analytics/{id}": 1,
+    "GET /api/analytics/{id}/timeline": 1,
+    "GET /api/analytics/provider/{id}": 2,
+    "GET /api/recommendations/{id}": 4,
+    # Profile, page, status counts and follow-up candidates, plus posting summaries for each list
+    "GET /api/dashboard/{id}": 6,
+    "GET /api/dashboard/provider/{id}": 3,
+    # The sum of its operations' budgets (GET profile, PUT application, GET applications)
+    "POST /api/batch": 3,
+    # One page of EXPORT_PAGE_SIZE rows at these data volumes
+    "GET /api/export/applications/{id}": 1,
+    "GET /api/export/provider/{id}/applicants": 1,
+    "GET /api/maintenance/deadline-sweeper": 0,
+    "GET /api/maintenance/backend": 0,
+}
+
+def db_cases(db, dataset):
+    seeker = dataset.seeker_ids[0]
+    provider = dataset.provider_ids[0]
+    posting = dataset.postings_by_provider[provider][0]
+    open_posting = dataset.postings_by_provider[provider][-1]
+    return [
+        ("db.get_user_profile", lambda: db.get_user_profile(seeker)),
+        ("db.get_user_profiles", lambda: db.get_user_profiles(dataset.seeker_ids[:50] + dataset.provider_ids[:10])),
+        ("db.get_applications", lambda: db.get_applications(seeker, fields=["id", "status", "applied_date"])),
+        ("db.get_applications(company,role)", lambda: db.get_applications(seeker, fields=["id", "company", "role", "status"])),
+        ("db.search_applications", lambda: db.search_applications(seeker, "engineer")),
+        ("db.get_job_postings", lambda: db.get_job_postings(provider)),
+        ("db.get_applicants_for_job", lambda: db.get_applicants_for_job(posting)),
+        ("db.get_applicants_for_jobprovider", lambda: db.get_applicants_for_jobprovider(provider)),
+        ("db.get_applicant_counts", lambda: db.get_applicant_counts(provider)),
+        ("db.get_application_status_counts", lambda: db.get_application_status_counts(seeker)),
+        ("db.get_job_posting_counts", lambda: db.get_job_posting_counts(provider)),
+        ("db.apply_to_job", lambda: db.apply_to_job(dataset.seeker_ids[-1], open_posting, "Hello")),
+    ]
+
+def api_cases(dataset):
+    seeker = dataset.seeker_ids[0]
+    provider = dataset.provider_ids[0]
+    application = dataset.applications_by_seeker[seeker][0]
+    postings = dataset.postings_by_provider[provider]
+    new_user = str(uuid.uuid4())
+    return [
+        ("GET /api/profile/{id}", "GET", f"/api/profile/{seeker}", None, None),
+        ("POST /api/profile", "POST", "/api/profile", None,
+         {"id": new_user, "username": f"user-{new_user[:8]}", "email": f"{new_user[:8]}@example.com", "role": "jobseeker"}),
+        ("GET /api/applications/{id}", "GET", f"/api/applications/{seeker}", {"fields": "id,company,role,status,applied_date"}, None),
+        ("POST /api/applications", "POST", "/api/applications", None,
+         {"user_id": seeker, "company": "Acme", "role": "Backend Engineer", "status": "applied"}),
+        ("PUT /api/applications/{id}", "PUT", f"/api/applications/{application}", None, {"status": "interview"}),
+        ("DELETE /api/applications/{id}", "DELETE", f"/api/applications/{dataset.applications_by_seeker[seeker][-1]}", None, None),
+        ("GET /api/jobpostings/{id}", "GET", f"/api/jobpostings/{provider}", {"fields": "id,title,status,deadline"}, None),
+        ("GET /api/jobpostings/{id}/applicant-counts", "GET", f"/api/jobpostings/{provider}/applicant-counts", None, None),
+        ("POST /api/jobpostings", "POST", "/api/jobpostings", None,
+         {"user_id": provider, "title": "Data Engineer", "description": "Build and run data pipelines",
+          "requirements": "Python, SQL", "deadline": (date.today() + timedelta(days=30)).isoformat()}),
+        ("PUT /api/jobpostings/{id}", "PUT", f"/api/jobpostings/{postings[0]}", {"status": "closed"}, None),
+        ("DELETE /api/jobpostings/{id}", "DELETE", f"/api/jobpostings/{postings[1]}", None, None),
+        ("GET /api/analytics/{id}", "GET", f"/api/analytics/{seeker}", None, None),
+        ("GET /api/analytics/{id}/timeline", "GET", f"/api/analytics/{seeker}/timeline",
+         {"bucket": "week", "from": (date.today() - timedelta(days=365)).isoformat()}, None),
+        ("GET /api/analytics/provider/{id}", "GET", f"/api/analytics/provider/{provider}", {"days": 90}, None),
+        ("GET /api/recommendations/{id}", "GET", f"/api/recommendations/{seeker}", {"k": 5}, None),
+        ("GET /api/dashboard/{id}", "GET", f"/api/dashboard/{seeker}", {"limit": 10}, None),
+        ("GET /api/dashboard/provider/{id}", "GET", f"/api/dashboard/provider/{provider}", {"limit": 10}, None),
+        ("POST /api/batch", "POST", "/api/batch", None, {"operations": [
+            {"method": "GET", "path": f"/api/profile/{seeker}"},
+            {"method": "PUT", "path": f"/api/applications/{application}", "body": {"status": "offer"}},
+            {"method": "GET", "path": f"/api/applications/{seeker}", "params": {"fields": "id,status"}},
+        ]}),
+        ("GET /api/export/applications/{id}", "GET", f"/api/export/applications/{seeker}", {"format": "arrow"}, None),
+        ("GET /api/export/provider/{id}/applicants", "GET", f"/api/export/provider/{provider}/applicants", {"format": "arrow"}, None),
+        ("GET /api/maintenance/deadline-sweeper", "GET", "/api/maintenance/deadline-sweeper", None, None),
+        ("GET /api/maintenance/backend", "GET", "/api/maintenance/backend", None, None),
+    ]
+
+@contextmanager
+def budget(name, failures):
+    """assert_max_round_trips for one case, reporting the outcome instead of raising
+    
+    The block can set result["status"] to an HTTP status; 4xx/5xx also fail the case.
+    """
+    result = {"status": None}
+    within = True
+    try:
+        with assert_max_round_trips(BUDGETS[name], name) as counter:
+            yield result
+    except RoundTripBudgetExceeded:
+        within = False
+    status = result["status"]
+    ok = within and (status is None or status < 400)
+    if not ok:
+        failures.append(name)
+    detail = ", ".join(f"{label} x{count}" for label, count in sorted(counter.summary().items()))
+    note = f" HTTP {status}" if status is not None and status >= 400 else ""
+    print(f"{'ok' if ok else 'FAIL':>4} | {name:<42} | {counter.count:>2} / {BUDGETS[name]:<2} | {detail}{note}")
+
+async def run_api_cases(app, dataset, failures):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budgets") as client:
+        for name, method, path, params, body in api_cases(dataset):
+            with budget(name, failures) as result:
+                response = await client.request(method, path, params=params, json=body)
+                result["status"] = response.status_code
+
+def main():
+    # Two data volumes: a budget that holds on both does not grow with row counts
+    failures = []
+    for scale in (1, 4):
+        store = StandInStore()
+        dataset = generate(
+            store, seekers=20 * scale, providers=3 * scale, postings_per_provider=5 * scale,
+            applications_per_seeker=5 * scale, seed=7,
+        )
+        print(f"-- {dataset.summary()}")
+        
+        db = Database(client=StandInClient(store))
+        for name, case in db_cases(db, dataset):
+            with budget(name, failures):
+                case()
+        
+        app = build_app(store)
+        import main as api
+        # So its stats route has something to report; sweeps run in their own thread, uncounted
+        api.db.enable_deadline_sweeper(interval=3600)
+        try:
+            asyncio.run(run_api_cases(app, dataset, failures))
+        finally:
+            api.db.close()
+    
+    if failures:
+        print(f"{len(failures)} round-trip budget(s) exceeded: {', '.join(sorted(set(failures)))}")
+        sys.exit(1)
+    print("All round-trip budgets held")
+
+if __name__ == "__main__":
+    main()
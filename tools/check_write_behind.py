@@ -0,0 +1,64 @@
+"""Check that the status write-behind queue retries only writes that can succeed.
+
+Queues status updates against the stand-in backend and flushes them through
+writes that fail in different ways:
+
+    python tools/check_write_behind.py
+
+Exits 1 when a transiently failed write is not re-queued, or a write the
+backend rejected is retried instead of dead-lettered.
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Front-End"))
+
+from standin import StandInClient, StandInStore
+from synthetic import generate
+
+from db import Database
+from resilience import BackendTimeout
+from write_behind import StatusWriteBehind
+
+def check():
+    store = StandInStore()
+    dataset = generate(store, seekers=2, providers=1, postings_per_provider=1, applications_per_seeker=2, seed=7)
+    db = Database(client=StandInClient(store))
+    first, second = dataset.application_ids[:2]
+    results = []
+    
+    # The backend rejects the status (check constraint): dropped after one attempt
+    queue = StatusWriteBehind(db._write_status_batch, journal_dir=tempfile.mkdtemp(), fsync=False)
+    queue.enqueue(first, "hired")
+    queue.flush()
+    queue.flush()
+    results.append((
+        "rejected write is dead-lettered",
+        queue.pending_count() == 0 and queue.dead_letters == 1 and os.path.exists(queue.dead_letter_path)
+    ))
+    
+    # The backend times out: kept and written on a later flush
+    attempts = []
+    def flaky(status, application_ids):
+        attempts.append(application_ids)
+        if len(attempts) == 1:
+            raise BackendTimeout("Backend call exceeded 10.0s")
+        db._write_status_batch(status, application_ids)
+    queue = StatusWriteBehind(flaky, journal_dir=tempfile.mkdtemp(), fsync=False)
+    queue.enqueue(second, "offer")
+    queue.flush()
+    requeued = queue.pending_status(second) == "offer"
+    queue.flush()
+    results.append((
+        "timed-out write is retried",
+        requeued and queue.pending_count() == 0 and store.rows("applications")[second]["status"] == "offer"
+    ))
+    
+    for name, ok in results:
+        print(f"{'ok' if ok else 'FAIL':>4} | {name}")
+    return all(ok for _, ok in results)
+
+if __name__ == "__main__":
+    sys.exit(0 if check() else 1)
@@ -0,0 +1,51 @@
+"""Export a job provider's applicants or a jobseeker's applications as Parquet / Arrow IPC.
+
+Records are fetched and written one page (one row group) at a time, so memory
+use does not grow with the size of the export:
+
+    python tools/export_data.py applicants <provider-user-id> -o applicants.parquet
+    python tools/export_data.py applications <seeker-user-id> -o apps.arrow --format arrow --include-archived
+
+Needs pyarrow (pip install pyarrow).
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Front-End"))
+
+import export
+from db import Database
+
+def main():
+    parser = argparse.ArgumentParser(description="Export applicants or applications in a columnar format")
+    parser.add_argument("dataset", choices=["applicants", "applications"])
+    parser.add_argument("user_id", help="job provider ID for applicants, jobseeker ID for applications")
+    parser.add_argument("-o", "--output", help="output file (default: <dataset>-<user_id>.<format>)")
+    parser.add_argument("--format", choices=sorted(export.FORMATS), default="parquet")
+    parser.add_argument("--page-size", type=int, default=5000, help="records per page / row group")
+    parser.add_argument("--include-archived", action="store_true", help="also export archived applications")
+    args = parser.parse_args()
+    
+    output = args.output or f"{args.dataset}-{args.user_id}{export.FORMATS[args.format][1]}"
+    db = Database()
+    try:
+        if args.dataset == "applicants":
+            pages = db.iter_applicants_for_jobprovider(args.user_id, args.page_size)
+            schema, to_rows = export.applicants_schema(), export.applicant_rows
+        else:
+            pages = db.iter_applications(args.user_id, args.page_size, args.include_archived)
+            schema, to_rows = export.applications_schema(), export.application_rows
+        
+        started = time.perf_counter()
+        written = export.write_export(output, pages, schema, to_rows, args.format)
+        print(f"Wrote {written / 1024:.1f} KB to {output} in {time.perf_counter() - started:.1f}s")
+    except export.ExportUnavailable as e:
+        sys.exit(str(e))
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
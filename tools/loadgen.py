@@ -0,0 +1,250 @@
+"""Load generator for the FastAPI routes in api/main.py.
+
+Seeds the in-memory stand-in backend with deterministic synthetic data, then
+drives a mixed jobseeker/jobprovider workload at a fixed request rate
+(open loop: requests are sent on schedule whether or not earlier ones have
+finished, and latency is measured from the scheduled send time). Throughput,
+error rate and tail latency are reported per interval and for the whole run.
+
+    python tools/loadgen.py --seekers 5000 --providers 200 --rate 200 --duration 60
+    python tools/loadgen.py --replicas 2 --replica-latency 0.005
+
+By default the API runs in-process against the stand-in. Pass --url to drive an
+already running server instead (its backend must hold the same seeded data).
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "api"))
+sys.path.append(os.path.join(ROOT, "Front-End"))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from standin import StandInClient, StandInStore
+from synthetic import JOB_TITLES, generate
+
+STATUSES = ["applied", "interview", "offer", "rejected"]
+
+# (weight, name, role) - roughly what the dashboards issue per page view
+SCENARIOS = [
+    (10, "seeker_dashboard", "seeker"),
+    (20, "seeker_applications", "seeker"),
+    (10, "seeker_analytics", "seeker"),
+    (8, "seeker_timeline", "seeker"),
+    (6, "seeker_profile", "seeker"),
+    (3, "seeker_recommendations", "seeker"),
+    (6, "seeker_add_application", "seeker"),
+    (6, "seeker_update_status", "seeker"),
+    (5, "provider_dashboard", "provider"),
+    (10, "provider_postings", "provider"),
+    (10, "provider_applicant_counts", "provider"),
+    (5, "provider_analytics", "provider"),
+    (2, "provider_add_posting", "provider"),
+    (6, "provider_update_application", "provider"),
+]
+
+def build_request(name, rng, dataset):
+    """Build (method, path, params, json) for a scenario"""
+    seeker = rng.choice(dataset.seeker_ids) if dataset.seeker_ids else None
+    provider = rng.choice(dataset.provider_ids) if dataset.provider_ids else None
+    
+    if name == "seeker_dashboard":
+        return "GET", f"/api/dashboard/{seeker}", {"limit": 20}, None
+    if name == "provider_dashboard":
+        return "GET", f"/api/dashboard/provider/{provider}", {"limit": 20}, None
+    if name == "seeker_applications":
+        return "GET", f"/api/applications/{seeker}", {"fields": "id,company,role,status,applied_date"}, None
+    if name == "seeker_analytics":
+        return "GET", f"/api/analytics/{seeker}", None, None
+    if name == "seeker_timeline":
+        return "GET", f"/api/analytics/{seeker}/timeline", {"bucket": rng.choice(["day", "week", "month"])}, None
+    if name == "seeker_profile":
+        return "GET", f"/api/profile/{seeker}", None, None
+    if name == "seeker_recommendations":
+        return "GET", f"/api/recommendations/{seeker}", {"k": 10}, None
+    if name == "seeker_add_application":
+        return "POST", "/api/applications", None, {
+            "user_id": seeker,
+            "company": f"Company {rng.randint(1, 500)}",
+            "role": rng.choice(JOB_TITLES),
+            "status": "applied",
+        }
+    if name == "seeker_update_status":
+        application_ids = dataset.applications_by_seeker.get(seeker) or dataset.application_ids
+        return "PUT", f"/api/applications/{rng.choice(application_ids)}", None, {"status": rng.choice(STATUSES)}
+    if name == "provider_postings":
+        return "GET", f"/api/jobpostings/{provider}", {"fields": "id,title,status,deadline,created_at"}, None
+    if name == "provider_applicant_counts":
+        return "GET", f"/api/jobpostings/{provider}/applicant-counts", None, None
+    if name == "provider_analytics":
+        return "GET", f"/api/analytics/provider/{provider}", {"days": 90}, None
+    if name == "provider_add_posting":
+        return "POST", "/api/jobpostings", None, {
+            "user_id": provider,
+            "title": rng.choice(JOB_TITLES),
+            "description": "Synthetic load test posting",
+            "requirements": "None",
+            "deadline": (date.today() + timedelta(days=30)).isoformat(),
+        }
+    if name == "provider_update_application":
+        return "PUT", f"/api/applications/{rng.choice(dataset.application_ids)}", None, {"status": rng.choice(STATUSES)}
+    raise ValueError(f"Unknown scenario: {name}")
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def summarize(results, elapsed):
+    latencies = sorted(latency for _, latency, _, _ in results)
+    errors = sum(1 for _, _, ok, _ in results if not ok)
+    return {
+        "requests": len(results),
+        "throughput": len(results) / elapsed if elapsed > 0 else 0.0,
+        "error_rate": errors / len(results) * 100 if results else 0.0,
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "max": (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+def format_stats(label, stats):
+    return (
+        f"{label:>27} | {stats['requests']:>7} req | {stats['throughput']:>8.1f} req/s | "
+        f"{stats['error_rate']:>5.1f}% err | p50 {stats['p50']:>7.1f} ms | "
+        f"p95 {stats['p95']:>7.1f} ms | p99 {stats['p99']:>7.1f} ms | max {stats['max']:>7.1f} ms"
+    )
+
+def build_app(store, replicas=0, replica_latency=0.0):
+    """Import the API and point it at the stand-in backend (plus stand-in read replicas)"""
+    import main
+    from db import Database
+    from recommend import RecommendationService
+    
+    # The lifespan hook keeps a Database that is already set instead of connecting to Supabase
+    db = Database(
+        client=StandInClient(store),
+        replica_clients=[StandInClient(store, replica_latency) for _ in range(replicas)]
+    )
+    main.db = db
+    main.recommendations = RecommendationService(db, refresh_interval=60)
+    return main.app
+
+async def drive(client, dataset, rate, duration, concurrency, report_interval, seed):
+    rng = random.Random(seed)
+    weights = [weight for weight, _, _ in SCENARIOS]
+    names = [name for _, name, _ in SCENARIOS]
+    semaphore = asyncio.Semaphore(concurrency)
+    results = []
+    window = []
+    by_scenario = {}
+    
+    async def fire(scheduled, name, method, path, params, body):
+        async with semaphore:
+            try:
+                response = await client.request(method, path, params=params, json=body)
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+        record = (scheduled, time.perf_counter() - scheduled, ok, name)
+        results.append(record)
+        window.append(record)
+        by_scenario.setdefault(name, []).append(record)
+    
+    async def report():
+        started = time.perf_counter()
+        while True:
+            await asyncio.sleep(report_interval)
+            batch = window[:]
+            window.clear()
+            print(format_stats(f"{time.perf_counter() - started:.0f}s", summarize(batch, report_interval)), flush=True)
+    
+    reporter = asyncio.create_task(report())
+    tasks = set()
+    start = time.perf_counter()
+    sent = 0
+    while True:
+        scheduled = start + sent / rate
+        if scheduled - start >= duration:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        name = rng.choices(names, weights)[0]
+        task = asyncio.create_task(fire(scheduled, name, *build_request(name, rng, dataset)))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        sent += 1
+    
+    if tasks:
+        await asyncio.gather(*tasks)
+    reporter.cancel()
+    elapsed = time.perf_counter() - start
+    
+    print("-" * 130)
+    for name in names:
+        if by_scenario.get(name):
+            print(format_stats(name, summarize(by_scenario[name], elapsed)))
+    print("-" * 130)
+    print(format_stats("total", summarize(results, elapsed)))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive synthetic traffic against the Job Application Tracker API")
+    parser.add_argument("--seekers", type=int, default=1000)
+    parser.add_argument("--providers", type=int, default=100)
+    parser.add_argument("--postings-per-provider", type=int, default=10)
+    parser.add_argument("--applications-per-seeker", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rate", type=float, default=50.0, help="target requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of traffic")
+    parser.add_argument("--concurrency", type=int, default=100, help="max requests in flight")
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    parser.add_argument("--url", help="drive a running server instead of the in-process app")
+    parser.add_argument("--replicas", type=int, default=0, help="stand-in read replicas behind the in-process app")
+    parser.add_argument("--replica-latency", type=float, default=0.0, help="seconds added to each replica call")
+    args = parser.parse_args()
+    
+    store = StandInStore()
+    started = time.perf_counter()
+    dataset = generate(
+        store,
+        seekers=args.seekers,
+        providers=args.providers,
+        postings_per_provider=args.postings_per_provider,
+        applications_per_seeker=args.applications_per_seeker,
+        seed=args.seed,
+    )
+    print(f"Generated {dataset.summary()} in {time.perf_counter() - started:.1f}s", flush=True)
+    
+    if args.url:
+        transport = None
+        base_url = args.url
+    else:
+        transport = httpx.ASGITransport(app=build_app(store, args.replicas, args.replica_latency))
+        base_url = "http://loadgen"
+    
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=30) as client:
+            await drive(client, dataset, args.rate, args.duration, args.concurrency, args.report_interval, args.seed)
+    
+    asyncio.run(run())
+    
+    if not args.url:
+        import main
+        for endpoint in main.db.get_backend_health()["endpoints"]:
+            print(
+                f"{endpoint['name']:>27} | {endpoint['requests']:>7} calls | {endpoint['errors']:>5} err | "
+                f"ewma {endpoint['ewma_ms']} ms | p50 {endpoint['p50_ms']} ms | p95 {endpoint['p95_ms']} ms"
+            )
+
+if __name__ == "__main__":
+    main()
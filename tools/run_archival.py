@@ -0,0 +1,40 @@
+"""Move old rejected applications and closed job postings to the archive tables.
+
+Meant to run from cron (or any scheduler) against the configured Supabase project:
+
+    python tools/run_archival.py
+    python tools/run_archival.py --rejected-after-days 90 --closed-after-days off
+
+Ages default to ARCHIVE_REJECTED_AFTER_DAYS (180) and
+ARCHIVE_CLOSED_POSTINGS_AFTER_DAYS (365).
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Front-End"))
+
+from archive import Archiver
+from db import Database
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old applications and job postings")
+    parser.add_argument("--rejected-after-days", help="archive rejected applications older than this ('off' to skip)")
+    parser.add_argument("--closed-after-days", help="archive closed postings past their deadline by this much ('off' to skip)")
+    parser.add_argument("--batch-size", type=int, help="rows moved per database call")
+    args = parser.parse_args()
+    
+    db = Database()
+    archiver = Archiver(
+        db,
+        rejected_after_days=args.rejected_after_days,
+        closed_postings_after_days=args.closed_after_days,
+        batch_size=args.batch_size,
+    )
+    print(json.dumps(archiver.run_once()))
+    db.close()
+
+if __name__ == "__main__":
+    main()
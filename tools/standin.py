@@ -0,0 +1,679 @@
+"""In-memory stand-in for the Supabase backend.
+
+StandInClient implements the small part of the supabase-py client that
+Database uses (table() query builders, filters, embedded selects and rpc()),
+backed by StandInStore, a set of indexed in-memory tables that also maintains
+the provider rollup tables the way the database triggers do. It lets the API
+and Database run locally for load tests and round-trip checks without a
+Supabase project:
+
+    store = StandInStore()
+    db = Database(client=StandInClient(store))
+"""
+import copy
+import re
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+# (table, embedded table) -> (local column, remote column)
+RELATIONS = {
+    ("job_postings", "profiles"): ("user_id", "id"),
+    ("applications", "profiles"): ("user_id", "id"),
+    ("applications", "job_postings"): ("job_posting_id", "id"),
+    ("job_applications", "applications"): ("application_id", "id"),
+    ("job_applications", "job_postings"): ("job_posting_id", "id"),
+    ("posting_applicant_rollups", "job_postings"): ("job_posting_id", "id"),
+    ("posting_daily_applicants", "job_postings"): ("job_posting_id", "id"),
+    ("job_postings_archive", "profiles"): ("user_id", "id"),
+}
+
+# Columns with a hash index, per table
+INDEXED_COLUMNS = {
+    "profiles": ("id",),
+    "applications": ("id", "user_id", "job_posting_id", "status"),
+    "job_postings": ("id", "user_id", "status"),
+    "job_applications": ("id", "application_id", "job_posting_id"),
+    "posting_applicant_rollups": ("job_posting_id", "provider_id"),
+    "posting_daily_applicants": ("job_posting_id", "provider_id"),
+    "applications_archive": ("id", "user_id"),
+    "job_applications_archive": ("id", "job_posting_id"),
+    "job_postings_archive": ("id", "user_id"),
+}
+
+APPLICATION_STATUSES = ("applied", "interview", "offer", "rejected")
+
+# Functions callable through client.rpc(name, params); name -> fn(store, params)
+RPC_FUNCTIONS = {}
+
+def rpc_function(name):
+    """Register a stand-in implementation of a database function"""
+    def register(fn):
+        RPC_FUNCTIONS[name] = fn
+        return fn
+    return register
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+class StandInError(Exception):
+    """Raised for requests the real backend would reject"""
+
+class StandInResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+class StandInStore:
+    """Indexed in-memory tables mirroring the Supabase schema"""
+    
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.tables = {}
+        self.indexes = {}
+        self.sequences = {}
+        for table in INDEXED_COLUMNS:
+            self._ensure_table(table)
+    
+    def _ensure_table(self, table):
+        if table not in self.tables:
+            self.tables[table] = {}
+            self.sequences[table] = 0
+            for column in INDEXED_COLUMNS.get(table, ()):
+                self.indexes[(table, column)] = {}
+    
+    def _primary_key(self, table):
+        return "job_posting_id" if table == "posting_applicant_rollups" else "id"
+    
+    def _index_add(self, table, key, row):
+        for column in INDEXED_COLUMNS.get(table, ()):
+            self.indexes[(table, column)].setdefault(row.get(column), set()).add(key)
+    
+    def _index_remove(self, table, key, row):
+        for column in INDEXED_COLUMNS.get(table, ()):
+            keys = self.indexes[(table, column)].get(row.get(column))
+            if keys:
+                keys.discard(key)
+    
+    def rows(self, table):
+        self._ensure_table(table)
+        return self.tables[table]
+    
+    def candidate_keys(self, table, column, values):
+        """Row keys whose column is in values, or None when the column isn't indexed"""
+        index = self.indexes.get((table, column))
+        if index is None:
+            return None
+        keys = set()
+        for value in values:
+            keys |= index.get(value, set())
+            # IDs arrive as strings from URL paths and query params
+            if isinstance(value, str) and value.isdigit():
+                keys |= index.get(int(value), set())
+        return keys
+    
+    def insert(self, table, record):
+        """Insert one row, applying column defaults and trigger side effects"""
+        with self.lock:
+            self._ensure_table(table)
+            row = dict(record)
+            self._apply_defaults(table, row)
+            self._check(table, row)
+            key = row.get(self._primary_key(table))
+            if key in self.tables[table]:
+                raise StandInError(f'duplicate key value violates unique constraint "{table}_pkey"')
+            self.tables[table][key] = row
+            self._index_add(table, key, row)
+            self._after_insert(table, row)
+            return row
+    
+    def update(self, table, key, changes):
+        with self.lock:
+            row = self.tables[table][key]
+            self._check(table, dict(row, **changes))
+            old = dict(row)
+            self._index_remove(table, key, row)
+            row.update(changes)
+            self._index_add(table, key, row)
+            self._after_update(table, old, row)
+            return row
+    
+    def delete(self, table, key):
+        with self.lock:
+            row = self.tables[table].get(key)
+            if row is None:
+                return None
+            self._before_delete(table, row)
+            self._index_remove(table, key, row)
+            del self.tables[table][key]
+            return row
+    
+    def _check(self, table, row):
+        """Check constraints"""
+        if table == "applications" and row.get("status") not in APPLICATION_STATUSES:
+            raise StandInError('new row for relation "applications" violates check constraint "applications_status_check"')
+    
+    def _apply_defaults(self, table, row):
+        if table == "profiles":
+            row.setdefault("id", str(uuid.uuid4()))
+            row.setdefault("created_at", _now())
+            return
+        if table in ("posting_applicant_rollups", "posting_daily_applicants"):
+            return
+        
+        if "id" not in row:
+            self.sequences[table] += 1
+            row["id"] = self.sequences[table]
+        else:
+            self.sequences[table] = max(self.sequences[table], row["id"])
+        
+        if table == "applications":
+            row.setdefault("status", "applied")
+            row.setdefault("applied_date", date.today().isoformat())
+            row.setdefault("status_changed_at", _now())
+            for column in ("company", "role", "notes", "job_posting_id"):
+                row.setdefault(column, None)
+        elif table == "job_postings":
+            row.setdefault("status", "active")
+            row.setdefault("created_at", _now())
+        elif table == "job_applications":
+            row.setdefault("applied_at", _now())
+    
+    # Trigger emulation for the provider rollups
+    
+    def _bump_rollup(self, job_posting_id, status, status_delta, total_delta):
+        posting = self.tables["job_postings"].get(job_posting_id)
+        if posting is None:
+            return
+        rollups = self.rows("posting_applicant_rollups")
+        rollup = rollups.get(job_posting_id)
+        if rollup is None:
+            rollup = {
+                "job_posting_id": job_posting_id,
+                "provider_id": posting["user_id"],
+                "total": 0, "applied": 0, "interview": 0, "offer": 0, "rejected": 0
+            }
+            rollups[job_posting_id] = rollup
+            self._index_add("posting_applicant_rollups", job_posting_id, rollup)
+        rollup["total"] += total_delta
+        if status in APPLICATION_STATUSES:
+            rollup[status] += status_delta
+        rollup["updated_at"] = _now()
+    
+    def _bump_daily(self, job_posting_id, applied_at, delta):
+        posting = self.tables["job_postings"].get(job_posting_id)
+        if posting is None:
+            return
+        day = str(applied_at or _now())[:10]
+        daily = self.rows("posting_daily_applicants")
+        key = (job_posting_id, day)
+        row = daily.get(key)
+        if row is None:
+            row = {"job_posting_id": job_posting_id, "provider_id": posting["user_id"], "day": day, "applicant_count": 0}
+            daily[key] = row
+            self._index_add("posting_daily_applicants", key, row)
+        row["applicant_count"] += delta
+    
+    def _after_insert(self, table, row):
+        if table == "job_applications":
+            application = self.tables["applications"].get(row["application_id"])
+            status = application["status"] if application else "applied"
+            self._bump_rollup(row["job_posting_id"], status, 1, 1)
+            self._bump_daily(row["job_posting_id"], row.get("applied_at"), 1)
+    
+    def _after_update(self, table, old, row):
+        if table == "applications" and old.get("status") != row.get("status"):
+            # applications_status_changed_at trigger
+            row["status_changed_at"] = _now()
+            for key in self.candidate_keys("job_applications", "application_id", [row["id"]]):
+                link = self.tables["job_applications"][key]
+                self._bump_rollup(link["job_posting_id"], old.get("status"), -1, 0)
+                self._bump_rollup(link["job_posting_id"], row.get("status"), 1, 0)
+    
+    def _before_delete(self, table, row):
+        if table == "applications":
+            for key in list(self.candidate_keys("job_applications", "application_id", [row["id"]])):
+                link = self.tables["job_applications"][key]
+                self._bump_rollup(link["job_posting_id"], row.get("status"), -1, -1)
+                self._bump_daily(link["job_posting_id"], link.get("applied_at"), -1)
+                self._index_remove("job_applications", key, link)
+                del self.tables["job_applications"][key]
+        elif table == "job_applications":
+            application = self.tables["applications"].get(row["application_id"])
+            if application:
+                self._bump_rollup(row["job_posting_id"], application.get("status"), -1, -1)
+                self._bump_daily(row["job_posting_id"], row.get("applied_at"), -1)
+        elif table == "job_postings":
+            # on delete cascade / set null
+            for key in list(self.candidate_keys("job_applications", "job_posting_id", [row["id"]])):
+                self.delete("job_applications", key)
+            for key in list(self.candidate_keys("applications", "job_posting_id", [row["id"]])):
+                self.update("applications", key, {"job_posting_id": None})
+            for dependent in ("posting_applicant_rollups", "posting_daily_applicants"):
+                keys = self.candidate_keys(dependent, "job_posting_id", [row["id"]]) or set()
+                for key in list(keys):
+                    self._index_remove(dependent, key, self.tables[dependent][key])
+                    del self.tables[dependent][key]
+
+def _split_top_level(text):
+    """Split a select string on commas that aren't inside parentheses"""
+    parts, depth, current = [], 0, ""
+    for char in text:
+        if char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+def parse_select(columns):
+    """Parse 'a, b, rel!inner(c, d)' into (columns, [(relation, inner, nested)])"""
+    plain, embeds = [], []
+    for part in _split_top_level(columns or "*"):
+        match = re.fullmatch(r"(\w+)(!inner)?\((.*)\)", part, re.S)
+        if match:
+            embeds.append((match.group(1), bool(match.group(2)), parse_select(match.group(3))))
+        else:
+            plain.append(part)
+    return plain, embeds
+
+def _coerce(value, sample):
+    """Compare query-string values against typed column values"""
+    if isinstance(sample, bool) or value is None or sample is None:
+        return value
+    if isinstance(sample, int) and isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return value
+    if isinstance(sample, str) and not isinstance(value, str):
+        return value.isoformat() if hasattr(value, "isoformat") else str(value)
+    return value
+
+def _like(pattern, case_insensitive):
+    regex = "^" + ".*".join(re.escape(piece) for piece in pattern.split("%")) + "$"
+    return re.compile(regex, re.I | re.S if case_insensitive else re.S)
+
+class StandInQuery:
+    """Chainable query builder mimicking postgrest-py's request builders"""
+    
+    def __init__(self, store, table, latency=0.0):
+        self.store = store
+        self.table = table
+        self.latency = latency
+        self.operation = "select"
+        self.columns = "*"
+        self.payload = None
+        self.filters = []
+        self.ordering = []
+        self.offset = 0
+        self.row_limit = None
+        self.count_mode = None
+        self.head = False
+        self.on_conflict = None
+    
+    # Operations
+    
+    def select(self, columns="*", count=None, head=False):
+        self.columns = columns
+        self.count_mode = count
+        self.head = head
+        return self
+    
+    def insert(self, data, **kwargs):
+        self.operation = "insert"
+        self.payload = data
+        return self
+    
+    def upsert(self, data, on_conflict=None, **kwargs):
+        self.operation = "upsert"
+        self.payload = data
+        self.on_conflict = on_conflict
+        return self
+    
+    def update(self, data, **kwargs):
+        self.operation = "update"
+        self.payload = data
+        return self
+    
+    def delete(self, **kwargs):
+        self.operation = "delete"
+        return self
+    
+    # Filters
+    
+    def _filter(self, column, test, values=None):
+        self.filters.append((column, test, values))
+        return self
+    
+    def eq(self, column, value):
+        return self._filter(column, lambda v, s: v == _coerce(value, v), [value])
+    
+    def neq(self, column, value):
+        return self._filter(column, lambda v, s: v != _coerce(value, v))
+    
+    def gt(self, column, value):
+        return self._filter(column, lambda v, s: v is not None and v > _coerce(value, v))
+    
+    def gte(self, column, value):
+        return self._filter(column, lambda v, s: v is not None and v >= _coerce(value, v))
+    
+    def lt(self, column, value):
+        return self._filter(column, lambda v, s: v is not None and v < _coerce(value, v))
+    
+    def lte(self, column, value):
+        return self._filter(column, lambda v, s: v is not None and v <= _coerce(value, v))
+    
+    def in_(self, column, values):
+        values = list(values)
+        return self._filter(column, lambda v, s: v in {_coerce(value, v) for value in values}, values)
+    
+    def is_(self, column, value):
+        expected = None if value in (None, "null") else value
+        return self._filter(column, lambda v, s: v is expected or v == expected)
+    
+    def like(self, column, pattern):
+        regex = _like(pattern, False)
+        return self._filter(column, lambda v, s: v is not None and bool(regex.match(str(v))))
+    
+    def ilike(self, column, pattern):
+        regex = _like(pattern, True)
+        return self._filter(column, lambda v, s: v is not None and bool(regex.match(str(v))))
+    
+    # Modifiers
+    
+    def order(self, column, desc=False, **kwargs):
+        self.ordering.append((column, desc))
+        return self
+    
+    def limit(self, size, **kwargs):
+        self.row_limit = size
+        return self
+    
+    def range(self, start, end, **kwargs):
+        self.offset = start
+        self.row_limit = end - start + 1
+        return self
+    
+    # Execution
+    
+    def execute(self):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.store.lock:
+            if self.operation == "insert":
+                return StandInResponse(self._insert(self.payload))
+            if self.operation == "upsert":
+                return StandInResponse(self._upsert(self.payload))
+            
+            keys = self._matching_keys()
+            rows = self.store.rows(self.table)
+            if self.operation == "update":
+                updated = [copy.deepcopy(self.store.update(self.table, key, self.payload)) for key in keys]
+                return StandInResponse(updated)
+            if self.operation == "delete":
+                deleted = [self.store.delete(self.table, key) for key in keys]
+                return StandInResponse([copy.deepcopy(row) for row in deleted if row])
+            
+            plain, embeds = parse_select(self.columns)
+            results = []
+            for key in keys:
+                shaped = self._shape(self.table, rows[key], plain, embeds)
+                if shaped is not None:
+                    results.append(shaped)
+            results = self._apply_embedded_filters(results, embeds)
+            
+            for column, desc in reversed(self.ordering):
+                results.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+            count = len(results) if self.count_mode else None
+            if self.offset or self.row_limit is not None:
+                end = None if self.row_limit is None else self.offset + self.row_limit
+                results = results[self.offset:end]
+            return StandInResponse([] if self.head else results, count)
+    
+    def _insert(self, payload):
+        records = payload if isinstance(payload, list) else [payload]
+        return [copy.deepcopy(self.store.insert(self.table, record)) for record in records]
+    
+    def _upsert(self, payload):
+        records = payload if isinstance(payload, list) else [payload]
+        key_column = self.on_conflict or self.store._primary_key(self.table)
+        results = []
+        for record in records:
+            existing = self.store.candidate_keys(self.table, key_column, [record.get(key_column)])
+            if existing:
+                results.append(copy.deepcopy(self.store.update(self.table, next(iter(existing)), record)))
+            else:
+                results.append(copy.deepcopy(self.store.insert(self.table, record)))
+        return results
+    
+    def _matching_keys(self):
+        rows = self.store.rows(self.table)
+        local_filters = [f for f in self.filters if "." not in f[0]]
+        
+        candidates = None
+        for column, _, values in local_filters:
+            if values is None:
+                continue
+            keys = self.store.candidate_keys(self.table, column, values)
+            if keys is not None:
+                candidates = keys if candidates is None else candidates & keys
+        if candidates is None:
+            keys = list(rows)
+        else:
+            # Keep insertion order like a heap scan would
+            keys = sorted(candidates, key=lambda key: (str(type(key)), key))
+        
+        matched = []
+        for key in keys:
+            row = rows.get(key)
+            if row is None:
+                continue
+            if all(test(row.get(column), row) for column, test, _ in local_filters):
+                matched.append(key)
+        return matched
+    
+    def _shape(self, table, row, plain, embeds):
+        """Project a row to the selected columns and resolve embedded relations"""
+        if not plain or "*" in plain:
+            shaped = dict(row)
+        else:
+            shaped = {column: row.get(column) for column in plain}
+        shaped = copy.deepcopy(shaped)
+        
+        for relation, inner, (nested_plain, nested_embeds) in embeds:
+            embedded = self._embed(table, row, relation, nested_plain, nested_embeds)
+            if inner and not embedded:
+                return None
+            shaped[relation] = embedded
+        return shaped
+    
+    def _embed(self, table, row, relation, plain, embeds):
+        if (table, relation) in RELATIONS:
+            local, remote = RELATIONS[(table, relation)]
+            keys = self.store.candidate_keys(relation, remote, [row.get(local)]) or set()
+            target = next((self.store.rows(relation)[key] for key in keys), None)
+            return self._shape(relation, target, plain, embeds) if target else None
+        if (relation, table) in RELATIONS:
+            # One-to-many: embed a list of referencing rows
+            remote, local = RELATIONS[(relation, table)]
+            keys = self.store.candidate_keys(relation, remote, [row.get(local)]) or set()
+            rows = self.store.rows(relation)
+            return [self._shape(relation, rows[key], plain, embeds) for key in keys]
+        raise StandInError(f"Could not find a relationship between '{table}' and '{relation}'")
+    
+    def _apply_embedded_filters(self, results, embeds):
+        """Filters like .ilike('profiles.username', ...) on embedded resources"""
+        inner_relations = {relation for relation, inner, _ in embeds if inner}
+        for column, test, _ in self.filters:
+            if "." not in column:
+                continue
+            relation, field = column.split(".", 1)
+            kept = []
+            for row in results:
+                embedded = row.get(relation)
+                matches = embedded is not None and test(embedded.get(field), embedded)
+                if matches:
+                    kept.append(row)
+                elif relation not in inner_relations:
+                    # Without !inner PostgREST only nulls the embedded resource
+                    row[relation] = None
+                    kept.append(row)
+            results = kept
+        return results
+
+class StandInRpc:
+    def __init__(self, store, name, params, latency=0.0):
+        self.store = store
+        self.name = name
+        self.params = params or {}
+        self.latency = latency
+    
+    def execute(self):
+        if self.latency:
+            time.sleep(self.latency)
+        fn = RPC_FUNCTIONS.get(self.name)
+        if fn is None:
+            raise StandInError(f"Could not find the function public.{self.name}")
+        with self.store.lock:
+            return StandInResponse(fn(self.store, self.params))
+
+class StandInClient:
+    """Drop-in replacement for the supabase client used by Database
+    
+    Several clients can share one store to stand in for a primary and its read
+    replicas; latency (seconds) is added to every call to simulate network distance.
+    """
+    
+    def __init__(self, store=None, latency=0.0):
+        self.store = store or StandInStore()
+        self.latency = latency
+    
+    def table(self, name):
+        return StandInQuery(self.store, name, self.latency)
+    
+    def from_(self, name):
+        return self.table(name)
+    
+    def rpc(self, name, params=None):
+        return StandInRpc(self.store, name, params, self.latency)
+
+# Stand-ins for the functions in supabase/migrations
+
+@rpc_function("applicant_counts_for_provider")
+def _applicant_counts_for_provider(store, params):
+    keys = store.candidate_keys("posting_applicant_rollups", "provider_id", [params["p_provider_id"]])
+    rollups = store.rows("posting_applicant_rollups")
+    return [
+        {"job_posting_id": rollups[key]["job_posting_id"], "status": status, "applicant_count": rollups[key][status]}
+        for key in keys
+        for status in APPLICATION_STATUSES
+        if rollups[key][status] > 0
+    ]
+
+@rpc_function("application_status_counts")
+def _application_status_counts(store, params):
+    counts = {}
+    applications = store.rows("applications")
+    for key in store.candidate_keys("applications", "user_id", [params["p_user_id"]]):
+        status = applications[key]["status"]
+        counts[status] = counts.get(status, 0) + 1
+    return [{"status": status, "application_count": count} for status, count in sorted(counts.items())]
+
+@rpc_function("job_posting_status_counts")
+def _job_posting_status_counts(store, params):
+    counts = {}
+    postings = store.rows("job_postings")
+    for key in store.candidate_keys("job_postings", "user_id", [params["p_provider_id"]]):
+        status = postings[key]["status"]
+        counts[status] = counts.get(status, 0) + 1
+    return [{"status": status, "posting_count": count} for status, count in sorted(counts.items())]
+
+def _bucket_start(day, bucket):
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+@rpc_function("application_timeline")
+def _application_timeline(store, params):
+    bucket = params.get("p_bucket") or "day"
+    start = params.get("p_from")
+    end = params.get("p_to")
+    counts = {}
+    applications = store.rows("applications")
+    for key in store.candidate_keys("applications", "user_id", [params["p_user_id"]]):
+        app = applications[key]
+        applied = str(app.get("applied_date"))[:10]
+        if (start and applied < start) or (end and applied > end):
+            continue
+        bucket_day = _bucket_start(date.fromisoformat(applied), bucket).isoformat()
+        counts[(bucket_day, app["status"])] = counts.get((bucket_day, app["status"]), 0) + 1
+    return [
+        {"bucket": day, "status": status, "application_count": count}
+        for (day, status), count in sorted(counts.items())
+    ]
+
+@rpc_function("close_expired_job_postings")
+def _close_expired_job_postings(store, params):
+    today = params["p_today"]
+    with store.lock:
+        postings = store.rows("job_postings")
+        expired = sorted(
+            (postings[key] for key in store.candidate_keys("job_postings", "status", ["active"])
+             if str(postings[key].get("deadline"))[:10] < today),
+            key=lambda posting: str(posting.get("deadline"))
+        )[:params.get("p_batch_size", 500)]
+        closed = []
+        for posting in expired:
+            store.update("job_postings", posting["id"], {"status": "closed"})
+            closed.append({"id": posting["id"], "user_id": posting["user_id"]})
+        return closed
+
+@rpc_function("archive_applications")
+def _archive_applications(store, params):
+    with store.lock:
+        applications = store.rows("applications")
+        old = sorted(
+            (applications[key] for key in store.candidate_keys("applications", "status", [params["p_status"]])
+             if str(applications[key].get("status_changed_at"))[:10] < params["p_before"]),
+            key=lambda app: str(app.get("status_changed_at"))
+        )[:params.get("p_batch_size", 500)]
+        archived_at = _now()
+        moved = []
+        for app in old:
+            app = dict(app)
+            for key in list(store.candidate_keys("job_applications", "application_id", [app["id"]])):
+                link = dict(store.rows("job_applications")[key])
+                store.delete("job_applications", key)
+                store.insert("job_applications_archive", dict(link, archived_at=archived_at))
+            store.delete("applications", app["id"])
+            store.insert("applications_archive", dict(app, archived_at=archived_at))
+            moved.append({"id": app["id"]})
+        return moved
+
+@rpc_function("archive_job_postings")
+def _archive_job_postings(store, params):
+    with store.lock:
+        postings = store.rows("job_postings")
+        old = sorted(
+            (postings[key] for key in store.candidate_keys("job_postings", "status", ["closed"])
+             if str(postings[key].get("deadline"))[:10] < params["p_before"]
+             and not store.candidate_keys("applications", "job_posting_id", [key])
+             and not store.candidate_keys("job_applications", "job_posting_id", [key])),
+            key=lambda posting: str(posting.get("deadline"))
+        )[:params.get("p_batch_size", 500)]
+        archived_at = _now()
+        moved = []
+        for posting in old:
+            posting = dict(posting)
+            store.delete("job_postings", posting["id"])
+            store.insert("job_postings_archive", dict(posting, archived_at=archived_at))
+            moved.append({"id": posting["id"]})
+        return moved
@@ -0,0 +1,144 @@
+"""Deterministic synthetic data for the stand-in backend.
+
+The same seed always produces the same profiles, postings, applications and
+job_applications links, so load test runs are reproducible. Profile IDs are
+derived from emails the same way the Streamlit login does, so generated users
+can also log in to a dashboard backed by the stand-in.
+"""
+import random
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+JOB_TITLES = [
+    "Backend Engineer", "Frontend Developer", "Data Scientist", "Data Analyst",
+    "DevOps Engineer", "Product Manager", "QA Engineer", "Mobile Developer",
+    "Machine Learning Engineer", "Site Reliability Engineer", "UX Designer",
+    "Sales Executive", "Marketing Specialist", "Support Engineer", "Security Analyst",
+]
+
+SKILLS = [
+    "python", "django", "fastapi", "flask", "java", "spring", "kotlin", "swift",
+    "react", "vue", "typescript", "sql", "postgres", "redis", "kafka", "spark",
+    "pandas", "pytorch", "tensorflow", "docker", "kubernetes", "terraform", "aws",
+    "gcp", "azure", "linux", "selenium", "figma", "salesforce", "seo", "excel",
+]
+
+COMPANIES = [
+    "Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries",
+    "Wayne Enterprises", "Wonka", "Cyberdyne", "Soylent", "Tyrell", "Vandelay",
+]
+
+STATUS_WEIGHTS = [("applied", 55), ("interview", 20), ("offer", 5), ("rejected", 20)]
+
+def user_id_for(email):
+    """Same derivation as the Streamlit login page"""
+    return str(uuid.uuid5(uuid.NAMESPACE_DNS, email))
+
+class SyntheticDataset:
+    """IDs of everything generated, for building realistic traffic"""
+    
+    def __init__(self):
+        self.seeker_ids = []
+        self.provider_ids = []
+        self.posting_ids = []
+        self.postings_by_provider = {}
+        self.application_ids = []
+        self.applications_by_seeker = {}
+    
+    def summary(self):
+        return {
+            "seekers": len(self.seeker_ids),
+            "providers": len(self.provider_ids),
+            "postings": len(self.posting_ids),
+            "applications": len(self.application_ids),
+        }
+
+def _text_pools(rng, size=500):
+    """Shared description/requirement strings keep memory flat at millions of rows"""
+    descriptions, requirements = [], []
+    for _ in range(size):
+        skills = rng.sample(SKILLS, 6)
+        descriptions.append(
+            f"We are looking for someone experienced with {', '.join(skills[:4])}. "
+            f"You will build and maintain systems using {skills[4]} and {skills[5]}."
+        )
+        requirements.append(f"{rng.randint(1, 8)}+ years with {', '.join(skills[:3])}")
+    return descriptions, requirements
+
+def generate(store, seekers=1000, providers=100, postings_per_provider=10,
+             applications_per_seeker=20, seed=42, history_days=730, linked_ratio=0.7):
+    """Populate a StandInStore and return the generated IDs"""
+    rng = random.Random(seed)
+    dataset = SyntheticDataset()
+    descriptions, requirements = _text_pools(rng)
+    today = date.today()
+    now = datetime.now(timezone.utc)
+    statuses = [status for status, _ in STATUS_WEIGHTS]
+    weights = [weight for _, weight in STATUS_WEIGHTS]
+    
+    for i in range(providers):
+        email = f"provider{i}@example.com"
+        user_id = user_id_for(email)
+        store.insert("profiles", {"id": user_id, "username": f"{rng.choice(COMPANIES)} {i}", "email": email, "role": "jobprovider"})
+        dataset.provider_ids.append(user_id)
+    
+    for i in range(seekers):
+        email = f"seeker{i}@example.com"
+        user_id = user_id_for(email)
+        store.insert("profiles", {"id": user_id, "username": f"seeker{i}", "email": email, "role": "jobseeker"})
+        dataset.seeker_ids.append(user_id)
+    
+    for provider_id in dataset.provider_ids:
+        posting_ids = []
+        for _ in range(postings_per_provider):
+            created = now - timedelta(days=rng.randint(0, history_days), seconds=rng.randint(0, 86399))
+            deadline = created.date() + timedelta(days=rng.randint(14, 90))
+            posting = store.insert("job_postings", {
+                "user_id": provider_id,
+                "title": rng.choice(JOB_TITLES),
+                "description": rng.choice(descriptions),
+                "requirements": rng.choice(requirements),
+                "deadline": deadline.isoformat(),
+                "status": "active" if deadline >= today else "closed",
+                "created_at": created.isoformat(),
+            })
+            posting_ids.append(posting["id"])
+        dataset.postings_by_provider[provider_id] = posting_ids
+        dataset.posting_ids.extend(posting_ids)
+    
+    for seeker_id in dataset.seeker_ids:
+        application_ids = []
+        for _ in range(applications_per_seeker):
+            applied = today - timedelta(days=rng.randint(0, history_days))
+            applied_at = datetime.combine(applied, datetime.min.time(), timezone.utc).isoformat()
+            status = rng.choices(statuses, weights)[0]
+            if dataset.posting_ids and rng.random() < linked_ratio:
+                job_posting_id = rng.choice(dataset.posting_ids)
+                application = store.insert("applications", {
+                    "user_id": seeker_id,
+                    "job_posting_id": job_posting_id,
+                    "status": status,
+                    "applied_date": applied.isoformat(),
+                    "status_changed_at": applied_at,
+                    "notes": "Looking forward to hearing from you" if rng.random() < 0.5 else None,
+                })
+                store.insert("job_applications", {
+                    "job_posting_id": job_posting_id,
+                    "application_id": application["id"],
+                    "applied_at": applied_at,
+                })
+            else:
+                application = store.insert("applications", {
+                    "user_id": seeker_id,
+                    "company": rng.choice(COMPANIES),
+                    "role": rng.choice(JOB_TITLES),
+                    "status": status,
+                    "applied_date": applied.isoformat(),
+                    "status_changed_at": applied_at,
+                    "notes": None,
+                })
+            application_ids.append(application["id"])
+        dataset.applications_by_seeker[seeker_id] = application_ids
+        dataset.application_ids.extend(application_ids)
+    
+    return dataset